@@ -8,9 +8,14 @@ from unittest.mock import patch
 import pytest
 
 # Local
+from tiredize.core_types import Position
 from tiredize.core_types import RuleNotFoundError
 from tiredize.core_types import RuleResult
+from tiredize.linter.engine import prepare_rules
 from tiredize.linter.engine import run_linter
+from tiredize.linter.engine import run_rules
+from tiredize.linter.rules import Rule
+from tiredize.linter.rules import clear_rule_registry
 from tiredize.markdown.types.document import Document
 
 
@@ -223,7 +228,18 @@ def test_run_linter_does_not_mutate_rule_configs():
 # ===================================================================
 
 
-def test_run_linter_rule_exception_propagates():
+@pytest.fixture
+def fresh_rule_registry():
+    """
+    Discover rules again inside the test, so patches of rule modules
+    take effect, and forget the patched registry afterwards.
+    """
+    clear_rule_registry()
+    yield
+    clear_rule_registry()
+
+
+def test_run_linter_rule_exception_propagates(fresh_rule_registry):
     """If rule 2 of 3 raises, the entire call fails.
 
     run_linter does not catch exceptions from rule validate()
@@ -240,7 +256,7 @@ def test_run_linter_rule_exception_propagates():
     with patch(
         "tiredize.linter.rules.tabs.validate",
         side_effect=exploding_validate,
-    ):
+    ) as exploding:
         with pytest.raises(RuntimeError, match="rule exploded"):
             run_linter(
                 document=doc,
@@ -250,3 +266,89 @@ def test_run_linter_rule_exception_propagates():
                     "trailing_whitespace": {"allowed": False},
                 }
             )
+    # The patched module function, not the cached original, ran.
+    exploding.assert_called_once()
+
+
+# ===================================================================
+#  Prepared rules
+# ===================================================================
+
+
+def test_prepare_rules_reused_across_documents():
+    prepared = prepare_rules({"tabs": {"allowed": False}})
+    assert [rule.id for rule, _ in prepared] == ["tabs"]
+    for text in ("# One\n\tA\n", "# Two\n\tB\n"):
+        doc = Document()
+        doc.load(text=text)
+        assert run_rules(doc, prepared) == run_linter(
+            document=doc,
+            rule_configs={"tabs": {"allowed": False}}
+        )
+
+
+def test_prepare_rules_checks_config_without_a_document():
+    with pytest.raises(RuleNotFoundError):
+        prepare_rules({"the_rule_of_cool": {}})
+    with pytest.raises(ValueError, match="Invalid configuration"):
+        prepare_rules({"tabs": "not-a-dict"})
+
+
+def test_prepare_rules_none_configs():
+    assert prepare_rules(None) == []
+
+
+# ===================================================================
+#  Result limit
+# ===================================================================
+
+
+def _counting_rule(rule_id, count, checked, lazy):
+    def results(document, config):
+        for index in range(count):
+            checked.append((rule_id, index))
+            yield RuleResult(
+                message=f"{rule_id} {index}",
+                position=Position(offset=index, length=1),
+                rule_id=None
+            )
+
+    def validate(document, config):
+        return list(results(document, config))
+
+    return Rule(
+        id=rule_id,
+        func=validate,
+        iter_func=results if lazy else None
+    )
+
+
+def test_run_rules_limit_skips_remaining_rules():
+    checked: list[tuple[str, int]] = []
+    prepared = [
+        (_counting_rule("first", 3, checked, lazy=False), {}),
+        (_counting_rule("second", 3, checked, lazy=False), {}),
+    ]
+    doc = Document()
+    doc.load(text="# T\n")
+    results = run_rules(doc, prepared, limit=2)
+    assert [res.message for res in results] == ["first 0", "first 1"]
+    assert all(rule_id == "first" for rule_id, _ in checked)
+
+
+def test_run_rules_limit_stops_lazy_rule_early():
+    checked: list[tuple[str, int]] = []
+    prepared = [(_counting_rule("lazy", 5, checked, lazy=True), {})]
+    doc = Document()
+    doc.load(text="# T\n")
+    results = run_rules(doc, prepared, limit=2)
+    assert [res.rule_id for res in results] == ["lazy", "lazy"]
+    assert checked == [("lazy", 0), ("lazy", 1)]
+
+
+def test_run_rules_without_limit_uses_func():
+    checked: list[tuple[str, int]] = []
+    prepared = [(_counting_rule("lazy", 3, checked, lazy=True), {})]
+    doc = Document()
+    doc.load(text="# T\n")
+    assert len(run_rules(doc, prepared)) == 3
@@ -9,13 +9,23 @@ from HTTP internals.
 """
 
 import copy
+import threading
+import time
 from unittest.mock import patch
 
+from tiredize.linter.host_pool import clear_host_pools
+from tiredize.linter.host_pool import start_host_pools
+from tiredize.linter.link_cache import LinkCache
+from tiredize.linter.rules.links import iter_validate
 from tiredize.linter.rules.links import validate
+from tiredize.linter.url_table import clear_url_table
+from tiredize.linter.url_table import start_url_table
+from tiredize.linter.utils import LinkRecord
 from tiredize.markdown.types.document import Document
 
 
 MOCK_TARGET = "tiredize.linter.rules.links.check_url_valid"
+REQUEST_TARGET = "tiredize.linter.rules.links.request_url"
 
 
 # ===================================================================
@@ -224,8 +234,8 @@ def test_missing_headers_passes_none():
 # ===================================================================
 
 
-def test_same_url_inline_and_bare_both_checked():
-    """Same URL as InlineLink and BareLink are both checked independently."""
+def test_same_url_inline_and_bare_both_reported():
+    """Same URL as InlineLink and BareLink is checked once, reported twice."""
     md = (
         "# Dupes\n"
         "[click](https://example.com/path.html)\n"
@@ -235,9 +245,10 @@ def test_same_url_inline_and_bare_both_checked():
     doc.load(text=md)
     with patch(MOCK_TARGET, return_value=(False, 404, "gone")) as mock_check:
         results = validate(doc, {"validate": True})
-    # Both link occurrences should produce violations
-    assert len(results) >= 2
-    assert mock_check.call_count >= 2
+    # Both link occurrences produce violations at their own positions
+    assert len(results) == 2
+    assert results[0].position != results[1].position
+    assert mock_check.call_count == 1
 
 
 def test_multiple_sections_all_iterated():
@@ -282,8 +293,10 @@ def test_exception_on_middle_link_crashes_rule():
     """An unexpected exception on link 2 of 3 is not swallowed.
 
     The links rule does not wrap check_url_valid in try/except, so an
-    unexpected exception propagates. This documents actual behavior:
-    the rule crashes and link 3 is NOT checked.
+    unexpected exception propagates from the worker thread when its
+    result is reached. This documents actual behavior: the rule
+    crashes, although link 3 may already have been checked
+    concurrently.
     """
     md = (
         "# Fragile\n"
@@ -295,7 +308,8 @@ def test_exception_on_middle_link_crashes_rule():
     doc.load(text=md)
     call_count = 0
 
-    def side_effect(document, url, timeout=None, headers=None):
+    def side_effect(document, url, timeout=None, headers=None,
+                    **kwargs):
         nonlocal call_count
         call_count += 1
         if call_count == 2:
@@ -358,3 +372,250 @@ def test_validate_does_not_mutate_config():
     with patch(MOCK_TARGET, return_value=(True, 200, None)):
         validate(doc, config)
     assert config == config_copy
+
+
+# ===================================================================
+#  Lazy iteration
+# ===================================================================
+
+
+def test_closing_iter_validate_cancels_pending_checks():
+    """Links not yet started when the iterator closes are never checked."""
+    links = "".join(f"[l{i}](https://h{i}.example)\n" for i in range(20))
+    doc = Document()
+    doc.load(text="# A\n" + links)
+    calls = []
+
+    def slow_check(document, url, timeout=None, headers=None, **kwargs):
+        calls.append(url)
+        time.sleep(0.1)
+        return False, 404, "nf"
+
+    with patch(MOCK_TARGET, side_effect=slow_check):
+        results = iter_validate(doc, {"validate": True, "concurrency": 1})
+        first = next(results)
+        results.close()
+    assert "https://h0.example" in first.message
+    # The single worker may have started the second link, no more.
+    assert len(calls) <= 2
+
+
+# ===================================================================
+#  Concurrency
+# ===================================================================
+
+
+def _track_concurrency(delays=None):
+    """Return a check_url_valid stand-in recording peak concurrency."""
+    lock = threading.Lock()
+    state = {"active": {}, "peak": {}, "total": 0, "total_peak": 0}
+
+    def side_effect(document, url, timeout=None, headers=None,
+                    **kwargs):
+        host = url.split("/")[2]
+        with lock:
+            state["active"][host] = state["active"].get(host, 0) + 1
+            state["peak"][host] = max(
+                state["peak"].get(host, 0), state["active"][host]
+            )
+            state["total"] += 1
+            state["total_peak"] = max(state["total_peak"], state["total"])
+        time.sleep((delays or {}).get(url, 0.02))
+        with lock:
+            state["active"][host] -= 1
+            state["total"] -= 1
+        return False, 404, None
+
+    return side_effect, state
+
+
+def test_results_keep_document_order():
+    """Results are in document order even when later links finish first."""
+    urls = [f"https://h{i}.example/p" for i in range(5)]
+    doc = Document()
+    doc.load(text="# A\n" + "".join(f"[x]({url})\n" for url in urls))
+    side_effect, _ = _track_concurrency({urls[0]: 0.2})
+    with patch(MOCK_TARGET, side_effect=side_effect):
+        results = validate(doc, {"validate": True})
+    assert [res.message.split("'")[1] for res in results] == urls
+
+
+def test_per_host_limit_is_respected():
+    """No host gets more than per_host_concurrency requests at once."""
+    urls = [f"https://same.example/{i}" for i in range(8)]
+    urls += [f"https://other{i}.example/" for i in range(4)]
+    doc = Document()
+    doc.load(text="# A\n" + "".join(f"[x]({url})\n" for url in urls))
+    side_effect, state = _track_concurrency()
+    config = {"validate": True, "concurrency": 6, "per_host_concurrency": 2}
+    with patch(MOCK_TARGET, side_effect=side_effect):
+        results = validate(doc, config)
+    assert len(results) == len(urls)
+    assert state["peak"]["same.example"] == 2
+    assert state["total_peak"] <= 6
+    assert state["total_peak"] > 2
+
+
+def test_global_limit_is_respected():
+    """No more than concurrency links are checked at once."""
+    urls = [f"https://h{i}.example/" for i in range(10)]
+    doc = Document()
+    doc.load(text="# A\n" + "".join(f"[x]({url})\n" for url in urls))
+    side_effect, state = _track_concurrency()
+    with patch(MOCK_TARGET, side_effect=side_effect):
+        validate(doc, {"validate": True, "concurrency": 3})
+    assert state["total_peak"] == 3
+
+
+def test_documents_share_one_session():
+    """Every document of a run reuses the same kept-alive session."""
+    sessions = []
+    for url in ("https://a.example", "https://b.example"):
+        doc = Document()
+        doc.load(text=f"# A\n[x]({url})\n")
+        with patch(MOCK_TARGET, return_value=(True, 200, None)) as check:
+            validate(doc, {"validate": True})
+        sessions.append(check.call_args.kwargs["session"])
+    assert sessions[0] is sessions[1]
+    assert sessions[0] is not None
+
+
+def test_run_table_checks_url_once_across_documents():
+    """Within a run, documents share the outcome of each URL."""
+    start_url_table()
+    try:
+        with patch(MOCK_TARGET, return_value=(False, 404, None)) as check:
+            for fragment in ("#one", "#two"):
+                doc = Document()
+                doc.load(text=f"# A\n[x](https://A.example/p{fragment})\n")
+                assert len(validate(doc, {"validate": True})) == 1
+    finally:
+        clear_url_table()
+    assert check.call_count == 1
+
+
+def test_run_pool_limits_hold_across_documents():
+    """Within a run, concurrency caps the checks of all documents."""
+    side_effect, state = _track_concurrency()
+    config = {"validate": True, "concurrency": 2}
+    docs = []
+    for name in ("a", "b"):
+        doc = Document()
+        doc.load(text="# A\n" + "".join(
+            f"[x](https://{name}{i}.example/)\n" for i in range(4)
+        ))
+        docs.append(doc)
+    start_host_pools()
+    try:
+        with patch(MOCK_TARGET, side_effect=side_effect):
+            results = iter_validate(docs[0], config)
+            next(results)
+            # The first document stops early, with its checks in
+            # flight; those still count against the run's limit.
+            results.close()
+            assert len(validate(docs[1], config)) == 4
+    finally:
+        clear_host_pools()
+    assert state["total_peak"] == 2
+
+
+def test_local_links_are_checked_in_place():
+    """Anchors and relative links are not sent to the pool."""
+    doc = Document()
+    doc.load(text="# Top\n[up](#top)\n[missing](#nowhere)\n")
+    results = validate(doc, {"validate": True})
+    assert len(results) == 1
+    assert "#nowhere" in results[0].message
+
+
+# ===================================================================
+#  Link cache
+# ===================================================================
+
+
+def _cached_doc(url="https://example.com/page"):
+    doc = Document()
+    doc.load(text=f"# A\n[x]({url})\n")
+    return doc
+
+
+def test_fresh_cache_entry_skips_request(tmp_path):
+    """A link checked within the TTL is not requested again."""
+    config = {"validate": True, "cache": str(tmp_path)}
+    record = LinkRecord(checked_at=time.time(), status=404)
+    with patch(REQUEST_TARGET, return_value=record) as request:
+        first = validate(_cached_doc(), config)
+        second = validate(_cached_doc(), config)
+    assert request.call_count == 1
+    assert len(first) == len(second) == 1
+    assert "Status code: 404" in second[0].message
+
+
+def test_expired_entry_is_revalidated(tmp_path):
+    """An expired valid entry is renewed by a 304 answer."""
+    url = "https://example.com/page"
+    cache = LinkCache(tmp_path)
+    cache.put(url, LinkRecord(
+        checked_at=0.0, etag='"v1"', status=200, valid=True,
+    ))
+    config = {"validate": True, "cache": str(tmp_path), "cache_ttl": 60}
+    not_modified = LinkRecord(checked_at=time.time(), status=304)
+    with patch(REQUEST_TARGET, return_value=not_modified) as request:
+        assert validate(_cached_doc(url), config) == []
+    assert request.call_args.kwargs["etag"] == '"v1"'
+    renewed = cache.get(url)
+    assert renewed.status == 200
+    assert renewed.etag == '"v1"'
+    assert cache.is_fresh(renewed, time.time())
+
+
+def test_expired_failure_is_requested_again(tmp_path):
+    """Failures expire after cache_failure_ttl and carry no validators."""
+    url = "https://example.com/page"
+    cache = LinkCache(tmp_path)
+    cache.put(url, LinkRecord(
+        checked_at=time.time() - 120, etag='"v1"', status=500,
+    ))
+    config = {
+        "validate": True,
+        "cache": str(tmp_path),
+        "cache_failure_ttl": 60,
+    }
+    ok = LinkRecord(checked_at=time.time(), status=200, valid=True)
+    with patch(REQUEST_TARGET, return_value=ok) as request:
+        assert validate(_cached_doc(url), config) == []
+    assert request.call_args.kwargs["etag"] is None
+    assert cache.get(url).valid
+
+
+def test_local_links_are_never_cached(tmp_path):
+    """Anchors are checked against the document, not the cache."""
+    doc = Document()
+    doc.load(text="# Top\n[up](#nowhere)\n")
+    results = validate(doc, {"validate": True, "cache": str(tmp_path)})
+    assert len(results) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+# ===================================================================
+#  Probing options
+# ===================================================================
+
+
+def test_probe_options_default_to_head_first():
+    doc = Document()
+    doc.load(text="# A\n[x](https://example.com)\n")
+    with patch(MOCK_TARGET, return_value=(True, 200, None)) as check:
+        validate(doc, {"validate": True})
+    assert check.call_args.kwargs["head_first"] is True
+    assert check.call_args.kwargs["max_bytes"] == 64 * 1024
+
+
+def test_probe_options_passed_through():
+    doc = Document()
+    doc.load(text="# A\n[x](https://example.com)\n")
+    config = {"validate": True, "head_first": False, "max_bytes": 0}
+    with patch(MOCK_TARGET, return_value=(True, 200, None)) as check:
+        validate(doc, config)
+    assert check.call_args.kwargs["head_first"] is False
+    assert check.call_args.kwargs["max_bytes"] == 0
@@ -1,11 +1,18 @@
 # Standard library
 from __future__ import annotations
+from unittest.mock import patch
+import json
+
+# Third-party
+import pytest
 
 # Local
 from tiredize.core_types import Position
 from tiredize.core_types import RuleResult
 from tiredize.linter.rules import Rule
+from tiredize.linter.rules import clear_rule_registry
 from tiredize.linter.rules import discover_rules
+from tiredize.linter.rules import get_rule_registry
 from tiredize.markdown.types.document import Document
 
 
@@ -67,3 +74,135 @@ def test_discover_rules_default_package():
     for rule_id, rule in rules.items():
         assert isinstance(rule, Rule)
         assert callable(rule.func)
+
+
+def test_discover_rules_reads_cacheable_flag():
+    """Rule modules opt out of result caching with CACHEABLE = False."""
+    rules = discover_rules()
+    assert rules["links"].cacheable is False
+    assert rules["tabs"].cacheable is True
+
+
+def test_discover_rules_reads_requirements():
+    """Rule modules declare the document data they read with REQUIRES."""
+    rules = discover_rules()
+    assert rules["tabs"].requires == frozenset({"lines", "text"})
+    assert "links_inline" in rules["links"].requires
+    simple = discover_rules(SIMPLE_PACKAGE)
+    assert simple["simple_rule"].requires is None
+
+
+def test_discover_rules_reads_iter_validate():
+    """Rule modules may yield results lazily with iter_validate."""
+    rules = discover_rules()
+    assert rules["links"].iter_func is not None
+    assert rules["tabs"].iter_func is None
+
+
+# ===================================================================
+#  get_rule_registry -- process cache and manifest
+# ===================================================================
+
+
+SIMPLE_PACKAGE = "tests.test_cases.rules.01_simple_rule"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    clear_rule_registry()
+    yield
+    clear_rule_registry()
+
+
+def test_registry_discovers_once_per_process():
+    with patch(
+        "tiredize.linter.rules.discover_rules",
+        wraps=discover_rules,
+    ) as mock_discover:
+        first = get_rule_registry(SIMPLE_PACKAGE)
+        second = get_rule_registry(SIMPLE_PACKAGE)
+    assert mock_discover.call_count == 1
+    assert first == second
+    assert first["simple_rule"] is second["simple_rule"]
+
+
+def test_registry_returns_a_copy():
+    rules = get_rule_registry(SIMPLE_PACKAGE)
+    rules.pop("simple_rule")
+    assert "simple_rule" in get_rule_registry(SIMPLE_PACKAGE)
+
+
+def test_registry_matches_discover_rules():
+    assert get_rule_registry() == discover_rules()
+
+
+def test_registry_writes_manifest(tmp_path):
+    manifest = tmp_path / "rules.json"
+    get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    data = json.loads(manifest.read_text(encoding="utf-8"))
+    entry = data["packages"][SIMPLE_PACKAGE]
+    assert entry["rules"] == [{
+        "description": "Simple example rule used for testing.",
+        "id": "simple_rule",
+        "module": f"{SIMPLE_PACKAGE}.simple_rule",
+    }]
+    assert "simple_rule.py" in entry["mtimes"]
+
+
+def test_registry_cold_start_reads_manifest(tmp_path):
+    manifest = tmp_path / "rules.json"
+    expected = get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    clear_rule_registry()
+    with patch("tiredize.linter.rules.discover_rules") as mock_discover:
+        rules = get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    mock_discover.assert_not_called()
+    assert rules == expected
+
+
+def test_registry_stale_manifest_rediscovers(tmp_path):
+    manifest = tmp_path / "rules.json"
+    get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    data = json.loads(manifest.read_text(encoding="utf-8"))
+    data["packages"][SIMPLE_PACKAGE]["mtimes"]["simple_rule.py"] = 0
+    data["packages"][SIMPLE_PACKAGE]["rules"] = []
+    manifest.write_text(json.dumps(data), encoding="utf-8")
+    clear_rule_registry()
+    rules = get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    assert "simple_rule" in rules
+
+
+def test_registry_ignores_corrupt_manifest(tmp_path):
+    manifest = tmp_path / "rules.json"
+    manifest.write_text("{not json", encoding="utf-8")
+    rules = get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    assert "simple_rule" in rules
+    data = json.loads(manifest.read_text(encoding="utf-8"))
+    assert SIMPLE_PACKAGE in data["packages"]
+
+
+@pytest.mark.parametrize("rules_entry", [
+    [{"module": "tests.no_such_module", "id": "x", "description": None}],
+    [{"id": "simple_rule"}],
+    [{"module": 7, "id": "x", "description": None}],
+    ["simple_rule"],
+    7,
+])
+def test_registry_malformed_manifest_rediscovers(tmp_path, rules_entry):
+    manifest = tmp_path / "rules.json"
+    get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    data = json.loads(manifest.read_text(encoding="utf-8"))
+    # The recorded mtimes still match, so only the entry is wrong.
+    data["packages"][SIMPLE_PACKAGE]["rules"] = rules_entry
+    manifest.write_text(json.dumps(data), encoding="utf-8")
+    clear_rule_registry()
+    rules = get_rule_registry(SIMPLE_PACKAGE, manifest=manifest)
+    assert list(rules) == ["simple_rule"]
+
+
+def test_registry_manifest_keeps_cacheable_flag(tmp_path):
+    manifest = tmp_path / "rules.json"
+    get_rule_registry(manifest=manifest)
+    clear_rule_registry()
+    rules = get_rule_registry(manifest=manifest)
+    assert rules["links"].cacheable is False
+    assert rules["line_length"].cacheable is True
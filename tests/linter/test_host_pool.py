@@ -0,0 +1,119 @@
+"""Tests for tiredize/linter/host_pool.py."""
+
+# Standard library
+from __future__ import annotations
+import threading
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.linter.host_pool import HostPool
+from tiredize.linter.host_pool import clear_host_pools
+from tiredize.linter.host_pool import get_host_pool
+from tiredize.linter.host_pool import start_host_pools
+
+
+def test_submit_returns_results():
+    with HostPool(concurrency=4, per_host=2) as pool:
+        futures = [
+            pool.submit(f"h{i % 3}", lambda i=i: i * i) for i in range(9)
+        ]
+        assert [future.result() for future in futures] == [
+            i * i for i in range(9)
+        ]
+
+
+def test_exceptions_reach_the_future():
+    def fail():
+        raise RuntimeError("kaboom")
+
+    with HostPool() as pool:
+        future = pool.submit("h", fail)
+        with pytest.raises(RuntimeError, match="kaboom"):
+            future.result()
+
+
+def test_queued_tasks_of_a_busy_host_wait():
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    with HostPool(concurrency=4, per_host=1) as pool:
+        first = pool.submit("busy", block)
+        started.wait(5)
+        second = pool.submit("busy", lambda: "second")
+        other = pool.submit("idle", lambda: "other")
+        # Another host is not held up by the busy one.
+        assert other.result(timeout=5) == "other"
+        assert not second.done()
+        release.set()
+        assert first.result(timeout=5) == "first"
+        assert second.result(timeout=5) == "second"
+
+
+def test_close_cancels_tasks_not_started():
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    pool = HostPool(concurrency=1, per_host=1)
+    running = pool.submit("h", block)
+    started.wait(5)
+    queued = pool.submit("h", lambda: "never")
+    pool.close()
+    release.set()
+    assert queued.cancelled()
+    running.result(timeout=5)
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.submit("h", lambda: None)
+
+
+def test_close_does_not_wait_for_running_tasks():
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    pool = HostPool(concurrency=2, per_host=1)
+    running = pool.submit("h", block)
+    pool.submit("other", lambda: None).result(timeout=5)
+    started.wait(5)
+    pool.close()
+    workers = [
+        thread for thread in threading.enumerate()
+        if thread.name.startswith("tiredize-links")
+    ]
+    # Daemon workers never hold up the exit of the interpreter.
+    assert workers and all(thread.daemon for thread in workers)
+    assert not running.done()
+    release.set()
+    assert running.result(timeout=5) == "late"
+    for thread in workers:
+        thread.join(5)
+        assert not thread.is_alive()
+
+
+def test_run_pools_are_shared_until_cleared():
+    assert get_host_pool() is None
+    start_host_pools()
+    try:
+        pool = get_host_pool(4, 2)
+        assert get_host_pool(4, 2) is pool
+        assert get_host_pool(4, 3) is not pool
+        assert get_host_pool(0, 0) is get_host_pool(1, 1)
+    finally:
+        clear_host_pools()
+    assert get_host_pool(4, 2) is None
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.submit("h", lambda: None)
@@ -0,0 +1,94 @@
+"""Tests for tiredize/linter/link_cache.py."""
+
+# Standard library
+from __future__ import annotations
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.linter.link_cache import LinkCache
+from tiredize.linter.utils import LinkRecord
+
+
+def test_record_round_trips(tmp_path):
+    cache = LinkCache(tmp_path)
+    record = LinkRecord(
+        checked_at=100.0,
+        etag='"abc"',
+        final_url="https://example.com/new",
+        last_modified="Wed, 21 Oct 2015 07:28:00 GMT",
+        status=200,
+        valid=True,
+    )
+    cache.put("https://example.com/", record)
+    assert cache.get("https://example.com/") == record
+
+
+def test_entries_are_keyed_by_normalized_url(tmp_path):
+    cache = LinkCache(tmp_path)
+    record = LinkRecord(checked_at=1.0, status=404)
+    cache.put("HTTPS://Example.com/a#top", record)
+    assert cache.get("https://example.com/a") == record
+    assert cache.get("https://example.com/A") is None
+
+
+def test_freshness_uses_ttl_of_outcome(tmp_path):
+    cache = LinkCache(tmp_path, success_ttl=100, failure_ttl=10)
+    good = LinkRecord(checked_at=0.0, status=200, valid=True)
+    bad = LinkRecord(checked_at=0.0, error="timeout")
+    assert cache.is_fresh(good, 50)
+    assert not cache.is_fresh(good, 100)
+    assert cache.is_fresh(bad, 5)
+    assert not cache.is_fresh(bad, 50)
+
+
+def test_unreadable_entries_are_misses(tmp_path):
+    cache = LinkCache(tmp_path)
+    cache.put("https://example.com/", LinkRecord(checked_at=1.0))
+    (entry,) = tmp_path.glob("*/*.json")
+    entry.write_text('{"version": 0, "record": {}}', encoding="utf-8")
+    assert cache.get("https://example.com/") is None
+    entry.write_text("not json", encoding="utf-8")
+    assert cache.get("https://example.com/") is None
+
+
+def test_purge_removes_every_entry(tmp_path):
+    cache = LinkCache(tmp_path / "links")
+    for i in range(3):
+        cache.put(f"https://h{i}.example/", LinkRecord(checked_at=1.0))
+    assert cache.purge() == 3
+    assert cache.get("https://h0.example/") is None
+    assert cache.purge() == 0
+
+
+def test_purge_removes_temporary_files_and_shards(tmp_path):
+    cache = LinkCache(tmp_path)
+    cache.put("https://a.example/", LinkRecord(checked_at=1.0))
+    (entry,) = tmp_path.glob("*/*.json")
+    temporary = entry.parent / f".{entry.name}.x1y2"
+    temporary.write_text("{", encoding="utf-8")
+    assert cache.purge() == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_purge_refuses_directory_that_is_not_a_cache(tmp_path):
+    cache = LinkCache(tmp_path)
+    cache.put("https://a.example/", LinkRecord(checked_at=1.0))
+    precious = tmp_path / "notes.txt"
+    precious.write_text("keep me", encoding="utf-8")
+    with pytest.raises(ValueError, match="not a link cache"):
+        cache.purge()
+    assert precious.read_text(encoding="utf-8") == "keep me"
+    assert cache.get("https://a.example/") is not None
+
+
+def test_purge_refuses_foreign_file_in_shard(tmp_path):
+    cache = LinkCache(tmp_path)
+    cache.put("https://a.example/", LinkRecord(checked_at=1.0))
+    (entry,) = tmp_path.glob("*/*.json")
+    foreign = entry.parent / "config.json"
+    foreign.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError, match="config.json"):
+        cache.purge()
+    assert foreign.exists() and entry.exists()
@@ -0,0 +1,72 @@
+"""Tests for tiredize/linter/local_targets.py."""
+
+# Standard library
+from __future__ import annotations
+from unittest.mock import patch
+
+# Local
+from tiredize.linter.local_targets import LocalTargets
+from tiredize.linter.local_targets import clear_local_targets
+from tiredize.linter.local_targets import get_local_targets
+from tiredize.linter.local_targets import start_local_targets
+from tiredize.linter.utils import check_url_valid
+from tiredize.markdown.types.document import Document
+
+
+def test_run_targets_are_started_and_cleared():
+    targets = start_local_targets()
+    assert get_local_targets() is targets
+    clear_local_targets()
+    assert get_local_targets() is None
+
+
+def test_existence_is_looked_up_once(tmp_path):
+    (tmp_path / "a.md").write_text("# A\n")
+    targets = LocalTargets()
+    with patch(
+        "tiredize.linter.local_targets.os.path.exists",
+        return_value=True,
+    ) as exists:
+        for path in (tmp_path / "a.md", tmp_path / "sub" / ".." / "a.md"):
+            assert targets.exists(path)
+    assert exists.call_count == 1
+
+
+def test_target_is_parsed_once(tmp_path):
+    (tmp_path / "a.md").write_text("# One\n\n## Two\n")
+    targets = LocalTargets()
+    with patch.object(
+        Document, "load", autospec=True, side_effect=Document.load
+    ) as load:
+        assert targets.slugs(tmp_path / "a.md") == {"#one", "#two"}
+        assert targets.slugs(tmp_path / "a.md") == {"#one", "#two"}
+    assert load.call_count == 1
+
+
+def test_unreadable_targets_have_no_slugs(tmp_path):
+    (tmp_path / "bad.md").write_bytes(b"\xff\xfe\x00")
+    targets = LocalTargets()
+    assert targets.slugs(tmp_path / "bad.md") is None
+    assert targets.slugs(tmp_path / "missing.md") is None
+    assert targets.slugs(tmp_path) is None
+
+
+def test_run_shares_lookups_between_documents(tmp_path):
+    (tmp_path / "target.md").write_text("# Target\n")
+    docs = []
+    for name in ("one.md", "two.md"):
+        doc = Document()
+        doc.path = tmp_path / name
+        docs.append(doc)
+    start_local_targets()
+    try:
+        with patch(
+            "tiredize.linter.local_targets.os.path.exists",
+            return_value=True,
+        ) as exists:
+            for doc in docs:
+                result = check_url_valid(doc, "./target.md#target")
+                assert result == (True, None, None)
+    finally:
+        clear_local_targets()
+    assert exists.call_count == 1
@@ -0,0 +1,48 @@
+"""Tests for tiredize/linter/sessions.py."""
+
+# Standard library
+from __future__ import annotations
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.linter.sessions import close_sessions
+from tiredize.linter.sessions import get_session
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sessions():
+    close_sessions()
+    yield
+    close_sessions()
+
+
+def test_same_settings_share_a_session():
+    assert get_session(8, 2) is get_session(8, 2)
+    assert get_session(8, 2) is not get_session(8, 3)
+
+
+def test_adapter_uses_pool_settings():
+    session = get_session(pool_size=5, per_host=3)
+    adapter = session.get_adapter("https://example.com")
+    assert adapter._pool_connections == 5
+    assert adapter._pool_maxsize == 3
+    assert session.get_adapter("http://example.com") is adapter
+
+
+def test_non_positive_settings_are_raised_to_one():
+    adapter = get_session(0, -2).get_adapter("https://example.com")
+    assert adapter._pool_connections == 1
+    assert adapter._pool_maxsize == 1
+
+
+def test_cookies_are_not_kept():
+    policy = get_session().cookies.get_policy()
+    assert policy.allowed_domains() == ()
+
+
+def test_close_sessions_starts_over():
+    session = get_session()
+    close_sessions()
+    assert get_session() is not session
@@ -0,0 +1,165 @@
+"""Tests for tiredize/linter/url_table.py."""
+
+# Standard library
+from __future__ import annotations
+import hashlib
+import threading
+import time
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.linter.url_table import STOPPED
+from tiredize.linter.url_table import UrlTable
+from tiredize.linter.url_table import clear_url_table
+from tiredize.linter.url_table import get_url_table
+from tiredize.linter.url_table import normalize_url
+from tiredize.linter.url_table import start_url_table
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Example.COM/Path?Q=1#frag", "https://example.com/Path?Q=1"),
+    ("https://example.com/a#one", "https://example.com/a"),
+    ("https://User@EXAMPLE.com:8443/x", "https://User@example.com:8443/x"),
+    ("http://[::1]:8080/", "http://[::1]:8080/"),
+    ("mailto:Someone@Example.com", "mailto:Someone@Example.com"),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_run_table_is_started_and_cleared():
+    table = start_url_table()
+    assert get_url_table() is table
+    clear_url_table()
+    assert get_url_table() is None
+
+
+def test_each_normalized_url_is_checked_once():
+    calls = []
+
+    def check():
+        calls.append(1)
+        return False, 404, None
+
+    table = UrlTable()
+    for url in ("https://a.example/x", "HTTPS://A.example/x#top"):
+        assert table.check(url, check) == (False, 404, None)
+    assert len(calls) == 1
+
+
+def test_concurrent_callers_wait_for_the_first_check():
+    calls = []
+    started = threading.Event()
+
+    def slow_check():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return True, 200, None
+
+    table = UrlTable()
+    results = []
+    first = threading.Thread(
+        target=lambda: results.append(table.check("https://a.example",
+                                                  slow_check))
+    )
+    first.start()
+    started.wait(5)
+    results.append(table.check("https://a.example", slow_check))
+    first.join(5)
+    assert results == [(True, 200, None)] * 2
+    assert len(calls) == 1
+
+
+def test_failed_check_is_retried():
+    def fail():
+        raise RuntimeError("kaboom")
+
+    table = UrlTable()
+    with pytest.raises(RuntimeError):
+        table.check("https://a.example", fail)
+    assert table.check("https://a.example", lambda: (True, 200, None)) == (
+        True, 200, None
+    )
+
+
+def test_tables_sharing_a_directory_check_once(tmp_path):
+    calls = []
+
+    def check():
+        calls.append(1)
+        return False, None, "timeout"
+
+    # Two tables stand in for two worker processes of one run.
+    first = UrlTable(tmp_path)
+    second = UrlTable(tmp_path)
+    assert first.check("https://a.example", check) == (False, None, "timeout")
+    assert second.check("https://a.example", check) == (
+        False, None, "timeout"
+    )
+    assert len(calls) == 1
+    assert not list(tmp_path.glob("*.lock"))
+
+
+def test_waiter_uses_outcome_of_claiming_process(tmp_path):
+    started = threading.Event()
+
+    def slow_check():
+        started.set()
+        time.sleep(0.2)
+        return True, 200, None
+
+    def never():
+        raise AssertionError("URL fetched by two processes")
+
+    claimant = UrlTable(tmp_path)
+    waiter = UrlTable(tmp_path)
+    thread = threading.Thread(
+        target=claimant.check, args=("https://a.example", slow_check)
+    )
+    thread.start()
+    started.wait(5)
+    assert waiter.check("https://a.example", never) == (True, 200, None)
+    thread.join(5)
+
+
+def test_abandoned_claim_is_taken_over(tmp_path):
+    def fail():
+        raise RuntimeError("kaboom")
+
+    with pytest.raises(RuntimeError):
+        UrlTable(tmp_path).check("https://a.example", fail)
+    # The failed claimant released its lock, so another process checks.
+    assert UrlTable(tmp_path).check(
+        "https://a.example", lambda: (True, 204, None)
+    ) == (True, 204, None)
+
+
+def _claim_forever(tmp_path, url):
+    """Hold the lock of url as a process that never publishes would."""
+    name = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+    (tmp_path / f"{name}.lock").touch()
+
+
+def test_claim_wait_is_bounded_by_wait(tmp_path):
+    _claim_forever(tmp_path, "https://a.example")
+    started = time.monotonic()
+    outcome = UrlTable(tmp_path).check(
+        "https://a.example", lambda: (True, 200, None), wait=0.2
+    )
+    assert outcome == (True, 200, None)
+    assert time.monotonic() - started < 2
+
+
+def test_stopped_run_stops_waiting(tmp_path):
+    _claim_forever(tmp_path, "https://a.example")
+    stop = threading.Event()
+    table = UrlTable(tmp_path, stop.is_set)
+    threading.Timer(0.1, stop.set).start()
+
+    def never():
+        raise AssertionError("checked after the run stopped")
+
+    assert table.check("https://a.example", never) == STOPPED
@@ -1,7 +1,7 @@
 """Tests for tiredize/linter/utils.py.
 
 Covers config helpers (get_config_*), check_url_valid for relative URLs,
-anchors, and HTTP paths. HTTP tests mock requests.get to avoid network
+anchors, and HTTP paths. HTTP tests mock requests.request to avoid network
 calls.
 """
 
@@ -21,6 +21,7 @@ from tiredize.linter.utils import get_config_dict
 from tiredize.linter.utils import get_config_int
 from tiredize.linter.utils import get_config_list
 from tiredize.linter.utils import get_config_str
+from tiredize.linter.utils import request_url
 from tiredize.markdown.types.document import Document
 
 
@@ -226,6 +227,44 @@ def test_relative_url_no_document_path():
     assert "no path" in error
 
 
+def _write_treasure_docs(tmp_path):
+    doc_file = tmp_path / "quest.md"
+    doc_file.write_text("# Quest\n")
+    (tmp_path / "treasure-map.md").write_text(
+        "# Treasure Map\n\n## Hidden Cave\n"
+    )
+    doc = Document()
+    doc.path = doc_file
+    return doc
+
+
+def test_relative_url_anchor_found_in_target(tmp_path):
+    doc = _write_treasure_docs(tmp_path)
+    result = check_url_valid(doc, "./treasure-map.md#hidden-cave")
+    assert result == (True, None, None)
+
+
+def test_relative_url_anchor_missing_in_target(tmp_path):
+    doc = _write_treasure_docs(tmp_path)
+    result = check_url_valid(doc, "./treasure-map.md#dragon-lair")
+    assert result == (False, None, "anchor not found in target document")
+
+
+def test_relative_url_anchor_of_missing_file(tmp_path):
+    doc = _write_treasure_docs(tmp_path)
+    is_valid, _, error = check_url_valid(doc, "./no-map.md#hidden-cave")
+    assert is_valid is False
+    assert error == "relative file not found"
+
+
+def test_relative_url_anchor_in_other_files_is_not_checked(tmp_path):
+    """Only markdown targets have anchors that can be looked up."""
+    doc = _write_treasure_docs(tmp_path)
+    (tmp_path / "map.png").write_bytes(b"\x89PNG")
+    result = check_url_valid(doc, "./map.png#anything")
+    assert result == (True, None, None)
+
+
 # ===================================================================
 #  check_url_valid: anchor path
 # ===================================================================
@@ -307,13 +346,15 @@ def test_relative_url_with_non_ascii_filename(tmp_path):
 # ===================================================================
 
 
-MOCK_TARGET = "tiredize.linter.utils.requests.get"
+MOCK_TARGET = "tiredize.linter.utils.requests.request"
 
 
 def _make_mock_response(status_code):
     """Create a mock response with the given status code."""
     resp = MagicMock()
     resp.status_code = status_code
+    resp.headers = {}
+    resp.url = "https://example.com"
     return resp
 
 
@@ -396,7 +437,7 @@ def test_http_connection_error():
 
 
 def test_http_custom_headers_passed():
-    """Custom headers are forwarded to requests.get."""
+    """Custom headers are forwarded to the request."""
     doc = Document()
     custom = {"Authorization": "Bearer magic-token"}
     with patch(
@@ -422,7 +463,7 @@ def test_http_default_headers_when_none():
 
 
 def test_http_custom_timeout_passed():
-    """Custom timeout is forwarded to requests.get."""
+    """Custom timeout is forwarded to the request."""
     doc = Document()
     with patch(
         MOCK_TARGET, return_value=_make_mock_response(200)
@@ -435,7 +476,7 @@ def test_http_custom_timeout_passed():
 
 
 def test_http_verify_ssl_passed():
-    """Custom verify_ssl is forwarded to requests.get as verify."""
+    """Custom verify_ssl is forwarded to the request as verify."""
     doc = Document()
     with patch(
         MOCK_TARGET, return_value=_make_mock_response(200)
@@ -482,3 +523,150 @@ def test_check_url_valid_does_not_mutate_document_http():
     with patch(MOCK_TARGET, return_value=_make_mock_response(200)):
         check_url_valid(doc, "https://example.com")
     assert doc.string == original_string
+
+
+def test_http_uses_given_session():
+    """With a session, the request goes through session.request."""
+    doc = Document()
+    session = MagicMock()
+    session.request.return_value = _make_mock_response(204)
+    with patch(MOCK_TARGET) as mock_get:
+        result = check_url_valid(doc, "https://example.com", session=session)
+    assert result == (True, 204, None)
+    mock_get.assert_not_called()
+    assert session.request.call_args.kwargs["url"] == "https://example.com"
+
+
+# ===================================================================
+#  request_url
+# ===================================================================
+
+
+def test_request_url_records_validators():
+    """ETag, Last-Modified and the final URL are recorded."""
+    resp = _make_mock_response(200)
+    resp.headers = {"ETag": '"v1"', "Last-Modified": "Tue, 01 Jan 2030"}
+    resp.url = "https://example.com/moved"
+    with patch(MOCK_TARGET, return_value=resp):
+        record = request_url("https://example.com")
+    assert record.valid
+    assert record.status == 200
+    assert record.etag == '"v1"'
+    assert record.last_modified == "Tue, 01 Jan 2030"
+    assert record.final_url == "https://example.com/moved"
+
+
+def test_request_url_sends_conditional_headers():
+    """Validators become If-None-Match and If-Modified-Since."""
+    with patch(MOCK_TARGET, return_value=_make_mock_response(304)) as get:
+        record = request_url(
+            "https://example.com",
+            headers={"X-Test": "1"},
+            etag='"v1"',
+            last_modified="Tue, 01 Jan 2030",
+        )
+    sent = get.call_args.kwargs["headers"]
+    assert sent == {
+        "X-Test": "1",
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Tue, 01 Jan 2030",
+    }
+    assert record.status == 304
+
+
+def test_request_url_does_not_change_given_headers():
+    """The caller's headers dict is copied, not extended."""
+    headers = {"X-Test": "1"}
+    with patch(MOCK_TARGET, return_value=_make_mock_response(304)):
+        request_url("https://example.com", headers=headers, etag='"v1"')
+    assert headers == {"X-Test": "1"}
+
+
+# ===================================================================
+#  request_url: probing
+# ===================================================================
+
+
+def _methods(mock_request):
+    return [call.args[0] for call in mock_request.call_args_list]
+
+
+def test_probe_uses_head_first():
+    """A successful HEAD answers the check without a GET."""
+    with patch(MOCK_TARGET, return_value=_make_mock_response(200)) as req:
+        record = request_url("https://example.com")
+    assert record.valid
+    assert _methods(req) == ["HEAD"]
+
+
+def test_probe_falls_back_to_streamed_get():
+    """A HEAD error is retried as a GET that streams the body."""
+    get = _make_mock_response(200)
+    with patch(
+        MOCK_TARGET, side_effect=[_make_mock_response(405), get]
+    ) as req:
+        record = request_url("https://example.com")
+    assert record.valid
+    assert record.status == 200
+    assert _methods(req) == ["HEAD", "GET"]
+    assert req.call_args.kwargs["stream"] is True
+    get.close.assert_called_once()
+
+
+def test_probe_falls_back_to_get_when_head_raises():
+    """A HEAD request that fails outright is retried as a GET."""
+    with patch(MOCK_TARGET, side_effect=[
+        requests.exceptions.ConnectionError("reset by peer"),
+        _make_mock_response(200),
+    ]) as req:
+        record = request_url("https://example.com")
+    assert record.outcome == (True, 200, None)
+    assert _methods(req) == ["HEAD", "GET"]
+    assert req.call_args.kwargs["stream"] is True
+
+
+def test_probe_without_head_first_only_gets():
+    with patch(MOCK_TARGET, return_value=_make_mock_response(404)) as req:
+        record = request_url("https://example.com", head_first=False)
+    assert record.status == 404
+    assert _methods(req) == ["GET"]
+
+
+def test_large_body_is_not_read():
+    """A body over max_bytes is left unread and its connection closed."""
+    resp = _make_mock_response(200)
+    resp.headers = {"Content-Length": "1000000"}
+    with patch(MOCK_TARGET, return_value=resp):
+        request_url("https://example.com", head_first=False, max_bytes=10)
+    resp.iter_content.assert_not_called()
+    resp.close.assert_called_once()
+
+
+def test_body_of_unknown_length_is_read_up_to_max_bytes():
+    """Without Content-Length, reading stops once max_bytes is passed."""
+    chunks = [b"x" * 8, b"x" * 8, b"x" * 8]
+    read = []
+
+    def iter_content(chunk_size):
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    resp = _make_mock_response(200)
+    resp.iter_content.side_effect = iter_content
+    with patch(MOCK_TARGET, return_value=resp):
+        record = request_url(
+            "https://example.com", head_first=False, max_bytes=10
+        )
+    assert record.valid
+    assert len(read) == 2
+    resp.close.assert_called_once()
+
+
+def test_broken_body_keeps_status():
+    """An error while discarding the body does not fail the check."""
+    resp = _make_mock_response(200)
+    resp.iter_content.side_effect = requests.exceptions.ChunkedEncodingError
+    with patch(MOCK_TARGET, return_value=resp):
+        record = request_url("https://example.com", head_first=False)
+    assert record.outcome == (True, 200, None)
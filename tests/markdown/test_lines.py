@@ -0,0 +1,50 @@
+"""Tests for tiredize/markdown/lines.py."""
+
+# Standard library
+from __future__ import annotations
+
+# Local
+from tiredize.markdown.lines import LineTable
+from tiredize.markdown.types.document import Document
+
+
+def test_line_table_offsets():
+    table = LineTable("ab\n\ncde")
+    assert list(table) == [(0, 3, 2), (3, 4, 3), (4, 7, 7)]
+    assert len(table) == 3
+
+
+def test_line_table_trailing_newline_adds_empty_line():
+    table = LineTable("ab\n")
+    assert list(table) == [(0, 3, 2), (3, 3, 3)]
+
+
+def test_line_table_content_end_excludes_crlf():
+    table = LineTable("ab\r\ncd\r\n")
+    assert list(table) == [(0, 4, 2), (4, 8, 6), (8, 8, 8)]
+
+
+def test_line_table_keeps_carriage_return_without_newline():
+    table = LineTable("a\rb\nc\r")
+    assert list(table) == [(0, 4, 3), (4, 6, 6)]
+
+
+def test_line_table_crlf_only_lines():
+    table = LineTable("\r\n\n\r\r\n")
+    assert list(table) == [(0, 2, 0), (2, 3, 2), (3, 6, 4), (6, 6, 6)]
+
+
+def test_line_table_empty_text():
+    table = LineTable("")
+    assert list(table) == [(0, 0, 0)]
+    assert table.line_col(0) == (1, 0)
+
+
+def test_document_lines_built_once_and_reset_on_load():
+    doc = Document()
+    doc.load(text="a\nb\n")
+    lines = doc.lines
+    assert doc.lines is lines
+    doc.load(text="abc\n")
+    assert doc.lines is not lines
+    assert list(doc.lines.starts) == [0, 4]
@@ -0,0 +1,62 @@
+"""Tests for tiredize/markdown/stream.py.
+
+iter_header_starts must find exactly the header offsets that
+Header.extract() finds on the decoded text, so most tests compare the
+two on the same input.
+"""
+
+# Standard library
+from __future__ import annotations
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.markdown.stream import count_chars
+from tiredize.markdown.stream import iter_header_starts
+from tiredize.markdown.types.header import Header
+
+
+HEADER_CASES = [
+    "",
+    "no headers here\n",
+    "# One\ntext\n## Two\n",
+    "```\n# not a header\n```\n# Real\n",
+    "####### too deep\n# ok\n",
+    "#\nTitle on the next line\n# Next\n",
+    "#\n```\n# inside\n```\nafter\n# Next\n",
+    "# Café 日本\n## é\n",
+    "#\u00a0nbsp counts as whitespace\n",
+    "text\n#no-space\n# space\n",
+]
+
+
+def _char_starts(text: str) -> list[int]:
+    return [header.position.offset for header in Header.extract(text)]
+
+
+def _byte_starts(text: str) -> list[int]:
+    data = text.encode("utf-8")
+    return [
+        len(data[:start].decode("utf-8"))
+        for start in iter_header_starts(memoryview(data))
+    ]
+
+
+@pytest.mark.parametrize("text", HEADER_CASES)
+def test_iter_header_starts_matches_header_extract(text):
+    assert _byte_starts(text) == _char_starts(text)
+
+
+def test_iter_header_starts_yields_byte_offsets():
+    data = "éé\n# Title\n".encode("utf-8")
+    assert list(iter_header_starts(memoryview(data))) == [5]
+
+
+def test_count_chars_counts_characters_not_bytes():
+    data = "aé日\U0001F60A".encode("utf-8")
+    assert count_chars(memoryview(data)) == 4
+
+
+def test_count_chars_empty():
+    assert count_chars(memoryview(b"")) == 0
@@ -0,0 +1,129 @@
+"""Tests for tiredize/markdown/tokenizer.py.
+
+The tokenizer must produce exactly what the individual regex
+extractors produce, so most tests compare the two backends on the
+same input rather than asserting element details directly.
+"""
+
+# Standard library
+from __future__ import annotations
+from pathlib import Path
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.core_types import Position
+from tiredize.markdown.tokenizer import tokenize
+from tiredize.markdown.tokenizer import tokenize_sections
+from tiredize.markdown.types.document import Document
+from tiredize.markdown.types.section import Section
+
+
+FIXTURE = Path("./tests/test_cases/markdown/good-frontmatter-and-markdown.md")
+
+PARITY_CASES = [
+    "",
+    "plain text with no markup at all\n",
+    "# Title\n\nSee [docs](https://example.com \"Docs\") and "
+    "<https://example.org>.\n",
+    "[![badge](https://img.example/b.svg)](https://example.com/ci)\n",
+    "Run [`Get-Process`](https://learn.example/gp) first.\n",
+    "```python\n# not a header\n[not](a-link)\n```\n# Real\n",
+    "````\ncode\n```\nstill code\n````\n",
+    "> quote one\n> quote two\n>> nested\n\ntext\n",
+    "| a | b |\n|---|---|\n| [x](./x.md) | `y` |\nafter\n",
+    "[ref]: ./other.md \"Other\"\n\nUse [the ref][ref] or ![img][ref].\n",
+    "Bare https://example.com/path and ../up/file.md and ./here.md\n",
+    "text `code https://hidden.example` more\n",
+    "#\nheader title on next line\n",
+    "## Same\n\n## Same\n\n## Same\n",
+]
+
+
+def _assert_sections_equal(text: str) -> None:
+    regex = Section.extract(text, base_offset=7, parser_backend="regex")
+    tokens = Section.extract(
+        text,
+        base_offset=7,
+        parser_backend="tokenizer"
+    )
+    assert tokens == regex
+
+
+@pytest.mark.parametrize("text", PARITY_CASES)
+def test_tokenizer_matches_regex_backend(text):
+    _assert_sections_equal(text)
+
+
+def test_tokenizer_matches_regex_backend_on_fixture():
+    _assert_sections_equal(FIXTURE.read_text(encoding="utf-8"))
+
+
+def test_tokenizer_document_matches_regex_document():
+    regex = Document()
+    regex.load(FIXTURE)
+    tokenized = Document(parser_backend="tokenizer")
+    tokenized.load(FIXTURE)
+    assert tokenized.sections == regex.sections
+    assert tokenized.frontmatter == regex.frontmatter
+
+
+def test_tokenize_positions_use_base_offset():
+    tokens = tokenize("see [a](./a.md)\n", base_offset=100)
+    assert len(tokens.links_inline) == 1
+    assert tokens.links_inline[0].position == Position(offset=104, length=11)
+
+
+def test_tokenize_string_safe_blanks_code():
+    text = "a `b` c\n```\nd\n```\n"
+    tokens = tokenize(text)
+    assert tokens.string_safe == "a     c\n   \n \n   \n"
+    assert len(tokens.string_safe) == len(text)
+
+
+def test_tokenize_badge_link_not_reported_as_bare():
+    text = "[![b](https://img.example/b.svg)](https://example.com)\n"
+    tokens = tokenize(text)
+    assert len(tokens.images_inline) == 1
+    assert tokens.links_bare == []
+
+
+def test_tokenize_sections_splits_at_headers():
+    text = "# One\n[a](./a.md)\n## Two\n[b](./b.md)\n"
+    spans = tokenize_sections(text, base_offset=10)
+    assert [t.position for t in spans] == [
+        Position(offset=10, length=18),
+        Position(offset=28, length=19),
+    ]
+    assert [t.headers[0].title for t in spans] == ["One", "Two"]
+    assert [t.links_inline[0].url for t in spans] == ["./a.md", "./b.md"]
+
+
+def test_tokenize_sections_drops_text_before_first_header():
+    spans = tokenize_sections("[early](./e.md)\n# Title\n")
+    assert len(spans) == 1
+    assert spans[0].links_inline == []
+
+
+def test_tokenize_sections_without_headers_covers_whole_text():
+    text = "no headers, just [a](./a.md)\n"
+    spans = tokenize_sections(text)
+    assert len(spans) == 1
+    assert spans[0].position == Position(offset=0, length=len(text))
+    assert spans[0].headers == []
+
+
+def test_tokenize_sections_matches_stop_at_section_end():
+    # The header line contains a pipe, so an unbounded table match
+    # would swallow it as a row.
+    text = "# A\n| a | b |\n|---|---|\n| 1 | 2 |\n# B | x\n"
+    spans = tokenize_sections(text)
+    assert len(spans) == 2
+    assert spans[0].tables[0].rows == [["1", "2"]]
+    _assert_sections_equal(text)
+
+
+def test_unknown_parser_backend_raises():
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        Section.extract("# Title\n", parser_backend="telepathy")
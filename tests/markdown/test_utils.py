@@ -1,11 +1,21 @@
 """Direct tests for tiredize/markdown/utils.py functions.
 
-search_all_re and sanitize_text are the two public utilities used by
-all markdown element extractors. These tests exercise the functions
+search_all_re, iter_all_re, search_first_re, compile_re,
+sanitize_text and SanitizeMask are the public utilities
+used by all markdown element extractors. These tests exercise them
 directly rather than through the element type wrappers.
 """
 
 
+from tiredize.markdown.types.code import CodeBlock
+from tiredize.markdown.types.header import Header
+from tiredize.markdown.types.code import CodeInline
+from tiredize.markdown.types.link import InlineLink
+from tiredize.markdown.utils import SanitizeMask
+from tiredize.markdown.utils import blank_ranges
+from tiredize.markdown.utils import compile_re
+from tiredize.markdown.utils import iter_all_re
+from tiredize.markdown.utils import search_first_re
 from tiredize.markdown.utils import sanitize_text, search_all_re
 
 
@@ -118,6 +128,49 @@ def test_search_all_re_unicode_accented():
     assert matches[0].group() == "caf\u00e9"
 
 
+# ===================================================================
+#  compile_re, iter_all_re, search_first_re -- pattern registry
+# ===================================================================
+
+
+def test_compile_re_returns_cached_pattern():
+    """The same pattern source compiles to the same object."""
+    first = compile_re(Header.RE_HEADER)
+    assert compile_re(Header.RE_HEADER) is first
+
+
+def test_compile_re_uses_verbose():
+    """Registry patterns are compiled with re.VERBOSE."""
+    assert compile_re(r"a b  # comment").fullmatch("ab")
+
+
+def test_iter_all_re_is_lazy():
+    """iter_all_re returns an iterator, not a materialized list."""
+    matches = iter_all_re(r"\d", "1 2 3")
+    assert not isinstance(matches, list)
+    assert next(matches).group() == "1"
+
+
+def test_iter_all_re_matches_search_all_re():
+    """iter_all_re yields exactly what search_all_re returns."""
+    text = "buy 3 llamas and 12 alpacas"
+    lazy = [m.span() for m in iter_all_re(r"\d+", text)]
+    eager = [m.span() for m in search_all_re(r"\d+", text)]
+    assert lazy == eager
+
+
+def test_search_first_re_returns_first_match():
+    """Only the first match is returned."""
+    match = search_first_re(r"\d+", "buy 3 llamas and 12 alpacas")
+    assert match is not None
+    assert match.group() == "3"
+
+
+def test_search_first_re_no_match():
+    """No match returns None."""
+    assert search_first_re(r"unicorn", "just a regular string") is None
+
+
 # ===================================================================
 #  sanitize_text -- basic behavior
 # ===================================================================
@@ -274,3 +327,75 @@ def test_sanitize_text_emoji_preserves_length():
     result = sanitize_text("\U0001F60A", text)
     assert len(result) == len(text)
     assert "\U0001F60A" not in result
+
+
+# ===================================================================
+#  blank_ranges
+# ===================================================================
+
+
+def test_blank_ranges_keeps_newlines_and_length():
+    """Ranges become spaces, newlines inside them survive."""
+    text = "ab\ncd\nef"
+    result = blank_ranges(text, [(1, 4), (6, 7)])
+    assert result == "a \n d\n f"
+    assert len(result) == len(text)
+
+
+def test_blank_ranges_no_ranges_returns_input():
+    """No ranges returns the original string untouched."""
+    text = "nothing to hide"
+    assert blank_ranges(text, []) is text
+
+
+# ===================================================================
+#  SanitizeMask
+# ===================================================================
+
+
+CHAIN = (CodeBlock.RE_CODEBLOCK, CodeInline.RE_CODE_INLINE)
+TEXT = "```\n[a](b)\n```\nsee `[c](d)` and [e](f)\n"
+
+
+def test_sanitize_mask_view_matches_nested_sanitize_text():
+    """A chain view equals nesting sanitize_text calls in order."""
+    mask = SanitizeMask(TEXT)
+    expected = sanitize_text(
+        CodeInline.RE_CODE_INLINE,
+        sanitize_text(CodeBlock.RE_CODEBLOCK, TEXT)
+    )
+    assert mask.view(*CHAIN) == expected
+
+
+def test_sanitize_mask_empty_chain_is_original_text():
+    """With no patterns in the chain, the view is the text itself."""
+    mask = SanitizeMask(TEXT)
+    assert mask.view() is TEXT
+    assert mask.ranges() == []
+
+
+def test_sanitize_mask_matches_are_cached():
+    """The same chain is only matched once per mask."""
+    mask = SanitizeMask(TEXT)
+    first = mask.matches(InlineLink.RE_LINK_INLINE, *CHAIN)
+    second = mask.matches(InlineLink.RE_LINK_INLINE, *CHAIN)
+    assert first is second
+    assert [m.group("url") for m in first] == ["f"]
+
+
+def test_sanitize_mask_ranges_merge_chain_layers():
+    """Ranges hold the union of every layer in the chain, in order."""
+    mask = SanitizeMask(TEXT)
+    code_block_end = TEXT.index("\nsee")
+    code_inline_start = TEXT.index("`[c]")
+    assert mask.ranges(*CHAIN) == [
+        (0, code_block_end),
+        (code_inline_start, code_inline_start + 8),
+    ]
+
+
+def test_sanitize_mask_shared_extract_matches_standalone():
+    """Extractors give the same result with or without a shared mask."""
+    mask = SanitizeMask(TEXT)
+    CodeBlock.extract(TEXT, mask=mask)
+    assert InlineLink.extract(TEXT, mask=mask) == InlineLink.extract(TEXT)
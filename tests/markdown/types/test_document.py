@@ -5,11 +5,13 @@ from pathlib import Path
 from typing import Any
 
 # Third-party
+import pytest
 import yaml
 
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.types.document import Document
+from tiredize.markdown.types.header import HeaderSlugger
 
 
 def test_document_no_path_or_string():
@@ -286,6 +288,153 @@ def test_line_col_zero_length_document():
     assert col == 0
 
 
+# --- roots ---
+
+
+def test_document_roots_are_top_level_sections():
+    doc = Document()
+    doc.load(text="# A\n## B\n# C\n### D\n")
+    assert [s.header.title for s in doc.roots] == ["A", "C"]
+    assert all(s.parent is None for s in doc.roots)
+
+
+# --- slug lookup ---
+
+
+def test_document_slugs_map_to_sections():
+    doc = Document()
+    doc.load(text="# Intro\n\n## Usage\n\n## Usage\n")
+    assert list(doc.slugs) == ["#intro", "#usage", "#usage-1"]
+    assert doc.slugs["#usage-1"] is doc.sections[2]
+
+
+@pytest.mark.parametrize("backend", ["regex", "tokenizer"])
+def test_document_slugs_computed_once_per_header(backend, monkeypatch):
+    calls = []
+    slugify = HeaderSlugger.slugify
+
+    def counting(self, title, record=True):
+        calls.append(title)
+        return slugify(self, title, record)
+
+    monkeypatch.setattr(HeaderSlugger, "slugify", counting)
+    doc = Document(parser_backend=backend)
+    doc.load(text="# One\n## Two\n# One\n")
+    assert calls == ["One", "Two", "One"]
+    assert list(doc.slugs) == ["#one", "#two", "#one-1"]
+
+
+def test_document_slugs_replaced_on_reload():
+    doc = Document()
+    doc.load(text="# First\n")
+    doc.load(text="# Second\n")
+    assert list(doc.slugs) == ["#second"]
+
+
+# --- iter_sections: streaming over a mapped file ---
+
+
+def _loaded_sections(path: Path) -> list:
+    document = Document()
+    document.load(path)
+    for section in document.sections:
+        section.subsections = []
+    return document.sections
+
+
+def test_iter_sections_matches_load(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text(
+        "---\ntitle: x\n---\n\nIntro\n# One\n[a](./a.md)\n"
+        "```\n# code\n```\n## Two \u00e9\n# One\n",
+        encoding="utf-8"
+    )
+    document = Document()
+    sections = list(document.iter_sections(path))
+    assert sections == _loaded_sections(path)
+    assert [s.header.slug for s in sections] == ["#one", "#two-é", "#one-1"]
+    assert sections[1].parent is sections[0]
+    assert sections[1].depth == 1
+    assert document.frontmatter is not None
+    assert document.frontmatter.content == {"title": "x"}
+    assert document.path == path
+
+
+def test_iter_sections_without_headers(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("just text\n", encoding="utf-8")
+    sections = list(Document().iter_sections(path))
+    assert sections == _loaded_sections(path)
+    assert len(sections) == 1
+
+
+def test_iter_sections_empty_file(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("", encoding="utf-8")
+    assert len(list(Document().iter_sections(path))) == 1
+
+
+def test_iter_sections_carriage_returns_fall_back_to_load(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_bytes(b"# One\r\ntext\r\n# Two\r\n")
+    sections = list(Document().iter_sections(path))
+    assert sections == _loaded_sections(path)
+
+
+def test_iter_sections_can_stop_early(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("# One\n# Two\n", encoding="utf-8")
+    sections = Document().iter_sections(path)
+    assert next(sections).header.title == "One"
+    sections.close()
+
+
+def test_iter_sections_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        next(Document().iter_sections(tmp_path / "missing.md"))
+
+
+# --- line index and line_cols ---
+
+
+def test_line_index_matches_newlines():
+    doc = Document()
+    doc.load(text="a\n\nbc\nd")
+    assert list(doc.lines.starts) == [0, 2, 3, 6]
+
+
+def test_line_index_trailing_newline():
+    doc = Document()
+    doc.load(text="Hello\nWorld\n")
+    assert list(doc.lines.starts) == [0, 6, 12]
+
+
+def test_line_cols_matches_line_col_for_sorted_offsets():
+    doc = Document()
+    doc.load(text="Hello\nWorld\n\nEnd")
+    offsets = [0, 3, 6, 6, 11, 12, 13, 15]
+    assert doc.line_cols(offsets) == [doc.line_col(o) for o in offsets]
+
+
+def test_line_cols_handles_unsorted_offsets():
+    doc = Document()
+    doc.load(text="Hello\nWorld\n\nEnd")
+    offsets = [13, 0, 8, 2, 15]
+    assert doc.line_cols(offsets) == [doc.line_col(o) for o in offsets]
+
+
+def test_line_cols_clamps_out_of_range_offsets():
+    doc = Document()
+    doc.load(text="Hello\nWorld\n")
+    assert doc.line_cols([-5, 9999]) == [(1, 0), (3, 0)]
+
+
+def test_line_cols_empty_batch():
+    doc = Document()
+    doc.load(text="Hello\n")
+    assert doc.line_cols([]) == []
+
+
 # --- Document.load() called twice (state mutation) ---
 
 
@@ -303,6 +452,66 @@ def test_document_load_twice_replaces_state():
     assert len(doc.sections) == first_sections
 
 
+# --- load(requires=...) ---
+
+DEMAND_TEXT = "---\ntitle: Demand\n---\n# Title\n\n[a](./a.md)\n"
+
+
+def test_load_text_requirements_skip_parsing():
+    doc = Document()
+    doc.load(text=DEMAND_TEXT, requires={"lines", "text"})
+    assert doc.frontmatter is None
+    assert doc.sections == []
+    assert doc.slugs == {}
+    assert doc.requires == frozenset({"lines", "text"})
+    assert doc.line_col(len(DEMAND_TEXT)) == (7, 0)
+
+
+def test_load_frontmatter_requirement_skips_sections():
+    doc = Document()
+    doc.load(text=DEMAND_TEXT, requires={"frontmatter"})
+    assert doc.frontmatter is not None
+    assert doc.frontmatter.content == {"title": "Demand"}
+    assert doc.sections == []
+    full = Document()
+    full.load(text=DEMAND_TEXT)
+    assert doc.string_markdown == full.string_markdown
+
+
+def test_load_element_requirement_parses_sections():
+    full = Document()
+    full.load(text=DEMAND_TEXT)
+    doc = Document()
+    doc.load(text=DEMAND_TEXT, requires={"links_inline"})
+    assert doc.sections == full.sections
+    assert doc.slugs.keys() == full.slugs.keys()
+    assert full.requires is None
+
+
+def test_load_unknown_requirement_raises():
+    with pytest.raises(ValueError, match="telepathy"):
+        Document().load(text="# Title\n", requires={"telepathy"})
+
+
+def test_load_with_fewer_requirements_clears_previous_parse():
+    doc = Document()
+    doc.load(text=DEMAND_TEXT)
+    doc.load(text=DEMAND_TEXT, requires={"text"})
+    assert doc.sections == []
+    assert doc.frontmatter is None
+
+
+def test_parse_after_text_only_load_matches_full_load():
+    full = Document()
+    full.load(text=DEMAND_TEXT)
+    doc = Document()
+    doc.load(text=DEMAND_TEXT, requires={"text"})
+    doc.parse()
+    assert doc.sections == full.sections
+    assert doc.frontmatter == full.frontmatter
+    assert doc.requires is None
+
+
 # --- Unicode ---
 
 
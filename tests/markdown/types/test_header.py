@@ -7,6 +7,7 @@ import pytest
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.types.header import Header
+from tiredize.markdown.types.header import HeaderSlugger
 
 md_section = """{}
 
@@ -301,6 +302,32 @@ def test_slugify_multiple_duplicates():
     assert slug == "#title-2"
 
 
+# ===================================================================
+#  HeaderSlugger -- incremental slugs
+# ===================================================================
+
+
+def test_slugger_numbers_duplicates_in_order():
+    slugger = HeaderSlugger()
+    slugs = [slugger.slugify(t) for t in ["Title", "Other", "Title", "Title"]]
+    assert slugs == ["#title", "#other", "#title-1", "#title-2"]
+
+
+def test_slugger_matches_slugify_header():
+    titles = ["Intro", "", "Intro", "section", "", "Hello, World!"]
+    slugger = HeaderSlugger()
+    for i, title in enumerate(titles):
+        expected = Header.slugify_header(title, existing=titles[:i])
+        assert slugger.slugify(title) == expected
+
+
+def test_slugger_without_record_does_not_count():
+    slugger = HeaderSlugger()
+    slugger.add("Title")
+    assert slugger.slugify("Title", record=False) == "#title-1"
+    assert slugger.slugify("Title", record=False) == "#title-1"
+
+
 # ===================================================================
 #  Edge cases
 # ===================================================================
@@ -1,7 +1,10 @@
 # Standard library
 from __future__ import annotations
+import dataclasses
 
 # Local
+from tiredize.core_types import Position
+from tiredize.markdown.types.header import Header
 from tiredize.markdown.types.section import Section
 
 
@@ -120,6 +123,43 @@ def test_table_inside_code_block_not_extracted():
     assert sections[0].tables == []
 
 
+# --- Parent and depth ---
+
+
+def test_parent_and_depth_follow_nesting():
+    md = "# A\n## B\n### C\n## D\n# E\n"
+    sections = Section.extract(md)
+    a, b, c, d, e = sections
+    assert [s.depth for s in sections] == [0, 1, 2, 1, 0]
+    assert a.parent is None
+    assert b.parent is a
+    assert c.parent is b
+    assert d.parent is a
+    assert e.parent is None
+
+
+def test_build_tree_returns_roots():
+    sections = Section.extract("## A\n# B\n## C\n# D\n")
+    for section in sections:
+        section.subsections = []
+    roots = Section.build_tree(sections)
+    assert [s.header.title for s in roots] == ["A", "B", "D"]
+    assert [s.header.title for s in sections[1].subsections] == ["C"]
+
+
+def test_attach_without_linking_subsections():
+    sections = Section.extract("# A\n## B\n")
+    for section in sections:
+        section.subsections = []
+        section.parent = None
+    ancestors: list[Section] = []
+    for section in sections:
+        Section.attach(section, ancestors, link_subsections=False)
+    assert sections[1].parent is sections[0]
+    assert sections[1].depth == 1
+    assert sections[0].subsections == []
+
+
 # --- No headers in text (lines 51-60) ---
 
 
@@ -136,8 +176,8 @@ def test_no_headers_creates_single_section():
     assert sections[0].string == md
 
 
-def test_no_headers_level_zero_breaks_map_subsections():
-    """Level-0 headers cause _map_subsections to break (line 167).
+def test_no_headers_level_zero_has_no_subsections():
+    """Level-0 sections never become parents in build_tree.
     Verify no subsections are created for level-0 sections."""
     md = "No headers here."
     sections = Section.extract(md)
@@ -202,3 +242,95 @@ def test_extract_unicode_content():
     sections = Section.extract(md)
     assert len(sections) == 1
     assert sections[0].header.title == "Résumé"
+
+
+# --- Lazy element extraction ---
+
+
+def _loaded(section):
+    return [name for name in Section.ELEMENTS if name in vars(section)]
+
+
+def test_elements_not_extracted_until_accessed():
+    md = "# Title\n\nSee [docs](./docs.md).\n"
+    section = Section.extract(md)[0]
+    assert _loaded(section) == []
+    assert section.header.title == "Title"
+    assert _loaded(section) == []
+
+
+def test_elements_extracted_on_first_access_and_memoized():
+    md = "# Title\n\nSee [docs](./docs.md).\n"
+    section = Section.extract(md)[0]
+    links = section.links_inline
+    assert [link.url for link in links] == ["./docs.md"]
+    assert _loaded(section) == ["links_inline"]
+    assert section.links_inline is links
+
+
+def test_lazy_elements_use_section_offset():
+    md = "# One\n\n# Two\n[a](./a.md)\n"
+    sections = Section.extract(md, base_offset=5)
+    link = sections[1].links_inline[0]
+    assert link.position.offset == 5 + md.index("[a]")
+
+
+def test_lazy_string_safe_blanks_code():
+    md = "# Title\n`code` text\n"
+    section = Section.extract(md)[0]
+    assert section.string_safe == "# Title\n       text\n"
+
+
+def test_lazy_elements_can_be_assigned():
+    section = Section.extract("# Title\n[a](./a.md)\n")[0]
+    section.links_inline = []
+    assert section.links_inline == []
+
+
+def test_sections_compare_equal_by_elements():
+    md = "# Title\n[a](./a.md)\n"
+    first = Section.extract(md)[0]
+    second = Section.extract(md)[0]
+    assert first == second
+    second.links_inline = []
+    assert first != second
+
+
+def test_elements_are_dataclass_fields():
+    names = {f.name for f in dataclasses.fields(Section)}
+    assert set(Section.ELEMENTS) <= names
+
+
+def test_elements_are_constructor_keywords():
+    header = Header(
+        level=1,
+        position=Position(offset=0, length=7),
+        slug="#title",
+        string="# Title",
+        title="Title"
+    )
+    section = Section(
+        header=header,
+        links_inline=[],
+        position=Position(offset=0, length=20),
+        string="# Title\n[a](./a.md)\n",
+        subsections=[]
+    )
+    assert section.links_inline == []
+    assert [link.url for link in section.links_bracket] == []
+    assert len(Section.extract(section.string)[0].links_inline) == 1
+
+
+def test_asdict_and_repr_show_elements():
+    section = Section.extract("# Title\n[a](./a.md)\n")[0]
+    data = dataclasses.asdict(section)
+    assert set(Section.ELEMENTS) <= set(data)
+    assert data["links_inline"][0]["url"] == "./a.md"
+    assert "links_inline=[InlineLink(" in repr(section)
+
+
+def test_replace_keeps_elements():
+    section = Section.extract("# Title\n[a](./a.md)\n")[0]
+    copy = dataclasses.replace(section, subsections=[])
+    assert copy.links_inline == section.links_inline
+    assert copy == section
@@ -0,0 +1,92 @@
+# Standard library
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+# Local
+from tiredize.cache import ResultCache
+from tiredize.core_types import Position
+from tiredize.core_types import RuleResult
+
+
+RESULTS = [
+    (2, 0, RuleResult(
+        message="Line contains a tab character.",
+        position=Position(offset=8, length=1),
+        rule_id="tabs",
+    )),
+    (3, 4, RuleResult(
+        message="Missing section.",
+        position=Position(offset=20, length=0),
+        rule_id=None,
+    )),
+]
+
+
+def _put_many(cache: ResultCache, key: str) -> None:
+    for _ in range(20):
+        cache.put(key, RESULTS)
+
+
+def test_put_then_get_round_trips(tmp_path):
+    cache = ResultCache(tmp_path, "plan")
+    key = cache.key(b"# Title\n\tx\n")
+    assert cache.get(key) is None
+    cache.put(key, RESULTS)
+    assert cache.get(key) == RESULTS
+
+
+def test_key_depends_on_content_and_fingerprint(tmp_path):
+    cache = ResultCache(tmp_path, "plan")
+    other = ResultCache(tmp_path, "other plan")
+    assert cache.key(b"a") == cache.key(b"a")
+    assert cache.key(b"a") != cache.key(b"b")
+    assert cache.key(b"a") != other.key(b"a")
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResultCache(tmp_path, "plan")
+    key = cache.key(b"doc")
+    cache.put(key, RESULTS)
+    entry = next(tmp_path.glob("*/*.json"))
+    entry.write_text("{not json", encoding="utf-8")
+    assert cache.get(key) is None
+    entry.write_text('{"version": 1, "results": [[1]]}', encoding="utf-8")
+    assert cache.get(key) is None
+
+
+def test_unwritable_directory_is_ignored(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = ResultCache(blocker, "plan")
+    cache.put(cache.key(b"doc"), RESULTS)
+    assert cache.get(cache.key(b"doc")) is None
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, "plan")
+    keys = [cache.key(bytes([index])) for index in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, RESULTS)
+        entry = tmp_path / key[:2] / f"{key}.json"
+        os.utime(entry, ns=(age * 10**9, age * 10**9))
+    # Reading the oldest entry makes it the most recently used.
+    assert cache.get(keys[0]) == RESULTS
+    entry_size = (tmp_path / keys[0][:2] / f"{keys[0]}.json").stat().st_size
+    cache.max_bytes = entry_size * 2
+    assert cache.prune() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == RESULTS
+    assert cache.get(keys[2]) == RESULTS
+
+
+def test_concurrent_writers_leave_complete_entry(tmp_path):
+    cache = ResultCache(tmp_path, "plan")
+    key = cache.key(b"shared")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_put_many, [cache] * 4, [key] * 4))
+    assert cache.get(key) == RESULTS
+    assert sorted(path.name for path in tmp_path.rglob("*")) == [
+        key[:2],
+        f"{key}.json",
+    ]
@@ -1,9 +1,28 @@
 # Standard library
 from __future__ import annotations
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from pathlib import Path
+import json
+import threading
+import time
+
+# Third-party
+import pytest
 
 # Local
 from tiredize.cli import main
+from tiredize.linter.link_cache import LinkCache
+from tiredize.linter.rules import clear_rule_registry
+from tiredize.linter.utils import LinkRecord
+from tiredize.plan import ValidationPlan
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(monkeypatch, tmp_path):
+    # The result cache defaults to a directory under the working
+    # directory; keep it out of the repository.
+    monkeypatch.chdir(tmp_path)
 
 
 # --- Argument validation (exit code 2) ---
@@ -384,3 +403,614 @@ def test_invalid_regex_schema_prints_error(capsys, tmp_path):
     assert result == 1
     captured = capsys.readouterr()
     assert "error:" in captured.err
+
+
+# --- Parser backend ---
+
+
+def test_tokenizer_backend_matches_regex_output(capsys, tmp_path):
+    doc = tmp_path / "dual_citizen.md"
+    doc.write_text(
+        "# Title\n\n"
+        "This line is long enough to trip the line length rule.\n"
+    )
+    rules = tmp_path / "tight_rules.yaml"
+    rules.write_text(
+        "line_length:\n"
+        "  maximum_length: 20\n"
+    )
+    main(["--rules", str(rules), str(doc)])
+    regex_out = capsys.readouterr().out
+    result = main([
+        "--parser-backend", "tokenizer",
+        "--rules", str(rules),
+        str(doc),
+    ])
+    assert result == 1
+    assert capsys.readouterr().out == regex_out
+
+
+def test_unknown_parser_backend_exits_with_usage(capsys, tmp_path):
+    doc = tmp_path / "picky.md"
+    doc.write_text("# Title\n")
+    schema = tmp_path / "schema.yaml"
+    schema.write_text("sections:\n  - name: Title\n")
+    try:
+        main([
+            "--parser-backend", "crystal-ball",
+            "--markdown-schema", str(schema),
+            str(doc),
+        ])
+        assert False, "Expected SystemExit was not raised"
+    except SystemExit as exc:
+        assert exc.code == 2
+    assert "crystal-ball" in capsys.readouterr().err
+
+
+# --- Rule manifest ---
+
+
+def test_rule_manifest_is_written(capsys, tmp_path):
+    clear_rule_registry()
+    doc = tmp_path / "manifested.md"
+    doc.write_text("# Title\n")
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("tabs:\n  allowed: false\n")
+    manifest = tmp_path / "cache" / "rules.json"
+    result = main([
+        "--rules", str(rules),
+        "--rule-manifest", str(manifest),
+        str(doc),
+    ])
+    assert result == 0
+    data = json.loads(manifest.read_text(encoding="utf-8"))
+    assert "tabs" in {
+        rule["id"]
+        for rule in data["packages"]["tiredize.linter.rules"]["rules"]
+    }
+
+
+# --- Parallel runs ---
+
+
+def _write_mixed_docs(tmp_path):
+    paths = []
+    for index in range(6):
+        doc = tmp_path / f"doc_{index}.md"
+        body = "x" * (10 + index * 10)
+        doc.write_text(f"# Doc {index}\n\n{body}\n\tindented\n")
+        paths.append(str(doc))
+    paths.insert(3, str(tmp_path / "missing.md"))
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(
+        "line_length:\n"
+        "  maximum_length: 30\n"
+        "tabs:\n"
+        "  allowed: false\n"
+    )
+    return str(rules), paths
+
+
+def test_jobs_output_matches_sequential_run(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    sequential = main(["--rules", rules, *paths])
+    expected = capsys.readouterr()
+    parallel = main(["--jobs", "3", "--rules", rules, *paths])
+    captured = capsys.readouterr()
+    assert parallel == sequential == 1
+    assert captured.out == expected.out
+    assert captured.err == expected.err
+    assert "missing.md" in captured.err
+
+
+def test_jobs_auto_is_accepted(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    main(["--rules", rules, *paths])
+    expected = capsys.readouterr().out
+    main(["--jobs", "auto", "--rules", rules, *paths])
+    assert capsys.readouterr().out == expected
+
+
+def test_jobs_fatal_error_stops_run(capsys, tmp_path):
+    doc_a = tmp_path / "a.md"
+    doc_a.write_text("# A\n")
+    doc_b = tmp_path / "b.md"
+    doc_b.write_text("# B\n")
+    rules = tmp_path / "fantasy_rules.yaml"
+    rules.write_text("the_rule_of_cool:\n  enabled: true\n")
+    result = main(["--jobs", "2", "--rules", str(rules), str(doc_a),
+                   str(doc_b)])
+    assert result == 1
+    assert capsys.readouterr().err.count("the_rule_of_cool") == 1
+
+
+def test_jobs_rejects_non_positive_values(capsys, tmp_path):
+    doc = tmp_path / "a.md"
+    doc.write_text("# A\n")
+    try:
+        main(["--jobs", "0", "--rules", str(doc), str(doc)])
+        assert False, "Expected SystemExit was not raised"
+    except SystemExit as exc:
+        assert exc.code == 2
+    assert "--jobs" in capsys.readouterr().err
+
+
+# --- Output formats ---
+
+
+def test_format_jsonl_matches_text_output(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    main(["--rules", rules, *paths])
+    text = capsys.readouterr()
+    main(["--format", "jsonl", "--rules", rules, *paths])
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    assert [
+        f"{r['path']}:{r['line']}:{r['column']}: "
+        f"[{r['rule_id']}] {r['message']}"
+        for r in records
+    ] == text.out.splitlines()
+    # Errors stay on stderr in every format.
+    assert captured.err == text.err
+
+
+def test_format_sarif_with_fail_fast_is_complete(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    assert main(["--format", "sarif", "--fail-fast", "--rules", rules,
+                 *paths]) == 1
+    log = json.loads(capsys.readouterr().out)
+    results = log["runs"][0]["results"]
+    uris = {
+        res["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
+        for res in results
+    }
+    assert uris == {Path(paths[0]).as_uri()}
+
+
+def test_format_json_with_jobs(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    main(["--format", "json", "--rules", rules, *paths])
+    sequential = json.loads(capsys.readouterr().out)
+    main(["--format", "json", "--jobs", "2", "--rules", rules, *paths])
+    assert json.loads(capsys.readouterr().out) == sequential
+
+
+def test_watch_rejects_array_formats(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    assert main(["--watch", "--format", "sarif", "--rules", rules,
+                 str(doc)]) == 2
+    assert "--watch" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("flags", [
+    ["--jobs", "2"],
+    ["--fail-fast"],
+    ["--max-errors", "1"],
+    ["--max-errors-per-file", "1"],
+    ["--no-cache"],
+    ["--cache-dir", "elsewhere"],
+    ["--profile-rules"],
+    ["--profile-json", "profile.json"],
+])
+def test_watch_rejects_flags_it_cannot_honor(capsys, tmp_path, flags):
+    rules, doc = _write_tab_doc(tmp_path)
+    assert main(["--watch", *flags, "--rules", rules, str(doc)]) == 2
+    err = capsys.readouterr().err
+    assert f"--watch cannot be combined with {flags[0]}" in err
+
+
+# --- Stopping early ---
+
+
+def test_fail_fast_stops_at_first_failing_document(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    clean = tmp_path / "clean.md"
+    clean.write_text("# Clean\n")
+    assert main(["--fail-fast", "--rules", rules, str(clean),
+                 *paths]) == 1
+    captured = capsys.readouterr()
+    reported = {line.split(":")[0] for line in captured.out.splitlines()}
+    assert reported == {paths[0]}
+    assert "stopped at the first document" in captured.err
+
+
+def test_fail_fast_passes_clean_run(capsys, tmp_path):
+    clean = tmp_path / "clean.md"
+    clean.write_text("# Clean\n")
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("tabs:\n  allowed: false\n")
+    assert main(["--fail-fast", "--rules", str(rules), str(clean)]) == 0
+    assert "stopped" not in capsys.readouterr().err
+
+
+def test_max_errors_limits_the_whole_run(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    assert main(["--max-errors", "3", "--rules", rules, *paths]) == 1
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 3
+    assert "stopped after 3 problem(s)" in captured.err
+
+
+def test_max_errors_counts_missing_documents(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    # doc_0, doc_1 and doc_2 have one problem each; missing.md is next.
+    assert main(["--max-errors", "4", "--rules", rules, *paths]) == 1
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 3
+    assert "missing.md" in captured.err
+    assert "doc_4" not in captured.out
+
+
+def test_max_errors_per_file_limits_each_document(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    main(["--no-cache", "--rules", rules, *paths])
+    full = capsys.readouterr().out.splitlines()
+    main(["--max-errors-per-file", "1", "--rules", rules, *paths])
+    limited = capsys.readouterr().out.splitlines()
+    per_file: dict[str, int] = {}
+    for line in limited:
+        path = line.split(":")[0]
+        per_file[path] = per_file.get(path, 0) + 1
+    assert set(per_file.values()) == {1}
+    assert set(per_file) == {line.split(":")[0] for line in full}
+    assert len(limited) < len(full)
+
+
+def test_limited_results_are_not_cached(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    main(["--max-errors-per-file", "1", "--rules", rules, *paths])
+    capsys.readouterr()
+    main(["--rules", rules, *paths])
+    cached = capsys.readouterr().out
+    main(["--no-cache", "--rules", rules, *paths])
+    assert cached == capsys.readouterr().out
+
+
+def test_fail_fast_with_jobs(capsys, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    assert main(["--fail-fast", "--jobs", "2", "--rules", rules,
+                 *paths]) == 1
+    captured = capsys.readouterr()
+    reported = {line.split(":")[0] for line in captured.out.splitlines()}
+    assert reported == {paths[0]}
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(5)
+        self.send_response(200)
+        self.end_headers()
+
+    do_HEAD = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fail_fast_does_not_wait_for_slow_links(capsys, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    broken = tmp_path / "broken.md"
+    broken.write_text("# Broken\n\n[gone](#missing)\n")
+    slow = tmp_path / "slow.md"
+    url = f"http://127.0.0.1:{server.server_port}/"
+    slow.write_text(f"# Slow\n\n[slow]({url})\n")
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("links:\n  validate: true\n  timeout: 30\n")
+    started = time.monotonic()
+    try:
+        assert main(["--fail-fast", "--jobs", "2", "--rules", str(rules),
+                     str(broken), str(slow)]) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+    # The slow document's request is abandoned, not waited for.
+    assert time.monotonic() - started < 4
+    assert "stopped at the first document" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "many"])
+def test_max_errors_rejects_non_positive_values(capsys, tmp_path, value):
+    doc = tmp_path / "a.md"
+    doc.write_text("# A\n")
+    with pytest.raises(SystemExit) as exc:
+        main(["--max-errors", value, "--rules", str(doc), str(doc)])
+    assert exc.value.code == 2
+    assert "--max-errors" in capsys.readouterr().err
+
+
+# --- Result cache ---
+
+
+def _write_tab_doc(tmp_path):
+    doc = tmp_path / "cached.md"
+    doc.write_text("# Title\n\tindented\n")
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("tabs:\n  allowed: false\n")
+    return str(rules), doc
+
+
+def _forbid_loading(monkeypatch):
+    def refuse(self, path, timer=None):
+        raise AssertionError(f"{path} was parsed instead of cached")
+    monkeypatch.setattr(ValidationPlan, "load", refuse)
+
+
+def test_unchanged_document_served_from_cache(capsys, monkeypatch, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    assert main(["--rules", rules, str(doc)]) == 1
+    first = capsys.readouterr().out
+    assert (tmp_path / ".tiredize_cache").is_dir()
+    _forbid_loading(monkeypatch)
+    assert main(["--rules", rules, str(doc)]) == 1
+    assert capsys.readouterr().out == first
+
+
+def test_changed_document_misses_cache(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    main(["--rules", rules, str(doc)])
+    capsys.readouterr()
+    doc.write_text("# Title\n\tindented\n\tagain\n")
+    main(["--rules", rules, str(doc)])
+    assert capsys.readouterr().out.count("[tabs]") == 2
+
+
+def test_changed_config_misses_cache(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    main(["--rules", rules, str(doc)])
+    capsys.readouterr()
+    Path(rules).write_text("tabs:\n  allowed: true\n")
+    assert main(["--rules", rules, str(doc)]) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_no_cache_checks_every_document(capsys, monkeypatch, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    main(["--rules", rules, str(doc)])
+    capsys.readouterr()
+    _forbid_loading(monkeypatch)
+    with pytest.raises(AssertionError, match="parsed instead of cached"):
+        main(["--no-cache", "--rules", rules, str(doc)])
+
+
+def test_cache_dir_option(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    cache_dir = tmp_path / "elsewhere"
+    main(["--cache-dir", str(cache_dir), "--rules", rules, str(doc)])
+    assert any(cache_dir.glob("*/*.json"))
+    assert not (tmp_path / ".tiredize_cache").exists()
+
+
+def test_link_checking_is_never_cached(capsys, tmp_path):
+    doc = tmp_path / "linked.md"
+    doc.write_text("# Title\n\n[other](./other.md)\n")
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("links:\n  validate: true\n")
+    assert main(["--rules", str(rules), str(doc)]) == 1
+    capsys.readouterr()
+    (tmp_path / "other.md").write_text("# Other\n")
+    assert main(["--rules", str(rules), str(doc)]) == 0
+    assert not (tmp_path / ".tiredize_cache").exists()
+
+
+def test_parallel_workers_share_cache(capsys, monkeypatch, tmp_path):
+    rules, paths = _write_mixed_docs(tmp_path)
+    main(["--jobs", "2", "--rules", rules, *paths])
+    expected = capsys.readouterr()
+    _forbid_loading(monkeypatch)
+    existing = [path for path in paths if Path(path).exists()]
+    missing = [path for path in paths if not Path(path).exists()]
+    assert missing
+    main(["--rules", rules, *existing])
+    assert capsys.readouterr().out == expected.out
+
+
+# --- Profiling ---
+
+
+def test_profile_rules_prints_table(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    assert main(["--no-cache", "--profile-rules", "--rules", rules,
+                 str(doc)]) == 1
+    captured = capsys.readouterr()
+    assert "[tabs]" in captured.out
+    rows = [line.split() for line in captured.err.splitlines()]
+    assert ["kind", "name"] == rows[0][:2]
+    assert ["rule", "tabs", "1"] in [row[:3] for row in rows]
+    assert ["phase", "parse", "1"] in [row[:3] for row in rows]
+    assert "1 file(s)" in captured.err
+
+
+def test_profile_json_reports_each_file(tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    other = tmp_path / "other.md"
+    other.write_text("# Other\n")
+    out = tmp_path / "profile.json"
+    main(["--no-cache", "--profile-json", str(out), "--rules", rules,
+          str(doc), str(other)])
+    data = json.loads(out.read_text())
+    assert set(data["files"]) == {str(doc), str(other)}
+    tabs = [row for row in data["totals"] if row["name"] == "tabs"]
+    assert tabs[0]["kind"] == "rule"
+    assert tabs[0]["calls"] == 2
+
+
+def test_profile_counts_cache_hits(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    main(["--rules", rules, str(doc)])
+    capsys.readouterr()
+    main(["--profile-rules", "--rules", rules, str(doc)])
+    rows = [line.split()[:3] for line in capsys.readouterr().err.splitlines()]
+    assert ["phase", "cache", "1"] in rows
+    assert not any(row[0] == "rule" for row in rows)
+
+
+def test_profile_with_jobs(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    main(["--no-cache", "--jobs", "2", "--profile-rules", "--rules",
+          rules, str(doc)])
+    rows = [line.split()[:2] for line in capsys.readouterr().err.splitlines()]
+    assert ["rule", "tabs"] in rows
+
+
+def test_no_profile_output_by_default(capsys, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    main(["--no-cache", "--rules", rules, str(doc)])
+    assert "timed" not in capsys.readouterr().err
+
+
+# --- Watch mode ---
+
+
+def _run_watch(monkeypatch, argv, steps):
+    """Run --watch, applying one step per poll, then interrupting."""
+    remaining = list(steps)
+
+    def fake_sleep(seconds):
+        if not remaining:
+            raise KeyboardInterrupt
+        remaining.pop(0)()
+
+    monkeypatch.setattr("tiredize.cli.time.sleep", fake_sleep)
+    return main(["--watch", *argv])
+
+
+def test_watch_rechecks_only_changed_documents(capsys, monkeypatch,
+                                               tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    other = tmp_path / "other.md"
+    other.write_text("# Other\n\tx\n")
+    loaded = []
+    original_load = ValidationPlan.load
+
+    def counting_load(self, path):
+        loaded.append(path.name)
+        return original_load(self, path)
+
+    monkeypatch.setattr(ValidationPlan, "load", counting_load)
+
+    def fix_doc():
+        doc.write_text("# Title\n    indented\n")
+
+    result = _run_watch(
+        monkeypatch,
+        ["--rules", rules, str(doc), str(other)],
+        [fix_doc],
+    )
+    captured = capsys.readouterr()
+    assert loaded == ["cached.md", "other.md", "cached.md"]
+    assert captured.out.count("cached.md") == 1
+    assert captured.out.count("other.md") == 1
+    assert "checked 2 file(s), 2 with problems" in captured.err
+    assert "checked 1 file(s), 1 with problems" in captured.err
+    assert result == 1
+
+
+def test_watch_config_change_rechecks_everything(capsys, monkeypatch,
+                                                 tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+    loaded = []
+    original_load = ValidationPlan.load
+
+    def counting_load(self, path):
+        loaded.append(path.name)
+        return original_load(self, path)
+
+    monkeypatch.setattr(ValidationPlan, "load", counting_load)
+
+    def allow_tabs():
+        Path(rules).write_text("tabs:\n  allowed: true\n\n")
+
+    result = _run_watch(monkeypatch, ["--rules", rules, str(doc)],
+                        [allow_tabs])
+    captured = capsys.readouterr()
+    # The parsed document is reused with the rebuilt plan.
+    assert loaded == ["cached.md"]
+    assert "checked 1 file(s), 0 with problems" in captured.err
+    assert result == 0
+
+
+def test_watch_survives_broken_config(capsys, monkeypatch, tmp_path):
+    rules, doc = _write_tab_doc(tmp_path)
+
+    def break_rules():
+        Path(rules).write_text("the_rule_of_cool:\n  enabled: true\n")
+
+    def fix_rules():
+        Path(rules).write_text("tabs:\n  allowed: false\n\n\n")
+
+    result = _run_watch(monkeypatch, ["--rules", rules, str(doc)],
+                        [break_rules, fix_rules])
+    captured = capsys.readouterr()
+    assert "the_rule_of_cool" in captured.err
+    assert captured.out.count("[tabs]") == 2
+    assert result == 1
+
+
+def test_watch_reports_missing_then_created_document(capsys, monkeypatch,
+                                                     tmp_path):
+    rules, _ = _write_tab_doc(tmp_path)
+    late = tmp_path / "late.md"
+
+    def create():
+        late.write_text("# Late\n")
+
+    result = _run_watch(monkeypatch, ["--rules", rules, str(late)],
+                        [create])
+    captured = capsys.readouterr()
+    assert "error:" in captured.err
+    assert "checked 1 file(s), 0 with problems" in captured.err
+    assert result == 0
+
+
+# --- Link cache ---
+
+
+def _fill_link_cache(directory, count=2):
+    cache = LinkCache(directory)
+    for i in range(count):
+        cache.put(f"https://h{i}.example/", LinkRecord(checked_at=1.0))
+    return cache
+
+
+def test_purge_link_cache_at_path(capsys, tmp_path):
+    cache = _fill_link_cache(tmp_path / "links")
+    result = main(["--purge-link-cache", str(tmp_path / "links")])
+    captured = capsys.readouterr()
+    assert result == 0
+    assert "-- removed 2 link cache entries" in captured.err
+    assert cache.get("https://h0.example/") is None
+
+
+def test_purge_link_cache_from_rules(capsys, tmp_path):
+    cache = _fill_link_cache(tmp_path / "links", count=3)
+    rules = tmp_path / "rules.yaml"
+    rules.write_text(
+        f"links:\n  validate: true\n  cache: {tmp_path / 'links'}\n"
+    )
+    result = main(["--rules", str(rules), "--purge-link-cache"])
+    captured = capsys.readouterr()
+    assert result == 0
+    assert "-- removed 3 link cache entries" in captured.err
+    assert cache.get("https://h1.example/") is None
+
+
+def test_purge_link_cache_keeps_unrelated_directory(capsys, tmp_path):
+    precious = tmp_path / "precious"
+    precious.mkdir()
+    (precious / "thesis.md").write_text("# Years of work\n")
+    result = main(["--purge-link-cache", str(precious)])
+    captured = capsys.readouterr()
+    assert result == 1
+    assert "not a link cache" in captured.err
+    assert (precious / "thesis.md").exists()
+
+
+def test_purge_link_cache_without_cache_fails(capsys, tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("links:\n  validate: true\n")
+    result = main(["--rules", str(rules), "--purge-link-cache"])
+    captured = capsys.readouterr()
+    assert result == 1
+    assert "no link cache to purge" in captured.err
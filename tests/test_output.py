@@ -0,0 +1,117 @@
+# Standard library
+from __future__ import annotations
+import io
+import json
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.core_types import Position
+from tiredize.core_types import RuleResult
+from tiredize.output import FORMATS
+from tiredize.output import make_emitter
+
+
+def _finding(line, col, message="Tab found", rule_id="tabs"):
+    return (line, col, RuleResult(
+        message=message,
+        position=Position(offset=line * 10 + col, length=1),
+        rule_id=rule_id,
+    ))
+
+
+def _write(output_format, documents):
+    stream = io.StringIO()
+    emitter = make_emitter(output_format, stream)
+    for path, findings in documents:
+        emitter.emit(path, findings)
+    emitter.close()
+    return stream.getvalue()
+
+
+DOCUMENTS = [
+    ("a.md", [_finding(1, 0), _finding(2, 4, 'Say "hi"\tthere')]),
+    ("empty.md", []),
+    ("dir/b c.md", [_finding(3, 1, rule_id="line_length")]),
+]
+
+
+def test_text_matches_classic_output():
+    assert _write("text", DOCUMENTS) == (
+        "a.md:1:0: [tabs] Tab found\n"
+        'a.md:2:4: [tabs] Say "hi"\tthere\n'
+        "dir/b c.md:3:1: [line_length] Tab found\n"
+    )
+
+
+def test_jsonl_writes_one_object_per_result():
+    lines = _write("jsonl", DOCUMENTS).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert records[1] == {
+        "column": 4,
+        "length": 1,
+        "line": 2,
+        "message": 'Say "hi"\tthere',
+        "offset": 24,
+        "path": "a.md",
+        "rule_id": "tabs",
+    }
+    assert [record["path"] for record in records] == [
+        "a.md", "a.md", "dir/b c.md"
+    ]
+
+
+def test_json_is_an_array_of_jsonl_records():
+    jsonl = [json.loads(line) for line in _write("jsonl", DOCUMENTS)
+             .splitlines()]
+    assert json.loads(_write("json", DOCUMENTS)) == jsonl
+
+
+def test_sarif_log_has_results_with_one_based_columns():
+    log = json.loads(_write("sarif", DOCUMENTS))
+    assert log["version"] == "2.1.0"
+    run = log["runs"][0]
+    assert run["tool"]["driver"]["name"] == "tiredize"
+    assert len(run["results"]) == 3
+    last = run["results"][2]
+    assert last["ruleId"] == "line_length"
+    location = last["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == "dir/b%20c.md"
+    assert location["region"]["startLine"] == 3
+    assert location["region"]["startColumn"] == 2
+
+
+def test_sarif_absolute_paths_are_file_uris(tmp_path):
+    path = str(tmp_path / "a.md")
+    log = json.loads(_write("sarif", [(path, [_finding(1, 0)])]))
+    location = log["runs"][0]["results"][0]["locations"][0]
+    uri = location["physicalLocation"]["artifactLocation"]["uri"]
+    assert uri == (tmp_path / "a.md").as_uri()
+
+
+def test_runs_without_results_are_still_valid():
+    assert json.loads(_write("json", [("a.md", [])])) == []
+    log = json.loads(_write("sarif", [("a.md", [])]))
+    assert log["runs"][0]["results"] == []
+
+
+def test_each_document_is_written_at_once():
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            CountingStream.writes += 1
+            return super().write(text)
+
+    emitter = make_emitter("jsonl", CountingStream())
+    emitter.emit("a.md", [_finding(line, 0) for line in range(1, 100)])
+    assert CountingStream.writes == 1
+    assert emitter.count == 99
+
+
+def test_every_format_has_an_emitter():
+    for output_format in FORMATS:
+        _write(output_format, DOCUMENTS)
+    with pytest.raises(ValueError, match="yaml"):
+        make_emitter("yaml", io.StringIO())
@@ -0,0 +1,217 @@
+# Standard library
+from __future__ import annotations
+import pickle
+
+# Third-party
+import pytest
+
+# Local
+from tiredize.core_types import RuleNotFoundError
+from tiredize.linter.engine import run_linter
+from tiredize.linter.rules import Rule
+from tiredize.markdown.types.document import Document
+from tiredize.markdown.types.schema import load_schema
+from tiredize.plan import ValidationPlan
+from tiredize.profiling import PhaseTimer
+from tiredize.validators.markdown_schema import validate
+
+
+def _write_config(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("tabs:\n  allowed: false\n")
+    schema = tmp_path / "schema.yaml"
+    schema.write_text("sections:\n  - name: Title\n")
+    frontmatter = tmp_path / "frontmatter.yaml"
+    frontmatter.write_text("fields:\n  title:\n    type: string\n")
+    return rules, schema, frontmatter
+
+
+def test_from_files_parses_every_config(tmp_path):
+    rules, schema, frontmatter = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(
+        rules_path=rules,
+        markdown_schema_path=schema,
+        frontmatter_schema_path=frontmatter,
+        parser_backend="tokenizer",
+    )
+    assert [rule.id for rule, _ in plan.rules] == ["tabs"]
+    assert plan.markdown_schema is not None
+    assert plan.frontmatter_schema is not None
+    assert plan.parser_backend == "tokenizer"
+
+
+def test_from_files_without_config_checks_nothing(tmp_path):
+    doc = tmp_path / "doc.md"
+    doc.write_text("\tno rules apply\n")
+    plan = ValidationPlan.from_files()
+    assert plan.validate(plan.load(doc)) == []
+
+
+def test_validate_matches_individual_checks(tmp_path):
+    rules, schema, frontmatter = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(
+        rules_path=rules,
+        markdown_schema_path=schema,
+        frontmatter_schema_path=frontmatter,
+    )
+    doc = Document()
+    doc.load(text="# Title\n\tindented\n# Extra\n")
+    results = plan.validate(doc)
+    expected = run_linter(doc, {"tabs": {"allowed": False}})
+    expected += validate(doc, load_schema(schema.read_text()))
+    assert results[:len(expected)] == expected
+    assert results[-1].rule_id == "schema.frontmatter.missing_field"
+
+
+def test_plan_is_reused_across_documents(tmp_path):
+    rules, _, _ = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(rules_path=rules)
+    for name in ("a.md", "b.md"):
+        doc = tmp_path / name
+        doc.write_text("# T\n\tx\n")
+        assert len(plan.validate(plan.load(doc))) == 1
+
+
+def test_unknown_rule_fails_when_building(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("the_rule_of_cool:\n  enabled: true\n")
+    with pytest.raises(RuleNotFoundError):
+        ValidationPlan.from_files(rules_path=rules)
+
+
+def test_scalar_rules_yaml_raises(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("42\n")
+    with pytest.raises(ValueError, match="Expected YAML mapping"):
+        ValidationPlan.from_files(rules_path=rules)
+
+
+def test_plan_survives_pickling(tmp_path):
+    rules, schema, frontmatter = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(
+        rules_path=rules,
+        markdown_schema_path=schema,
+        frontmatter_schema_path=frontmatter,
+    )
+    assert pickle.loads(pickle.dumps(plan)) == plan
+
+
+def test_fingerprint_tracks_configuration(tmp_path):
+    rules, schema, _ = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(rules_path=rules)
+    same = ValidationPlan.from_files(rules_path=rules)
+    assert plan.fingerprint() == same.fingerprint()
+    rules.write_text("tabs:\n  allowed: true\n")
+    changed = ValidationPlan.from_files(rules_path=rules)
+    assert changed.fingerprint() != plan.fingerprint()
+    with_schema = ValidationPlan.from_files(
+        rules_path=rules,
+        markdown_schema_path=schema
+    )
+    assert with_schema.fingerprint() != changed.fingerprint()
+    backend = ValidationPlan.from_files(
+        rules_path=rules,
+        parser_backend="tokenizer"
+    )
+    assert backend.fingerprint() != changed.fingerprint()
+
+
+def test_plan_with_link_checks_is_not_cacheable(tmp_path):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("tabs:\n  allowed: false\n")
+    assert ValidationPlan.from_files(rules_path=rules).cacheable
+    rules.write_text("links:\n  validate: true\n")
+    assert not ValidationPlan.from_files(rules_path=rules).cacheable
+
+
+def test_requires_is_union_of_checks(tmp_path):
+    rules, schema, frontmatter = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(rules_path=rules)
+    assert plan.requires == frozenset({"lines", "text"})
+    plan = ValidationPlan.from_files(
+        rules_path=rules,
+        markdown_schema_path=schema,
+        frontmatter_schema_path=frontmatter,
+    )
+    assert plan.requires == frozenset(
+        {"frontmatter", "lines", "sections", "text"}
+    )
+
+
+def test_undeclared_rule_requires_full_parse():
+    def validate(document, config):
+        return []
+    plan = ValidationPlan.from_config(
+        rule_configs={"custom": {}},
+        rules={"custom": Rule(id="custom", func=validate)},
+    )
+    assert plan.requires is None
+
+
+def test_unknown_rule_requirement_raises():
+    def validate(document, config):
+        return []
+    rule = Rule(id="custom", func=validate, requires=frozenset({"vibes"}))
+    with pytest.raises(ValueError, match="vibes"):
+        ValidationPlan.from_config(
+            rule_configs={"custom": {}},
+            rules={"custom": rule},
+        )
+
+
+def test_whitespace_rules_skip_markdown_parsing(monkeypatch, tmp_path):
+    rules, _, _ = _write_config(tmp_path)
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Title\n\tindented\n")
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("markdown was parsed")
+
+    monkeypatch.setattr(
+        "tiredize.markdown.types.document.Section.extract",
+        refuse
+    )
+    plan = ValidationPlan.from_files(rules_path=rules)
+    results = plan.validate(plan.load(doc))
+    assert [res.rule_id for res in results] == ["tabs"]
+
+
+def test_timer_records_phases_rules_and_schemas(tmp_path):
+    rules, schema, frontmatter = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(
+        rules_path=rules,
+        markdown_schema_path=schema,
+        frontmatter_schema_path=frontmatter,
+    )
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Title\n\tindented\n")
+    timer = PhaseTimer()
+    timed = plan.validate(plan.load(doc, timer), timer)
+    assert timed == plan.validate(plan.load(doc))
+    assert set(timer.stats) == {
+        ("phase", "load"),
+        ("phase", "parse"),
+        ("rule", "tabs"),
+        ("schema", "frontmatter"),
+        ("schema", "markdown"),
+    }
+    assert all(stats.calls == 1 for stats in timer.stats.values())
+
+
+def test_validate_limit_skips_schemas(monkeypatch, tmp_path):
+    rules, schema, frontmatter = _write_config(tmp_path)
+    plan = ValidationPlan.from_files(
+        rules_path=rules,
+        markdown_schema_path=schema,
+        frontmatter_schema_path=frontmatter,
+    )
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("schema checked after the limit")
+
+    monkeypatch.setattr("tiredize.plan.validate_markdown", refuse)
+    monkeypatch.setattr("tiredize.plan.validate_frontmatter", refuse)
+    doc = Document()
+    doc.load(text="# Title\n\tone\n\ttwo\n")
+    assert len(plan.validate(doc, limit=1)) == 1
+    assert len(plan.validate(doc, PhaseTimer(), limit=1)) == 1
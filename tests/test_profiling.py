@@ -0,0 +1,81 @@
+# Standard library
+from __future__ import annotations
+
+# Local
+from tiredize.profiling import PhaseStats
+from tiredize.profiling import PhaseTimer
+from tiredize.profiling import Profiler
+from tiredize.profiling import optional_phase
+
+
+def test_phase_counts_calls_and_time():
+    timer = PhaseTimer()
+    for _ in range(3):
+        with timer.phase("rule", "tabs"):
+            pass
+    stats = timer.stats[("rule", "tabs")]
+    assert stats.calls == 3
+    assert stats.seconds >= 0.0
+
+
+def test_phase_records_time_when_body_raises():
+    timer = PhaseTimer()
+    try:
+        with timer.phase("phase", "parse"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert timer.stats[("phase", "parse")].calls == 1
+
+
+def test_optional_phase_without_timer_does_nothing():
+    with optional_phase(None, "phase", "parse"):
+        pass
+
+
+def test_profiler_aggregates_files():
+    profiler = Profiler()
+    profiler.add("a.md", {("rule", "tabs"): PhaseStats(1, 0.5)})
+    profiler.add("b.md", {
+        ("rule", "tabs"): PhaseStats(1, 0.25),
+        ("phase", "parse"): PhaseStats(1, 1.0),
+    })
+    assert profiler.totals[("rule", "tabs")] == PhaseStats(2, 0.75)
+    assert set(profiler.files) == {"a.md", "b.md"}
+
+
+def test_table_is_sorted_slowest_first():
+    profiler = Profiler()
+    profiler.add("a.md", {
+        ("rule", "tabs"): PhaseStats(2, 0.5),
+        ("phase", "parse"): PhaseStats(1, 1.5),
+    })
+    lines = profiler.format_table().splitlines()
+    assert lines[0].split() == [
+        "kind", "name", "calls", "total", "ms", "mean", "ms", "%"
+    ]
+    assert lines[1].split() == ["phase", "parse", "1", "1500.00",
+                                "1500.000", "75.0"]
+    assert lines[2].split() == ["rule", "tabs", "2", "500.00",
+                                "250.000", "25.0"]
+    assert lines[-1] == "1 file(s), 2000.00 ms timed"
+
+
+def test_empty_table_has_no_division_by_zero():
+    lines = Profiler().format_table().splitlines()
+    assert lines[-1] == "0 file(s), 0.00 ms timed"
+
+
+def test_json_has_totals_and_files():
+    profiler = Profiler()
+    profiler.add("a.md", {("rule", "tabs"): PhaseStats(1, 0.5)})
+    assert profiler.to_json() == {
+        "files": {
+            "a.md": [
+                {"calls": 1, "kind": "rule", "name": "tabs", "seconds": 0.5}
+            ],
+        },
+        "totals": [
+            {"calls": 1, "kind": "rule", "name": "tabs", "seconds": 0.5}
+        ],
+    }
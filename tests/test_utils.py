@@ -0,0 +1,57 @@
+# Standard library
+from __future__ import annotations
+import json
+
+# Local
+from tiredize.utils import RunState
+from tiredize.utils import atomic_write_json
+from tiredize.utils import read_json
+
+
+def test_atomic_write_json_round_trips(tmp_path):
+    path = tmp_path / "a" / "b" / "entry.json"
+    assert atomic_write_json(path, {"version": 1, "x": [1, 2]})
+    assert read_json(path) == {"version": 1, "x": [1, 2]}
+    assert [p.name for p in path.parent.iterdir()] == ["entry.json"]
+
+
+def test_atomic_write_json_passes_options(tmp_path):
+    path = tmp_path / "entry.json"
+    atomic_write_json(path, {"b": 1, "a": 2}, indent=2, sort_keys=True)
+    assert path.read_text(encoding="utf-8") == json.dumps(
+        {"a": 2, "b": 1}, indent=2
+    )
+
+
+def test_atomic_write_json_failure_leaves_no_file(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("x", encoding="utf-8")
+    assert not atomic_write_json(blocker / "entry.json", [1])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["file"]
+
+
+def test_read_json_missing_or_corrupt_is_none(tmp_path):
+    path = tmp_path / "entry.json"
+    assert read_json(path) is None
+    path.write_text("{not json", encoding="utf-8")
+    assert read_json(path) is None
+
+
+def test_read_json_checks_version(tmp_path):
+    path = tmp_path / "entry.json"
+    atomic_write_json(path, {"version": 1})
+    assert read_json(path, 1) == {"version": 1}
+    assert read_json(path, 2) is None
+    atomic_write_json(path, [1])
+    assert read_json(path, 1) is None
+    assert read_json(path) == [1]
+
+
+def test_run_state_start_get_clear():
+    state: RunState[list[int]] = RunState()
+    assert state.get() is None
+    value = state.start([1])
+    assert state.get() is value
+    assert state.start([2]) == [2]
+    state.clear()
+    assert state.get() is None
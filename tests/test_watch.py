@@ -0,0 +1,52 @@
+# Standard library
+from __future__ import annotations
+import os
+
+# Local
+from tiredize.watch import FileWatcher
+
+
+def _touch(path, ns):
+    os.utime(path, ns=(ns, ns))
+
+
+def test_first_poll_reports_every_file(tmp_path):
+    a = tmp_path / "a.md"
+    a.write_text("a")
+    missing = tmp_path / "missing.md"
+    watcher = FileWatcher([a, missing])
+    assert watcher.changed() == [a, missing]
+    assert watcher.changed() == []
+
+
+def test_modification_time_change_is_detected(tmp_path):
+    a = tmp_path / "a.md"
+    b = tmp_path / "b.md"
+    a.write_text("a")
+    b.write_text("b")
+    watcher = FileWatcher([a, b])
+    watcher.changed()
+    _touch(b, 10**9)
+    assert watcher.changed() == [b]
+
+
+def test_size_change_is_detected(tmp_path):
+    a = tmp_path / "a.md"
+    a.write_text("a")
+    _touch(a, 10**9)
+    watcher = FileWatcher([a])
+    watcher.changed()
+    a.write_text("longer")
+    _touch(a, 10**9)
+    assert watcher.changed() == [a]
+
+
+def test_created_and_deleted_files_are_detected(tmp_path):
+    a = tmp_path / "a.md"
+    watcher = FileWatcher([a])
+    watcher.changed()
+    a.write_text("a")
+    assert watcher.changed() == [a]
+    a.unlink()
+    assert watcher.changed() == [a]
+    assert watcher.changed() == []
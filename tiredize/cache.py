@@ -0,0 +1,159 @@
+# Standard library
+from __future__ import annotations
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+import hashlib
+import json
+import os
+
+# Local
+from tiredize.core_types import Position
+from tiredize.core_types import RuleResult
+from tiredize.utils import atomic_write_json
+from tiredize.utils import read_json
+
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = Path(".tiredize_cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Results of one document: (line, column, result) per finding.
+CachedResults = list[tuple[int, int, RuleResult]]
+
+
+def _code_version() -> str:
+    """
+    Return a string that changes whenever tiredize's code does: the
+    installed version plus the modification times of its modules, so
+    editable installs and checkouts invalidate too.
+    """
+    try:
+        version = metadata.version("tiredize")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    root = Path(__file__).parent
+    stamps = sorted(
+        (str(path.relative_to(root)), path.stat().st_mtime_ns)
+        for path in root.rglob("*.py")
+    )
+    return f"{version}:{json.dumps(stamps)}"
+
+
+def _decode(data: dict[str, Any] | None) -> CachedResults | None:
+    if data is None:
+        return None
+    results: CachedResults = []
+    try:
+        for line, col, offset, length, rule_id, message in data["results"]:
+            results.append((line, col, RuleResult(
+                message=message,
+                position=Position(offset=offset, length=length),
+                rule_id=rule_id,
+            )))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return results
+
+
+def _encode(results: CachedResults) -> dict[str, Any]:
+    return {
+        "results": [
+            [
+                line,
+                col,
+                res.position.offset,
+                res.position.length,
+                res.rule_id,
+                res.message,
+            ]
+            for line, col, res in results
+        ],
+        "version": CACHE_VERSION,
+    }
+
+
+class ResultCache:
+    """
+    On-disk cache of each document's results, keyed by content.
+
+    An entry's key is a digest of the file's bytes, the fingerprint of
+    the validation plan and the tiredize code version, so any change
+    to the document, the configuration or tiredize itself misses.
+    Entries are JSON files written to a temporary file and moved into
+    place with os.replace, so concurrent writers from parallel workers
+    never leave a partial entry and readers never see one. A read
+    refreshes the entry's modification time, which prune() uses to
+    evict the least recently used entries first.
+    """
+
+    # Dunder methods
+    def __init__(
+        self,
+        directory: Path,
+        fingerprint: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._salt = hashlib.sha256(
+            f"{CACHE_VERSION}:{_code_version()}:{fingerprint}".encode("utf-8")
+        ).digest()
+
+    # Public methods
+    def get(self, key: str) -> CachedResults | None:
+        """
+        Return the results stored under key, or None on a miss or an
+        unreadable entry.
+        """
+        path = self._entry_path(key)
+        results = _decode(read_json(path, CACHE_VERSION))
+        if results is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return results
+
+    def key(self, content: bytes) -> str:
+        """
+        Return the cache key of a document with the given bytes.
+        """
+        return hashlib.sha256(self._salt + content).hexdigest()
+
+    def prune(self) -> int:
+        """
+        Delete the least recently used entries until the cache fits in
+        max_bytes. Returns the number of entries removed.
+        """
+        entries: list[tuple[int, int, Path]] = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def put(self, key: str, results: CachedResults) -> None:
+        """
+        Store results under key. Failures are ignored, since the cache
+        is only an optimization.
+        """
+        atomic_write_json(self._entry_path(key), _encode(results))
+
+    # Private methods
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
@@ -1,24 +1,76 @@
 # Standard library
 from __future__ import annotations
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from multiprocessing.synchronize import Event as EventType
 from pathlib import Path
-from typing import Any
 import argparse
+import json
+import multiprocessing
+import os
 import sys
+import tempfile
+import time
 
 # Third-party
 import yaml
 
 # Local
+from tiredize.cache import DEFAULT_CACHE_DIR
+from tiredize.cache import ResultCache
 from tiredize.core_types import RuleNotFoundError
 from tiredize.core_types import RuleResult
-from tiredize.linter.engine import run_linter
+from tiredize.linter.host_pool import clear_host_pools
+from tiredize.linter.host_pool import start_host_pools
+from tiredize.linter.link_cache import LinkCache
+from tiredize.linter.local_targets import clear_local_targets
+from tiredize.linter.local_targets import start_local_targets
+from tiredize.linter.sessions import close_sessions
+from tiredize.linter.url_table import clear_url_table
+from tiredize.linter.url_table import start_url_table
+from tiredize.linter.utils import get_config_str
 from tiredize.markdown.types.document import Document
-from tiredize.markdown.types.schema import load_schema
-from tiredize.validators.frontmatter_schema import load_frontmatter_schema
-from tiredize.validators.frontmatter_schema import validate \
-    as validate_frontmatter
+from tiredize.markdown.types.section import PARSER_BACKENDS
+from tiredize.output import Emitter
+from tiredize.output import FORMATS
+from tiredize.output import make_emitter
+from tiredize.plan import ValidationPlan
+from tiredize.profiling import PhaseKey
+from tiredize.profiling import PhaseStats
+from tiredize.profiling import PhaseTimer
+from tiredize.profiling import Profiler
+from tiredize.profiling import optional_phase
 from tiredize.validators.markdown_schema import AmbiguityError
-from tiredize.validators.markdown_schema import validate
+from tiredize.watch import FileWatcher
+
+
+@dataclass(frozen=True)
+class _FileReport:
+    """
+    What checking one document produced, small enough to send back
+    from a worker process instead of the parsed Document.
+    """
+    error: str | None = None
+    fatal: bool = False
+    path: str = ""
+    results: list[tuple[int, int, RuleResult]] = field(
+        default_factory=list
+    )
+    timings: dict[PhaseKey, PhaseStats] | None = None
+
+
+# Formats whose output stays valid when more results are appended.
+_WATCH_FORMATS = ("text", "jsonl")
+
+# Set in each worker process by _init_worker().
+_worker_cache: ResultCache | None = None
+_worker_limit: int | None = None
+_worker_plan: ValidationPlan | None = None
+_worker_profile = False
+_worker_stop: EventType | None = None
 
 
 def _build_arg_parser() -> argparse.ArgumentParser:
@@ -43,6 +95,103 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         dest="frontmatter_schema_path",
         help="YAML configuration file defining frontmatter schema.",
     )
+    parser.add_argument(
+        "--parser-backend",
+        dest="parser_backend",
+        choices=PARSER_BACKENDS,
+        default="regex",
+        help="Markdown element extraction engine (default: regex).",
+    )
+    parser.add_argument(
+        "--rule-manifest",
+        dest="rule_manifest_path",
+        help="JSON file caching discovered linter rules between runs.",
+    )
+    parser.add_argument(
+        "--jobs",
+        dest="jobs",
+        type=_parse_jobs,
+        default=1,
+        metavar="N",
+        help="Number of worker processes, or 'auto' for one per CPU "
+        "(default: 1).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="Directory of the result cache "
+        f"(default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Check every document even if its results are cached.",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=FORMATS,
+        default="text",
+        help="Output format of the results on stdout (default: text).",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        dest="fail_fast",
+        action="store_true",
+        help="Stop at the first document with problems.",
+    )
+    parser.add_argument(
+        "--max-errors",
+        dest="max_errors",
+        type=_parse_count,
+        metavar="N",
+        help="Stop after reporting N problems in total.",
+    )
+    parser.add_argument(
+        "--max-errors-per-file",
+        dest="max_errors_per_file",
+        type=_parse_count,
+        metavar="N",
+        help="Report at most N problems per document.",
+    )
+    parser.add_argument(
+        "--profile-rules",
+        dest="profile_rules",
+        action="store_true",
+        help="Print the time spent in each phase and rule to stderr.",
+    )
+    parser.add_argument(
+        "--profile-json",
+        dest="profile_json_path",
+        metavar="PATH",
+        help="Write per-file and total phase and rule timings as JSON.",
+    )
+    parser.add_argument(
+        "--purge-link-cache",
+        dest="purge_link_cache",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Delete the link cache at PATH, or the one configured for "
+        "the links rule in --rules, and exit.",
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        help="Keep running and re-check documents as they or the "
+        "configuration files change.",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="How often --watch polls for changes (default: 0.5).",
+    )
     parser.add_argument(
         "paths",
         nargs="*",
@@ -52,50 +201,419 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _load_yaml(path: Path) -> dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    if data is None:
-        return {}
-    if not isinstance(data, dict):
-        raise ValueError(
-            f"Expected YAML mapping in {path}, "
-            f"got {type(data).__name__}."
+def _check_document(
+    doc: Document,
+    plan: ValidationPlan,
+    path_str: str,
+    timer: PhaseTimer | None = None,
+    limit: int | None = None,
+) -> _FileReport:
+    """
+    Lint and validate a loaded document and return its report.
+    """
+    try:
+        all_results = plan.validate(doc, timer, limit)
+    except (ValueError, AmbiguityError) as exc:
+        return _FileReport(
+            error=f"error: {exc}",
+            fatal=True,
+            path=path_str
+        )
+
+    with optional_phase(timer, "phase", "report"):
+        line_cols = doc.line_cols(
+            res.position.offset for res in all_results
         )
-    return data
+        results = [
+            (line, col, res)
+            for res, (line, col) in zip(all_results, line_cols)
+        ]
+    return _FileReport(path=str(doc.path), results=results)
 
 
-def _run_rules(
-    doc: Document,
-    rules_config_path: Path,
-) -> list[RuleResult]:
-    raw_config = _load_yaml(rules_config_path)
+def _check_path(
+    path_str: str,
+    plan: ValidationPlan,
+    cache: ResultCache | None = None,
+    profile: bool = False,
+    limit: int | None = None,
+) -> _FileReport:
+    """
+    Load, lint and validate one document and return its report.
 
-    results: list[RuleResult] = run_linter(
-        document=doc,
-        rule_configs=raw_config
+    With a cache, a document whose bytes were checked before with the
+    same plan is answered from the cache without being parsed. Errors
+    raised while applying a schema to the document are reported as
+    fatal, stopping the run like the sequential loop always has. With
+    profile, the report carries the timings of each phase. With a
+    limit, checks stop once the document has that many results.
+    """
+    if not profile:
+        return _check_path_timed(path_str, plan, cache, None, limit)
+    timer = PhaseTimer()
+    report = _check_path_timed(path_str, plan, cache, timer, limit)
+    return replace(report, timings=timer.stats)
+
+
+def _check_path_in_worker(path_str: str) -> _FileReport:
+    assert _worker_plan is not None
+    if _worker_stop is not None and _worker_stop.is_set():
+        # The run has stopped; nobody will read this report.
+        return _FileReport(path=path_str)
+    return _check_path(
+        path_str,
+        _worker_plan,
+        _worker_cache,
+        _worker_profile,
+        _worker_limit
     )
-    return results
 
 
-def _run_markdown_schema(doc: Document, schema_path: Path) -> list[RuleResult]:
-    schema = load_schema(schema_path.read_text(encoding="utf-8"))
-    return validate(doc, schema)
+def _check_path_timed(
+    path_str: str,
+    plan: ValidationPlan,
+    cache: ResultCache | None,
+    timer: PhaseTimer | None,
+    limit: int | None,
+) -> _FileReport:
+    path = Path(path_str)
+    key: str | None = None
+    if cache is not None and path.is_file():
+        with optional_phase(timer, "phase", "cache"):
+            try:
+                key = cache.key(path.read_bytes())
+            except OSError:
+                key = None
+            cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            return _FileReport(path=str(path), results=cached[:limit])
+
+    try:
+        doc = plan.load(path, timer)
+    except FileNotFoundError as exc:
+        return _FileReport(error=f"error: {exc}", fatal=False, path=path_str)
+
+    report = _check_document(doc, plan, path_str, timer, limit)
+    # Results cut short by the limit may be incomplete, so they are not
+    # cached.
+    complete = limit is None or len(report.results) < limit
+    if (cache is not None and key is not None and report.error is None
+            and complete):
+        with optional_phase(timer, "phase", "cache"):
+            cache.put(key, report.results)
+    return report
+
+
+def _init_worker(
+    plan: ValidationPlan,
+    cache: ResultCache | None,
+    profile: bool,
+    limit: int | None,
+    stop: EventType,
+    url_directory: Path,
+) -> None:
+    global _worker_cache
+    global _worker_limit
+    global _worker_plan
+    global _worker_profile
+    global _worker_stop
+    _worker_cache = cache
+    _worker_limit = limit
+    _worker_plan = plan
+    _worker_profile = profile
+    _worker_stop = stop
+    start_host_pools()
+    start_local_targets()
+    # Link checks in flight give up once the run stops.
+    start_url_table(url_directory, stop.is_set)
+
+
+def _iter_reports(
+    paths: list[str],
+    plan: ValidationPlan,
+    jobs: int,
+    cache: ResultCache | None = None,
+    profile: bool = False,
+    limit: int | None = None,
+) -> Iterator[_FileReport]:
+    """
+    Yield one report per path, in the order the paths were given.
+
+    With more than one job, documents are checked in a process pool
+    whose workers receive the plan once at startup. Only the reports
+    travel back, and they are yielded in input order, so the output
+    matches a sequential run. Closing the iterator early cancels the
+    documents not yet started, and workers skip the rest of the
+    chunk they are working on. Workers share the outcomes of link
+    checks through a temporary directory, so each URL is fetched by
+    one of them.
+    """
+    if jobs == 1 or len(paths) < 2:
+        for path_str in paths:
+            yield _check_path(path_str, plan, cache, profile, limit)
+        return
+
+    workers = min(jobs, len(paths))
+    context = multiprocessing.get_context()
+    stop = context.Event()
+    url_directory = tempfile.TemporaryDirectory(prefix="tiredize-urls-")
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(
+            plan,
+            cache,
+            profile,
+            limit,
+            stop,
+            Path(url_directory.name),
+        ),
+    )
+    try:
+        yield from executor.map(
+            _check_path_in_worker,
+            paths,
+            chunksize=max(1, min(32, len(paths) // (workers * 4))),
+        )
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        url_directory.cleanup()
+
+
+def _load_plan(args: argparse.Namespace) -> ValidationPlan:
+    """
+    Build the validation plan from the files named on the command line.
+    """
+    return ValidationPlan.from_files(
+        rules_path=_optional_path(args.rules_path),
+        markdown_schema_path=_optional_path(args.markdown_schema_path),
+        frontmatter_schema_path=_optional_path(
+            args.frontmatter_schema_path
+        ),
+        parser_backend=args.parser_backend,
+        rule_manifest=_optional_path(args.rule_manifest_path),
+    )
+
+
+def _optional_path(value: str | None) -> Path | None:
+    if not value:
+        return None
+    return Path(value)
+
+
+def _parse_count(value: str) -> int:
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive integer, got {value!r}"
+        )
+    return count
+
+
+def _parse_jobs(value: str) -> int:
+    if value == "auto":
+        if hasattr(os, "sched_getaffinity"):
+            return max(1, len(os.sched_getaffinity(0)))
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive integer or 'auto', got {value!r}"
+        )
+    return jobs
+
 
+def _print_report(report: _FileReport, emitter: Emitter) -> None:
+    if report.error is not None:
+        print(report.error, file=sys.stderr)
+        return
+    emitter.emit(report.path, report.results)
 
-def _run_frontmatter_schema(
-        doc: Document,
-        schema_path: Path) -> list[RuleResult]:
-    schema = load_frontmatter_schema(
-        schema_path.read_text(encoding="utf-8")
+
+def _purge_link_cache(args: argparse.Namespace) -> int:
+    """
+    Delete every entry of the link cache and report how many there
+    were.
+    """
+    directory = args.purge_link_cache
+    if not directory and args.rules_path:
+        plan = _try_load_plan(args)
+        if plan is None:
+            return 1
+        for rule, config in plan.rules:
+            if rule.id == "links":
+                directory = get_config_str(config, "cache")
+    if not directory:
+        print(
+            "error: no link cache to purge; give its path or a --rules "
+            "file whose links rule sets cache",
+            file=sys.stderr,
+        )
+        return 1
+    try:
+        removed = LinkCache(Path(directory)).purge()
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(f"-- removed {removed} link cache entries", file=sys.stderr)
+    return 0
+
+
+def _try_load_plan(args: argparse.Namespace) -> ValidationPlan | None:
+    """
+    Build the validation plan, or print why it cannot be built and
+    return None.
+    """
+    try:
+        return _load_plan(args)
+    except (
+        RuleNotFoundError,
+        FileNotFoundError,
+        ValueError,
+        yaml.YAMLError,
+    ) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return None
+
+
+def _watch(
+    args: argparse.Namespace,
+    plan: ValidationPlan,
+    emitter: Emitter,
+) -> int:
+    """
+    Check every document, then re-check as files change until
+    interrupted.
+
+    Parsed documents and the plan stay in memory between checks. A
+    changed document is reloaded and re-checked on its own; a changed
+    configuration file rebuilds the plan and re-checks every document,
+    reloading them only if the new plan parses documents differently.
+    Errors never end the loop. Returns 1 if any document had problems
+    at the last check.
+    """
+    paths = list(dict.fromkeys(Path(path_str) for path_str in args.paths))
+    config_watcher = FileWatcher(
+        Path(path_str)
+        for path_str in (
+            args.rules_path,
+            args.markdown_schema_path,
+            args.frontmatter_schema_path,
+        )
+        if path_str
     )
-    return validate_frontmatter(doc, schema)
+    config_watcher.changed()
+    document_watcher = FileWatcher(paths)
+
+    current: ValidationPlan | None = plan
+    documents: dict[Path, Document] = {}
+    failing: set[Path] = set()
+    pending: set[Path] = set()
+    stale: set[Path] = set()
+    try:
+        while True:
+            changed = document_watcher.changed()
+            pending.update(changed)
+            stale.update(changed)
+            if config_watcher.changed():
+                current = _try_load_plan(args)
+                pending.update(paths)
+
+            if current is not None and pending:
+                for path in paths:
+                    if path not in pending:
+                        continue
+                    report = _watch_check(
+                        path, current, documents, path in stale
+                    )
+                    _print_report(report, emitter)
+                    if report.error is not None or report.results:
+                        failing.add(path)
+                    else:
+                        failing.discard(path)
+                print(
+                    f"-- checked {len(pending)} file(s), "
+                    f"{len(failing)} with problems; watching for changes",
+                    file=sys.stderr,
+                )
+                emitter.stream.flush()
+                pending.clear()
+                stale.clear()
+            time.sleep(args.watch_interval)
+    except KeyboardInterrupt:
+        pass
+    return 1 if failing else 0
+
+
+def _watch_check(
+    path: Path,
+    plan: ValidationPlan,
+    documents: dict[Path, Document],
+    reload: bool,
+) -> _FileReport:
+    """
+    Check one watched document, reusing its parsed form unless it has
+    to be reloaded or was parsed for a different plan.
+    """
+    document = documents.get(path)
+    if (
+        reload or document is None
+        or document.parser_backend != plan.parser_backend
+        or document.requires != plan.requires
+    ):
+        documents.pop(path, None)
+        try:
+            documents[path] = plan.load(path)
+        except (FileNotFoundError, ValueError) as exc:
+            return _FileReport(error=f"error: {exc}", path=str(path))
+    return _check_document(documents[path], plan, str(path))
+
+
+def _watch_conflicts(args: argparse.Namespace) -> list[str]:
+    """
+    Return the flags given with --watch that watch mode cannot honor:
+    it checks documents one at a time in this process, never stops
+    early, keeps parsed documents instead of a result cache and does
+    not profile.
+    """
+    given = {
+        "--jobs": args.jobs != 1,
+        "--fail-fast": args.fail_fast,
+        "--max-errors": args.max_errors is not None,
+        "--max-errors-per-file": args.max_errors_per_file is not None,
+        "--no-cache": args.no_cache,
+        "--cache-dir": args.cache_dir != str(DEFAULT_CACHE_DIR),
+        "--profile-rules": args.profile_rules,
+        "--profile-json": args.profile_json_path is not None,
+    }
+    return [flag for flag, present in given.items() if present]
+
+
+def _write_profile(profiler: Profiler, args: argparse.Namespace) -> None:
+    if args.profile_rules:
+        print(profiler.format_table(), file=sys.stderr)
+    if args.profile_json_path:
+        path = Path(args.profile_json_path)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(profiler.to_json(), f, indent=2)
+            f.write("\n")
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = _build_arg_parser()
     args = parser.parse_args(argv)
 
+    if args.purge_link_cache is not None:
+        return _purge_link_cache(args)
+
     if not args.paths or not (
         args.rules_path or args.markdown_schema_path or
             args.frontmatter_schema_path):
@@ -107,84 +625,97 @@ def main(argv: list[str] | None = None) -> int:
         )
         return 2
 
-    exit_code = 0
+    plan = _try_load_plan(args)
+    if plan is None:
+        return 1
 
-    for path_str in args.paths:
-        doc = Document()
-        try:
-            doc.load(path=Path(path_str))
-        except FileNotFoundError as exc:
+    if args.watch:
+        if args.output_format not in _WATCH_FORMATS:
             print(
-                f"error: {exc}",
+                f"error: --watch cannot write --format "
+                f"{args.output_format}; use text or jsonl",
                 file=sys.stderr,
             )
-            exit_code = 1
-            continue
+            return 2
+        conflicts = _watch_conflicts(args)
+        if conflicts:
+            print(
+                f"error: --watch cannot be combined with "
+                f"{', '.join(conflicts)}",
+                file=sys.stderr,
+            )
+            return 2
+        return _watch(args, plan, make_emitter(args.output_format, sys.stdout))
 
-        all_results: list[RuleResult] = []
+    cache: ResultCache | None = None
+    if not args.no_cache and plan.cacheable:
+        cache = ResultCache(Path(args.cache_dir), plan.fingerprint())
 
-        if args.rules_path:
-            try:
-                all_results.extend(
-                    _run_rules(
-                        doc, Path(args.rules_path)
-                    )
-                )
-            except (
-                RuleNotFoundError,
-                FileNotFoundError,
-                ValueError,
-                yaml.YAMLError,
-            ) as exc:
-                print(
-                    f"error: {exc}",
-                    file=sys.stderr,
-                )
-                return 1
+    profiler: Profiler | None = None
+    if args.profile_rules or args.profile_json_path:
+        profiler = Profiler()
 
-        if args.markdown_schema_path:
-            try:
-                all_results.extend(
-                    _run_markdown_schema(
-                        doc, Path(args.markdown_schema_path)
-                    )
-                )
-            except (
-                ValueError,
-                AmbiguityError,
-                FileNotFoundError,
-                yaml.YAMLError,
-            ) as exc:
-                print(
-                    f"error: {exc}",
-                    file=sys.stderr,
-                )
-                return 1
+    # No document needs more results than the whole run may report.
+    limits = [
+        limit for limit in (args.max_errors, args.max_errors_per_file)
+        if limit is not None
+    ]
+    budget = args.max_errors
 
-        if args.frontmatter_schema_path:
-            try:
-                all_results.extend(
-                    _run_frontmatter_schema(
-                        doc, Path(args.frontmatter_schema_path)
-                    )
-                )
-            except (
-                ValueError,
-                FileNotFoundError,
-                yaml.YAMLError,
-            ) as exc:
+    emitter = make_emitter(args.output_format, sys.stdout)
+    # Each URL and relative target is checked once per run, however
+    # many links point to it, and the link checks of all documents
+    # share one pool and its limits.
+    start_host_pools()
+    start_local_targets()
+    start_url_table()
+    exit_code = 0
+    reports = _iter_reports(
+        args.paths,
+        plan,
+        args.jobs,
+        cache,
+        profiler is not None,
+        min(limits, default=None)
+    )
+    try:
+        for report in reports:
+            if profiler is not None and report.timings is not None:
+                profiler.add(report.path, report.timings)
+            if budget is not None:
+                report = replace(report, results=report.results[:budget])
+            _print_report(report, emitter)
+            if report.fatal:
+                return 1
+            problems = len(report.results) + (report.error is not None)
+            if not problems:
+                continue
+            exit_code = 1
+            if args.fail_fast:
                 print(
-                    f"error: {exc}",
+                    "-- stopped at the first document with problems",
                     file=sys.stderr,
                 )
-                return 1
-
-        for res in all_results:
-            pos = res.position
-            line, col = doc.line_col(pos.offset)
-            print(f"{doc.path}:{line}:{col}: [{res.rule_id}] {res.message}")
-        if all_results:
-            exit_code = 1
+                break
+            if budget is not None:
+                budget -= problems
+                if budget <= 0:
+                    print(
+                        f"-- stopped after {args.max_errors} problem(s)",
+                        file=sys.stderr,
+                    )
+                    break
+    finally:
+        reports.close()
+        emitter.close()
+        clear_host_pools()
+        clear_local_targets()
+        clear_url_table()
+        close_sessions()
+        if cache is not None:
+            cache.prune()
+        if profiler is not None:
+            _write_profile(profiler, args)
     return exit_code
 
 
@@ -7,7 +7,7 @@ from typing import Any
 from tiredize.core_types import RuleNotFoundError
 from tiredize.core_types import RuleResult
 from tiredize.linter.rules import Rule
-from tiredize.linter.rules import discover_rules
+from tiredize.linter.rules import get_rule_registry
 from tiredize.markdown.types.document import Document
 
 
@@ -36,22 +36,24 @@ def _select_rules(
     return enabled_set
 
 
-def run_linter(
-    document: Document,
-    rule_configs: dict[str, dict[str, Any]] | None = None
-) -> list[RuleResult]:
+def prepare_rules(
+    rule_configs: dict[str, dict[str, Any]] | None = None,
+    rules: dict[str, Rule] | None = None
+) -> list[tuple[Rule, dict[str, Any]]]:
     """
-    Run lint rules against a document and return normalized results.
+    Select and check the enabled rules once, for reuse across documents.
 
-    - document: the parsed Document to lint.
     - rule_configs: mapping of rule_id to configuration dictionary
+    - rules: prebuilt rule registry; defaults to the built-in rules,
+      discovered once per process.
 
-    Note: Rules without an entry are disabled.
+    Raises RuleNotFoundError for an unknown rule id and ValueError for
+    a configuration that is not a mapping.
     """
-    all_rules = discover_rules()
+    all_rules = rules if rules is not None else get_rule_registry()
     active_rules = _select_rules(all_rules, rule_configs)
 
-    all_results: list[RuleResult] = []
+    prepared: list[tuple[Rule, dict[str, Any]]] = []
     for rule_id in active_rules.keys():
         rule_config = active_rules[rule_id]["config"]
         if not isinstance(rule_config, dict):
@@ -64,10 +66,58 @@ def run_linter(
             raise ValueError(
                 f"Invalid rule object for {rule_id}: {rule}"
             )
+        prepared.append((rule, rule_config))
+
+    return prepared
+
+
+def run_linter(
+    document: Document,
+    rule_configs: dict[str, dict[str, Any]] | None = None,
+    rules: dict[str, Rule] | None = None
+) -> list[RuleResult]:
+    """
+    Run lint rules against a document and return normalized results.
+
+    - document: the parsed Document to lint.
+    - rule_configs: mapping of rule_id to configuration dictionary
+    - rules: prebuilt rule registry; defaults to the built-in rules,
+      discovered once per process.
+
+    Note: Rules without an entry are disabled.
+    """
+    return run_rules(document, prepare_rules(rule_configs, rules))
 
-        raw_results = rule.func(document, rule_config)
+
+def run_rules(
+    document: Document,
+    prepared: list[tuple[Rule, dict[str, Any]]],
+    limit: int | None = None,
+) -> list[RuleResult]:
+    """
+    Run rules returned by prepare_rules() against a document and return
+    normalized results.
+
+    With a limit, at most that many results are returned: rules stop
+    running once it is reached, and a rule with an iter_func stops as
+    soon as it has yielded enough.
+    """
+    all_results: list[RuleResult] = []
+    for rule, rule_config in prepared:
+        if limit is not None and len(all_results) >= limit:
+            break
+        if limit is not None and rule.iter_func is not None:
+            raw_results = rule.iter_func(document, rule_config)
+        else:
+            raw_results = rule.func(document, rule_config)
         for res in raw_results:
-            normalized = replace(res, rule_id=rule_id)
+            normalized = replace(res, rule_id=rule.id)
             all_results.append(normalized)
+            if limit is not None and len(all_results) >= limit:
+                # Closing a generator stops the rule's remaining work.
+                close = getattr(raw_results, "close", None)
+                if close is not None:
+                    close()
+                break
 
     return all_results
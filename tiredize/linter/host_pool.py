@@ -0,0 +1,164 @@
+# Standard library
+from __future__ import annotations
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from queue import SimpleQueue
+from typing import Any
+from typing import TypeVar
+import threading
+
+# Local
+from tiredize.utils import RunState
+
+
+T = TypeVar("T")
+
+# A queued call and the future that receives its result.
+_Task = tuple[Future[Any], Callable[[], Any]]
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST = 2
+
+# Pools of the current run, keyed by (concurrency, per_host).
+_RUN: RunState[dict[tuple[int, int], HostPool]] = RunState()
+_RUN_LOCK = threading.Lock()
+
+
+def clear_host_pools() -> None:
+    """
+    End the run started by start_host_pools() and close its pools;
+    later link checks use a pool of their own.
+    """
+    with _RUN_LOCK:
+        pools = _RUN.get() or {}
+        _RUN.clear()
+    for pool in pools.values():
+        pool.close()
+
+
+def get_host_pool(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+) -> HostPool | None:
+    """
+    Return the pool of the current run for these settings, created on
+    first use, or None outside a run.
+    """
+    key = (max(1, concurrency), max(1, per_host))
+    with _RUN_LOCK:
+        pools = _RUN.get()
+        if pools is None:
+            return None
+        if key not in pools:
+            pools[key] = HostPool(*key)
+        return pools[key]
+
+
+def start_host_pools() -> None:
+    """
+    Start a run whose link checks share one pool, so its limits hold
+    for the whole run rather than for each document. Closes the pools
+    of any previous run of this process.
+    """
+    clear_host_pools()
+    _RUN.start({})
+
+
+class HostPool:
+    """
+    Thread pool that runs at most concurrency tasks at once and at most
+    per_host of them for any one host.
+
+    Tasks for a host wait in that host's queue and are run by at most
+    per_host drain tasks on the shared pool, so a host with many URLs
+    never occupies more than per_host threads while other hosts wait.
+    Closing the pool cancels every task that has not started and stops
+    the workers. The workers are daemon threads, so a request still in
+    flight finishes in the background without delaying the exit of
+    the interpreter, which joins the threads of a ThreadPoolExecutor.
+    """
+
+    # Dunder methods
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host: int = DEFAULT_PER_HOST,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self._closed = False
+        self._drains: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque[_Task]] = {}
+        # Hosts with a drain task to run; None tells a worker to stop.
+        self._ready: SimpleQueue[str | None] = SimpleQueue()
+        self._workers = 0
+
+    def __enter__(self) -> HostPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # Public methods
+    def close(self) -> None:
+        """
+        Cancel the tasks that have not started and stop the workers
+        without waiting for running tasks.
+        """
+        with self._lock:
+            self._closed = True
+            for queue in self._queues.values():
+                for future, _ in queue:
+                    future.cancel()
+                queue.clear()
+            workers = self._workers
+        for _ in range(workers):
+            self._ready.put(None)
+
+    def submit(self, host: str, func: Callable[[], T]) -> Future[T]:
+        """
+        Queue func to run once host has a free slot and return a future
+        of its result.
+        """
+        future: Future[T] = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("HostPool is closed")
+            self._queues.setdefault(host, deque()).append((future, func))
+            if self._drains.get(host, 0) >= self.per_host:
+                return future
+            self._drains[host] = self._drains.get(host, 0) + 1
+            if self._workers < self.concurrency:
+                self._workers += 1
+                threading.Thread(
+                    target=self._work,
+                    name=f"tiredize-links-{self._workers}",
+                    daemon=True,
+                ).start()
+        self._ready.put(host)
+        return future
+
+    # Private methods
+    def _drain(self, host: str) -> None:
+        while True:
+            with self._lock:
+                queue = self._queues[host]
+                if self._closed or not queue:
+                    self._drains[host] -= 1
+                    return
+                future, func = queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func())
+            except Exception as exc:
+                future.set_exception(exc)
+
+    def _work(self) -> None:
+        while not self._closed:
+            host = self._ready.get()
+            if host is None:
+                return
+            self._drain(host)
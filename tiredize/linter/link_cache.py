@@ -0,0 +1,125 @@
+# Standard library
+from __future__ import annotations
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+import hashlib
+import re
+
+# Local
+from tiredize.linter.url_table import normalize_url
+from tiredize.linter.utils import LinkRecord
+from tiredize.utils import atomic_write_json
+from tiredize.utils import read_json
+
+
+LINK_CACHE_VERSION = 1
+DEFAULT_SUCCESS_TTL = 24 * 60 * 60
+DEFAULT_FAILURE_TTL = 60 * 60
+
+# Names of what put() writes: two-character shard directories holding
+# <sha256>.json entries and, while one is written, its temporary file.
+_RE_SHARD = re.compile(r"[0-9a-f]{2}")
+_RE_ENTRY = re.compile(r"(\.)?([0-9a-f]{64})\.json(?(1)\..+)")
+
+
+def _decode(data: dict[str, Any] | None) -> LinkRecord | None:
+    if data is None:
+        return None
+    try:
+        return LinkRecord(**data["record"])
+    except (KeyError, TypeError):
+        return None
+
+
+class LinkCache:
+    """
+    On-disk record of remote link checks, shared between runs.
+
+    Entries are keyed by normalize_url() and hold the status, final
+    URL, ETag, Last-Modified and time of the last check. A record is
+    fresh for success_ttl seconds if the link was valid, else for
+    failure_ttl seconds. Entries are written with atomic_write_json(),
+    so concurrent workers never see a partial one.
+    """
+
+    # Dunder methods
+    def __init__(
+        self,
+        directory: Path,
+        success_ttl: float = DEFAULT_SUCCESS_TTL,
+        failure_ttl: float = DEFAULT_FAILURE_TTL,
+    ) -> None:
+        self.directory = directory
+        self.failure_ttl = failure_ttl
+        self.success_ttl = success_ttl
+
+    # Public methods
+    def get(self, url: str) -> LinkRecord | None:
+        """
+        Return the stored record of url, fresh or not, or None.
+        """
+        return _decode(read_json(self._entry_path(url), LINK_CACHE_VERSION))
+
+    def is_fresh(self, record: LinkRecord, now: float) -> bool:
+        """
+        True if record is recent enough to be used without a request.
+        """
+        ttl = self.success_ttl if record.valid else self.failure_ttl
+        return now - record.checked_at < ttl
+
+    def purge(self) -> int:
+        """
+        Delete every entry. Returns the number of entries removed.
+
+        Only the files put() writes are deleted, and shard directories
+        only once empty. A directory holding anything else is not a
+        link cache, so nothing is deleted and ValueError is raised.
+        """
+        if not self.directory.exists():
+            return 0
+        if not self.directory.is_dir():
+            raise ValueError(f"{self.directory} is not a link cache")
+        shards = list(self.directory.iterdir())
+        files: list[Path] = []
+        for shard in shards:
+            if not shard.is_dir() or not _RE_SHARD.fullmatch(shard.name):
+                raise ValueError(
+                    f"{self.directory} is not a link cache: it contains "
+                    f"{shard.name}"
+                )
+            for path in shard.iterdir():
+                match = _RE_ENTRY.fullmatch(path.name)
+                if match is None or not match[2].startswith(shard.name):
+                    raise ValueError(
+                        f"{self.directory} is not a link cache: it "
+                        f"contains {shard.name}/{path.name}"
+                    )
+                files.append(path)
+        removed = 0
+        for path in files:
+            path.unlink(missing_ok=True)
+            if not path.name.startswith("."):
+                removed += 1
+        for shard in shards:
+            try:
+                shard.rmdir()
+            except OSError:
+                # A concurrent run wrote a new entry; keep it.
+                pass
+        return removed
+
+    def put(self, url: str, record: LinkRecord) -> None:
+        """
+        Store record for url. Failures are ignored, since the cache is
+        only an optimization.
+        """
+        atomic_write_json(
+            self._entry_path(url),
+            {"record": asdict(record), "version": LINK_CACHE_VERSION}
+        )
+
+    # Private methods
+    def _entry_path(self, url: str) -> Path:
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return self.directory / key[:2] / f"{key}.json"
@@ -0,0 +1,100 @@
+# Standard library
+from __future__ import annotations
+from pathlib import Path
+import os
+import threading
+
+# Local
+from tiredize.markdown.types.document import Document
+from tiredize.utils import RunState
+
+
+# Suffixes of files whose anchors can be checked.
+MARKDOWN_SUFFIXES = frozenset({".markdown", ".md"})
+
+_RUN: RunState[LocalTargets] = RunState()
+
+
+def clear_local_targets() -> None:
+    """
+    End the run started by start_local_targets(); later lookups are no
+    longer remembered.
+    """
+    _RUN.clear()
+
+
+def get_local_targets() -> LocalTargets | None:
+    """
+    Return the lookups of the current run, or None outside a run.
+    """
+    return _RUN.get()
+
+
+def start_local_targets() -> LocalTargets:
+    """
+    Start a run whose relative link lookups are remembered, replacing
+    any previous run's, and return them.
+    """
+    return _RUN.start(LocalTargets())
+
+
+class LocalTargets:
+    """
+    The files relative links point to, looked up once per run.
+
+    Whether a path exists is asked of the filesystem once, however
+    many links point to it, and the anchors of a markdown target are
+    found by parsing it once, so `./other.md#section` links cost a set
+    lookup after the first. Paths are keyed by their absolute form, so
+    links from documents in different directories share lookups.
+    """
+
+    # Dunder methods
+    def __init__(self) -> None:
+        self._exists: dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self._slugs: dict[str, frozenset[str] | None] = {}
+
+    # Public methods
+    def exists(self, path: Path) -> bool:
+        """
+        True if path exists.
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            found = self._exists.get(key)
+            if found is None:
+                found = self._exists[key] = os.path.exists(key)
+        return found
+
+    def slugs(
+        self,
+        path: Path,
+        parser_backend: str = "regex",
+    ) -> frozenset[str] | None:
+        """
+        Return the header slugs of the markdown file at path, or None
+        if it is not a markdown file or cannot be read.
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            if key not in self._slugs:
+                self._slugs[key] = self._read_slugs(
+                    Path(key), parser_backend
+                )
+            return self._slugs[key]
+
+    # Private methods
+    @staticmethod
+    def _read_slugs(
+        path: Path,
+        parser_backend: str,
+    ) -> frozenset[str] | None:
+        if path.suffix.lower() not in MARKDOWN_SUFFIXES:
+            return None
+        document = Document(parser_backend=parser_backend)
+        try:
+            document.load(path, requires={"sections"})
+        except (OSError, UnicodeDecodeError):
+            return None
+        return frozenset(document.slugs)
@@ -1,28 +1,77 @@
 # Standard library
 from __future__ import annotations
+from collections.abc import Iterable
 from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
 from typing import Any
 from typing import Callable
 import importlib
 import inspect
+import os
 import pkgutil
 
 # Local
 from tiredize.core_types import RuleResult
 from tiredize.markdown.types.document import Document
+from tiredize.utils import atomic_write_json
+from tiredize.utils import read_json
 
 
 RuleFunc = Callable[[Document, dict[str, Any]], list[RuleResult]]
+RuleIterFunc = Callable[[Document, dict[str, Any]], Iterable[RuleResult]]
+
+MANIFEST_VERSION = 1
+
+# Rules discovered in this process, keyed by package name.
+_REGISTRIES: dict[str, dict[str, Rule]] = {}
 
 
 @dataclass(frozen=True)
 class Rule:
     """
     Class containing a single lint rule.
+
+    requires is the rule module's REQUIRES: the names from
+    Document's REQUIREMENTS of the data its validate() reads, so a
+    document is parsed only that far. None means the rule gets a fully
+    parsed document. The schema validators declare REQUIRES the same
+    way.
     """
     id: str
     func: RuleFunc
     description: str | None = None
+    cacheable: bool = True
+    requires: frozenset[str] | None = None
+    iter_func: RuleIterFunc | None = None
+
+
+def _is_cacheable(module: ModuleType) -> bool:
+    """
+    A rule is cacheable unless its module sets CACHEABLE = False,
+    which rules whose results depend on more than the document's
+    content (other files, remote servers) must do.
+    """
+    return getattr(module, "CACHEABLE", True) is not False
+
+
+def _is_rule_function(name: str, obj: Any) -> bool:
+    """
+    A rule is any callable named 'validate'.
+    """
+    return callable(obj) and name == "validate"
+
+
+def _iter_function(module: ModuleType) -> RuleIterFunc | None:
+    """
+    Return a rule module's optional iter_validate, which yields the
+    same results as validate one at a time so a caller that needs only
+    some of them can stop early, e.g. before checking further links.
+    """
+    func = getattr(module, "iter_validate", None)
+    if not callable(func):
+        return None
+    return func
 
 
 def _iter_rule_modules(package_name: str) -> list[str]:
@@ -53,11 +102,72 @@ def _iter_rule_modules(package_name: str) -> list[str]:
     return module_names
 
 
-def _is_rule_function(name: str, obj: Any) -> bool:
+def _package_mtimes(package_name: str) -> dict[str, int]:
     """
-    A rule is any callable named 'validate'.
+    Return the modification time of every module file in a package,
+    keyed by file name. Any change to a rule module changes the result.
     """
-    return callable(obj) and name == "validate"
+    package = importlib.import_module(package_name)
+    mtimes: dict[str, int] = {}
+    for directory in getattr(package, "__path__", []):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".py"):
+                    mtimes[entry.name] = entry.stat().st_mtime_ns
+    return mtimes
+
+
+def _read_manifest(
+    manifest: Path,
+    package_name: str,
+    mtimes: dict[str, int],
+) -> dict[str, Rule] | None:
+    """
+    Build rules from a manifest entry, or return None if the manifest
+    is missing, unreadable, malformed or stale for this package. An
+    entry whose fields are missing or whose modules cannot be imported
+    counts as stale, so a hand-edited manifest never stops a run.
+    """
+    data = read_json(manifest, MANIFEST_VERSION)
+    if data is None:
+        return None
+    packages = data.get("packages")
+    if not isinstance(packages, dict):
+        return None
+    entry = packages.get(package_name)
+    if not isinstance(entry, dict) or entry.get("mtimes") != mtimes:
+        return None
+
+    rules: dict[str, Rule] = {}
+    try:
+        for item in entry.get("rules", []):
+            module = importlib.import_module(item["module"])
+            func = getattr(module, "validate", None)
+            if not _is_rule_function("validate", func):
+                return None
+            rules[item["id"]] = Rule(
+                id=item["id"],
+                func=func,
+                description=item["description"],
+                cacheable=_is_cacheable(module),
+                requires=_requirements(module),
+                iter_func=_iter_function(module),
+            )
+    except (AttributeError, ImportError, KeyError, TypeError, ValueError):
+        return None
+    return rules
+
+
+def _requirements(module: ModuleType) -> frozenset[str] | None:
+    """
+    Return the document data a rule module declares with REQUIRES, or
+    None if it does not declare any, in which case it gets a fully
+    parsed document.
+    """
+    requires = getattr(module, "REQUIRES", None)
+    if requires is None:
+        return None
+    return frozenset(requires)
 
 
 def _rule_id(module_name: str, func_name: str) -> str:
@@ -73,6 +183,43 @@ def _rule_id(module_name: str, func_name: str) -> str:
     return f"{short_module}"
 
 
+def _write_manifest(
+    manifest: Path,
+    package_name: str,
+    mtimes: dict[str, int],
+    rules: dict[str, Rule],
+) -> None:
+    """
+    Record a package's rules in the manifest, keeping entries for other
+    packages. The file is replaced atomically; failures are ignored
+    since the manifest is only a cache.
+    """
+    data = read_json(manifest, MANIFEST_VERSION)
+    if data is None or not isinstance(data.get("packages"), dict):
+        data = {"packages": {}, "version": MANIFEST_VERSION}
+    # Rule ids are module names, so each rule's module can be imported
+    # directly on the next cold start.
+    data["packages"][package_name] = {
+        "mtimes": mtimes,
+        "rules": [
+            {
+                "description": rule.description,
+                "id": rule.id,
+                "module": f"{package_name}.{rule.id}",
+            }
+            for rule in rules.values()
+        ],
+    }
+    atomic_write_json(manifest, data, indent=2, sort_keys=True)
+
+
+def clear_rule_registry() -> None:
+    """
+    Forget every registry built by get_rule_registry().
+    """
+    _REGISTRIES.clear()
+
+
 def discover_rules(package: str | None = None) -> dict[str, Rule]:
     """
     Import all rule modules and return a mapping of rule_id to definitions.
@@ -102,6 +249,38 @@ def discover_rules(package: str | None = None) -> dict[str, Rule]:
                 id=rule_id,
                 func=func,
                 description=description,
+                cacheable=_is_cacheable(module),
+                requires=_requirements(module),
+                iter_func=_iter_function(module),
             )
 
     return rules
+
+
+def get_rule_registry(
+    package: str | None = None,
+    manifest: Path | None = None,
+) -> dict[str, Rule]:
+    """
+    Return the rules of a package, discovering them once per process.
+
+    Later calls for the same package reuse the first result instead of
+    iterating and introspecting the rule modules again. If manifest is
+    given, a cold start first tries the rule list recorded there, which
+    is only trusted while the modification times of the package's
+    module files are unchanged, and records a fresh discovery for the
+    next run.
+    """
+    package_name = package or __name__
+    if package_name not in _REGISTRIES:
+        rules: dict[str, Rule] | None = None
+        if manifest is not None:
+            mtimes = _package_mtimes(package_name)
+            rules = _read_manifest(manifest, package_name, mtimes)
+            if rules is None:
+                rules = discover_rules(package_name)
+                _write_manifest(manifest, package_name, mtimes, rules)
+        if rules is None:
+            rules = discover_rules(package_name)
+        _REGISTRIES[package_name] = rules
+    return dict(_REGISTRIES[package_name])
@@ -9,6 +9,10 @@ from tiredize.linter.utils import get_config_int
 from tiredize.markdown.types.document import Document
 
 
+# Only line offsets are read, so the markdown is never parsed.
+REQUIRES = frozenset({"lines"})
+
+
 def validate(
     document: Document,
     config: dict[str, Any],
@@ -25,22 +29,12 @@ def validate(
 
     results: list[RuleResult] = []
 
-    text = document.string
-    cursor = 0
-
-    for line in text.splitlines(keepends=True):
-
-        line_text = line
-        if line.endswith("\n"):
-            line_text = line[:-1]
-            if line_text.endswith("\r"):
-                line_text = line_text[:-1]
-
-        line_length = len(line_text)
+    for start, _, content_end in document.lines:
+        line_length = content_end - start
         if line_length > maximum_length:
             overflow = line_length - maximum_length
             position = Position(
-                offset=cursor + maximum_length,
+                offset=start + maximum_length,
                 length=overflow,
             )
             results.append(
@@ -53,6 +47,4 @@ def validate(
                     rule_id=None,
                 )
             )
-
-        cursor += len(line)
     return results
@@ -1,113 +1,291 @@
 # Standard library
 from __future__ import annotations
+from collections.abc import Iterator
+from concurrent.futures import Future
+from concurrent.futures import wait
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
+import time
+
+# Third-party
+import requests
 
 # Local
 from tiredize.core_types import RuleResult
+from tiredize.linter.host_pool import DEFAULT_CONCURRENCY
+from tiredize.linter.host_pool import DEFAULT_PER_HOST
+from tiredize.linter.host_pool import HostPool
+from tiredize.linter.host_pool import get_host_pool
+from tiredize.linter.link_cache import DEFAULT_FAILURE_TTL
+from tiredize.linter.link_cache import DEFAULT_SUCCESS_TTL
+from tiredize.linter.link_cache import LinkCache
+from tiredize.linter.sessions import DEFAULT_POOL_SIZE
+from tiredize.linter.sessions import get_session
+from tiredize.linter.url_table import POLL_INTERVAL
+from tiredize.linter.url_table import Outcome
+from tiredize.linter.url_table import UrlTable
+from tiredize.linter.url_table import get_url_table
+from tiredize.linter.url_table import normalize_url
+from tiredize.linter.utils import DEFAULT_MAX_BYTES
+from tiredize.linter.utils import LinkRecord
 from tiredize.linter.utils import check_url_valid
 from tiredize.linter.utils import get_config_bool
 from tiredize.linter.utils import get_config_dict
 from tiredize.linter.utils import get_config_int
+from tiredize.linter.utils import get_config_str
+from tiredize.linter.utils import request_url
 from tiredize.markdown.types.document import Document
 
 
-def validate(
+# Results depend on other files and remote servers, not just the
+# document, so they must never be served from the result cache.
+CACHEABLE = False
+REQUIRES = frozenset({
+    "links_bare",
+    "links_bracket",
+    "links_inline",
+    "reference_definitions",
+    "sections",
+})
+
+# Section attributes holding links, in the order they are checked,
+# with the label used in messages.
+_LINK_KINDS = (
+    ("Inline", "links_inline"),
+    ("Bracket", "links_bracket"),
+    ("Bare", "links_bare"),
+    ("Reference", "reference_definitions"),
+)
+
+
+def _cached_request(
+    cache: LinkCache,
+    url: str,
+    timeout: int | None,
+    headers: dict[str, Any] | None,
+    session: requests.Session,
+    head_first: bool,
+    max_bytes: int,
+) -> LinkRecord:
+    """
+    Return the cached record of url while it is fresh. Once it has
+    expired, a valid record with validators is revalidated with a
+    conditional request, and a 304 answer renews it; anything else is
+    requested again. New and renewed records are stored.
+    """
+    old = cache.get(url)
+    etag = last_modified = None
+    if old is not None:
+        if cache.is_fresh(old, time.time()):
+            return old
+        if old.valid:
+            etag, last_modified = old.etag, old.last_modified
+    record = request_url(
+        url=url,
+        timeout=timeout,
+        headers=headers,
+        session=session,
+        etag=etag,
+        last_modified=last_modified,
+        head_first=head_first,
+        max_bytes=max_bytes
+    )
+    validated = etag is not None or last_modified is not None
+    if old is not None and validated and record.status == 304:
+        record = replace(old, checked_at=record.checked_at)
+    cache.put(url, record)
+    return record
+
+
+def _host(url: str) -> str:
+    try:
+        return urlsplit(url).netloc.lower()
+    except ValueError:
+        return ""
+
+
+def _is_local(url: str) -> bool:
+    return url.startswith(("#", "."))
+
+
+def _result(
+    future: Future[Outcome],
+    table: UrlTable | None,
+) -> Outcome | None:
+    """
+    Return the outcome of future, or None as soon as the run of table
+    stops, without waiting for the request in flight.
+    """
+    if table is not None:
+        while not wait([future], timeout=POLL_INTERVAL).done:
+            if table.stopped():
+                return None
+    return future.result()
+
+
+def iter_validate(
     document: Document,
     config: dict[str, Any],
-) -> list[RuleResult]:
+) -> Iterator[RuleResult]:
     """
-    Validate document meets link requirements.
-
-    Configuration:
-        validate: bool - Enable link validation
-        ignore_domains: list[str] - Domains to ignore during validation
-        ignore_status_codes: list[int] - HTTP status codes to ignore
-        timeout: int - Timeout for link validation requests
+    Yield the results of validate() in document order as they become
+    available. Closing the iterator, or stopping the run's URL table,
+    cancels the checks not yet started.
     """
     cfg_validate = get_config_bool(config, "validate")
     if not cfg_validate:
-        return []
+        return
 
     cfg_timeout = get_config_int(config, "timeout")
     cfg_headers = get_config_dict(config, "headers")
+    cfg_concurrency = get_config_int(config, "concurrency")
+    cfg_per_host = get_config_int(config, "per_host_concurrency")
+    cfg_pool_size = get_config_int(config, "pool_size")
+    cfg_head_first = get_config_bool(config, "head_first")
+    cfg_max_bytes = get_config_int(config, "max_bytes")
+    cfg_cache = get_config_str(config, "cache")
+    cfg_cache_ttl = get_config_int(config, "cache_ttl")
+    cfg_cache_failure_ttl = get_config_int(config, "cache_failure_ttl")
     # cfg_ignore_codes = get_config_list(config, "ignore_status_codes")
 
-    results: list[RuleResult] = []
-    for section in document.sections:
-        for link in section.links_inline:
-            is_valid, status_code, error_message = check_url_valid(
-                document=document,
-                url=link.url,
-                timeout=cfg_timeout,
-                headers=cfg_headers
-            )
-            if not is_valid:
-                position = link.position
-                result = RuleResult(
-                    message=(
-                        f"Inline link '{link.url}' is not reachable. "
-                        f"Status code: {status_code}, Error: {error_message}"
-                    ),
-                    position=position,
-                    rule_id=None
-                )
-                results.append(result)
-
-        for link in section.links_bracket:
-            is_valid, status_code, error_message = check_url_valid(
-                document=document,
-                url=link.url,
-                timeout=cfg_timeout,
-                headers=cfg_headers
-            )
-            if not is_valid:
-                position = link.position
-                result = RuleResult(
-                    message=(
-                        f"Bracket link '{link.url}' is not reachable. "
-                        f"Status code: {status_code}, Error: {error_message}"
-                    ),
-                    position=position,
-                    rule_id=None
-                )
-                results.append(result)
-
-        for link in section.links_bare:
-            is_valid, status_code, error_message = check_url_valid(
-                document=document,
-                url=link.url,
-                timeout=cfg_timeout,
-                headers=cfg_headers
-            )
-            if not is_valid:
-                position = link.position
-                result = RuleResult(
-                    message=(
-                        f"Bare link '{link.url}' is not reachable. "
-                        f"Status code: {status_code}, Error: {error_message}"
-                    ),
-                    position=position,
-                    rule_id=None
+    concurrency = cfg_concurrency or DEFAULT_CONCURRENCY
+    per_host = cfg_per_host or DEFAULT_PER_HOST
+    # One connection per concurrent request to a host, so none is
+    # discarded after use.
+    session = get_session(
+        pool_size=cfg_pool_size or DEFAULT_POOL_SIZE,
+        per_host=per_host,
+    )
+
+    head_first = cfg_head_first is not False
+    max_bytes = DEFAULT_MAX_BYTES if cfg_max_bytes is None else cfg_max_bytes
+    table = get_url_table()
+    cache = None
+    if cfg_cache:
+        cache = LinkCache(
+            Path(cfg_cache),
+            success_ttl=(
+                DEFAULT_SUCCESS_TTL if cfg_cache_ttl is None
+                else cfg_cache_ttl
+            ),
+            failure_ttl=(
+                DEFAULT_FAILURE_TTL if cfg_cache_failure_ttl is None
+                else cfg_cache_failure_ttl
+            ),
+        )
+
+    def check(url: str) -> Outcome:
+        return check_url_valid(
+            document=document,
+            url=url,
+            timeout=cfg_timeout,
+            headers=cfg_headers,
+            session=session,
+            head_first=head_first,
+            max_bytes=max_bytes
+        )
+
+    def fetch(url: str) -> Outcome:
+        if cache is None:
+            return check(url)
+        return _cached_request(
+            cache,
+            url,
+            cfg_timeout,
+            cfg_headers,
+            session,
+            head_first,
+            max_bytes,
+        ).outcome
+
+    def check_remote(url: str) -> Outcome:
+        if table is None:
+            return fetch(url)
+        return table.check(url, partial(fetch, url), wait=cfg_timeout)
+
+    links = [
+        (label, link)
+        for section in document.sections
+        for label, attribute in _LINK_KINDS
+        for link in getattr(section, attribute)
+    ]
+    # The run's pool caps requests across all its documents; outside a
+    # run each call has a pool of its own.
+    run_pool = get_host_pool(concurrency, per_host)
+    pool = run_pool or HostPool(concurrency, per_host)
+    requested: dict[str, Future[Outcome]] = {}
+    try:
+        # Anchors and relative paths are checked locally when their
+        # turn comes; everything else is requested on the pool, once
+        # per normalized URL, and through the run's table if any.
+        pending: list[Future[Outcome] | None] = []
+        for _, link in links:
+            if _is_local(link.url):
+                pending.append(None)
+                continue
+            key = normalize_url(link.url)
+            if key not in requested:
+                requested[key] = pool.submit(
+                    _host(link.url),
+                    partial(check_remote, link.url)
                 )
-                results.append(result)
-
-        for link in section.reference_definitions:
-            is_valid, status_code, error_message = check_url_valid(
-                document=document,
-                url=link.url,
-                timeout=cfg_timeout,
-                headers=cfg_headers
-            )
+            pending.append(requested[key])
+        for (label, link), future in zip(links, pending):
+            if future is None:
+                outcome = check(link.url)
+            else:
+                result = _result(future, table)
+                if result is None:
+                    return
+                outcome = result
+            is_valid, status_code, error_message = outcome
             if not is_valid:
-                position = link.position
-                result = RuleResult(
+                yield RuleResult(
                     message=(
-                        f"Reference link '{link.url}' is not reachable. "
+                        f"{label} link '{link.url}' is not reachable. "
                         f"Status code: {status_code}, Error: {error_message}"
                     ),
-                    position=position,
+                    position=link.position,
                     rule_id=None
                 )
-                results.append(result)
+    finally:
+        # Checks of this document that have not started are dropped;
+        # the run's pool goes on serving other documents.
+        for future in requested.values():
+            future.cancel()
+        if run_pool is None:
+            pool.close()
+
 
-    return results
+def validate(
+    document: Document,
+    config: dict[str, Any],
+) -> list[RuleResult]:
+    """
+    Validate document meets link requirements.
+
+    Configuration:
+        validate: bool - Enable link validation
+        ignore_domains: list[str] - Domains to ignore during validation
+        ignore_status_codes: list[int] - HTTP status codes to ignore
+        timeout: int - Timeout for link validation requests
+        concurrency: int - Links checked at once (default 8)
+        per_host_concurrency: int - Links checked at once on one host
+            (default 2)
+        pool_size: int - Hosts whose connections are kept alive for
+            the rest of the run (default 16)
+        head_first: bool - Probe with HEAD before falling back to a
+            streamed GET (default true)
+        max_bytes: int - Largest GET body read to keep its connection
+            alive; larger bodies are not downloaded (default 65536)
+        cache: str - Directory in which remote link results are kept
+            between runs; unset disables the link cache
+        cache_ttl: int - Seconds a reachable link is not checked again
+            (default 86400)
+        cache_failure_ttl: int - Seconds an unreachable link is not
+            checked again (default 3600)
+    """
+    return list(iter_validate(document, config))
@@ -9,6 +9,11 @@ from tiredize.linter.utils import get_config_bool
 from tiredize.markdown.types.document import Document
 
 
+# Each line is searched in document.string; the markdown is never
+# parsed.
+REQUIRES = frozenset({"lines", "text"})
+
+
 def validate(
     document: Document,
     config: dict[str, Any],
@@ -18,35 +23,25 @@ def validate(
     """
     results: list[RuleResult] = []
     text = document.string
-    cursor = 0
 
     tabs_allowed = get_config_bool(config, "allowed")
+    if tabs_allowed:
+        return results
 
-    for line in text.splitlines(keepends=True):
-        line_text = line
-        if line.endswith("\n"):
-            line_text = line[:-1]
-            if line_text.endswith("\r"):
-                line_text = line_text[:-1]
-
-        if not tabs_allowed:
-            split_line = line_text.split("\t")
-            if len(split_line) > 1:
-                offset_in_line = 0
-                for segment in split_line[:-1]:
-                    offset_in_line += len(segment)
-                    position = Position(
-                        offset=cursor + offset_in_line,
-                        length=1,
-                    )
-                    results.append(
-                        RuleResult(
-                            message="Line contains a tab character.",
-                            position=position,
-                            rule_id=None,
-                        )
-                    )
-                    offset_in_line += 1
-        cursor += len(line)
+    for start, _, content_end in document.lines:
+        index = text.find("\t", start, content_end)
+        while index != -1:
+            position = Position(
+                offset=index,
+                length=1,
+            )
+            results.append(
+                RuleResult(
+                    message="Line contains a tab character.",
+                    position=position,
+                    rule_id=None,
+                )
+            )
+            index = text.find("\t", index + 1, content_end)
 
     return results
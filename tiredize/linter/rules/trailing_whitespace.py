@@ -9,6 +9,11 @@ from tiredize.linter.utils import get_config_bool
 from tiredize.markdown.types.document import Document
 
 
+# Line ends are inspected in document.string; the markdown is never
+# parsed.
+REQUIRES = frozenset({"lines", "text"})
+
+
 def validate(
     document: Document,
     config: dict[str, Any],
@@ -18,33 +23,25 @@ def validate(
     """
     results: list[RuleResult] = []
     text = document.string
-    cursor = 0
 
     trailing_whitespace_allowed = get_config_bool(config, "allowed")
+    if trailing_whitespace_allowed:
+        return results
 
-    for line in text.splitlines(keepends=True):
-        line_text = line
-        if line.endswith("\n"):
-            line_text = line[:-1]
-            if line_text.endswith("\r"):
-                line_text = line_text[:-1]
-
-        if not trailing_whitespace_allowed:
-            stripped_line = line_text.rstrip()
-            offset_in_line = 0
-            if len(stripped_line) < len(line_text):
-                offset_in_line += len(stripped_line)
-                length = len(line_text) - len(stripped_line)
-                position = Position(
-                    offset=cursor + offset_in_line,
-                    length=length
-                )
-                results.append(
-                    RuleResult(
-                        message="Line contains trailing whitespace.",
-                        position=position,
-                        rule_id=None
-                    )
+    for start, _, content_end in document.lines:
+        stripped_end = content_end
+        while stripped_end > start and text[stripped_end - 1].isspace():
+            stripped_end -= 1
+        if stripped_end < content_end:
+            position = Position(
+                offset=stripped_end,
+                length=content_end - stripped_end
+            )
+            results.append(
+                RuleResult(
+                    message="Line contains trailing whitespace.",
+                    position=position,
+                    rule_id=None
                 )
-        cursor += len(line)
+            )
     return results
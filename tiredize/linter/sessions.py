@@ -0,0 +1,69 @@
+# Standard library
+from __future__ import annotations
+from http.cookiejar import DefaultCookiePolicy
+import atexit
+import os
+import threading
+
+# Third-party
+from requests.adapters import HTTPAdapter
+import requests
+
+
+DEFAULT_POOL_SIZE = 16
+
+# Sessions of this process, keyed by (pid, pool_size, per_host). The
+# pid keeps a forked worker from reusing its parent's sockets.
+_SESSIONS: dict[tuple[int, int, int], requests.Session] = {}
+_LOCK = threading.Lock()
+
+
+def close_sessions() -> None:
+    """
+    Close every session returned by get_session() and their pooled
+    connections. Runs at interpreter exit; later calls of get_session()
+    open new sessions.
+    """
+    with _LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+def get_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    per_host: int = 1,
+) -> requests.Session:
+    """
+    Return the process-wide HTTP session for these pool settings.
+
+    Connections are kept alive and reused across every document of a
+    run: up to per_host per host, for up to pool_size hosts, the least
+    recently used host being dropped first. The session is shared by
+    the link checking threads and keeps no cookies, so it holds no
+    state besides its connection pools.
+    """
+    pool_size = max(1, pool_size)
+    per_host = max(1, per_host)
+    key = (os.getpid(), pool_size, per_host)
+    with _LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            # Like separate requests.get() calls, checks share no
+            # cookies.
+            session.cookies.set_policy(
+                DefaultCookiePolicy(allowed_domains=[])
+            )
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=per_host,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSIONS[key] = session
+    return session
+
+
+atexit.register(close_sessions)
@@ -0,0 +1,207 @@
+# Standard library
+from __future__ import annotations
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+import hashlib
+import os
+import threading
+import time
+
+# Local
+from tiredize.utils import RunState
+from tiredize.utils import atomic_write_json
+from tiredize.utils import read_json
+
+
+# (is_valid, status_code, error_message), as check_url_valid returns.
+Outcome = tuple[bool, int | None, str | None]
+
+# How often a process waiting for another process's check polls, and
+# how long it waits at most before checking the URL itself.
+POLL_INTERVAL = 0.05
+CLAIM_TIMEOUT = 300.0
+
+# The outcome of a check abandoned because the run has stopped; nobody
+# reads it.
+STOPPED: Outcome = (False, None, "run stopped")
+
+_RUN: RunState[UrlTable] = RunState()
+
+
+def clear_url_table() -> None:
+    """
+    End the run started by start_url_table(); later checks are no
+    longer shared.
+    """
+    _RUN.clear()
+
+
+def get_url_table() -> UrlTable | None:
+    """
+    Return the table of the current run, or None outside a run.
+    """
+    return _RUN.get()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Return the form of a URL used to recognize repeated links: scheme
+    and host lowercased, fragment removed. Path, query and user info
+    are kept as written, since they may be case-sensitive.
+    """
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        return url
+    netloc = parts.netloc
+    if host is not None:
+        userinfo, _, _ = parts.netloc.rpartition("@")
+        if ":" in host:
+            host = f"[{host}]"
+        netloc = f"{userinfo}@{host}" if userinfo else host
+        if port is not None:
+            netloc = f"{netloc}:{port}"
+    return urlunsplit((
+        parts.scheme.lower(),
+        netloc,
+        parts.path,
+        parts.query,
+        "",
+    ))
+
+
+def start_url_table(
+    directory: Path | None = None,
+    stop: Callable[[], bool] | None = None,
+) -> UrlTable:
+    """
+    Start a run whose link checks are shared, replacing any previous
+    run's table, and return its table. Processes of one run pass the
+    same directory; stop returns True once the run has stopped.
+    """
+    return _RUN.start(UrlTable(directory, stop))
+
+
+class UrlTable:
+    """
+    Outcomes of the URL checks of one run, so each URL is checked once.
+
+    URLs are keyed by normalize_url(). Within a process, the first
+    caller for a URL runs the check and concurrent callers wait for
+    its outcome. With a directory, processes coordinate through files:
+    a process claims a URL by creating its lock file exclusively and
+    publishes the outcome with an atomic os.replace; other processes
+    wait for the outcome file instead of fetching the URL too. A
+    claim that yields no outcome within the caller's wait (at most
+    CLAIM_TIMEOUT), or whose lock disappears, is checked again by the
+    waiter. Once stop returns True, waiters give up with STOPPED.
+    """
+
+    # Dunder methods
+    def __init__(
+        self,
+        directory: Path | None = None,
+        stop: Callable[[], bool] | None = None,
+    ) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._outcomes: dict[str, Future[Outcome]] = {}
+        self._stop = stop
+
+    # Public methods
+    def check(
+        self,
+        url: str,
+        func: Callable[[], Outcome],
+        wait: float | None = None,
+    ) -> Outcome:
+        """
+        Return the outcome of url, calling func to check it only if no
+        thread or process of the run has checked it yet. wait bounds
+        the seconds spent waiting for another process's check, and is
+        normally the request timeout that check runs under.
+        """
+        key = normalize_url(url)
+        with self._lock:
+            future = self._outcomes.get(key)
+            owner = future is None
+            if future is None:
+                future = Future()
+                self._outcomes[key] = future
+        if not owner:
+            return future.result()
+        try:
+            outcome = self._check_shared(key, func, wait)
+        except Exception as exc:
+            # Let the next caller try again rather than fail for good.
+            with self._lock:
+                del self._outcomes[key]
+            future.set_exception(exc)
+            raise
+        future.set_result(outcome)
+        return outcome
+
+    def stopped(self) -> bool:
+        """
+        True once the run this table belongs to has stopped.
+        """
+        return self._stop is not None and self._stop()
+
+    # Private methods
+    def _check_shared(
+        self,
+        key: str,
+        func: Callable[[], Outcome],
+        wait: float | None,
+    ) -> Outcome:
+        if self.directory is None:
+            return func()
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        outcome_path = self.directory / f"{name}.json"
+        lock_path = self.directory / f"{name}.lock"
+        timeout = CLAIM_TIMEOUT if wait is None else min(wait, CLAIM_TIMEOUT)
+        deadline = time.monotonic() + timeout
+        while True:
+            outcome = self._read(outcome_path)
+            if outcome is not None:
+                return outcome
+            if self.stopped():
+                return STOPPED
+            try:
+                os.close(os.open(
+                    lock_path,
+                    os.O_CREAT | os.O_EXCL | os.O_WRONLY
+                ))
+            except FileExistsError:
+                if time.monotonic() < deadline:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                return func()
+            try:
+                # The previous claimant may have published just before
+                # releasing its lock.
+                outcome = self._read(outcome_path)
+                if outcome is None:
+                    outcome = func()
+                    self._write(outcome_path, outcome)
+                return outcome
+            finally:
+                lock_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read(path: Path) -> Outcome | None:
+        data = read_json(path)
+        try:
+            is_valid, status_code, error_message = data
+        except (TypeError, ValueError):
+            return None
+        return bool(is_valid), status_code, error_message
+
+    @staticmethod
+    def _write(path: Path, outcome: Outcome) -> None:
+        atomic_write_json(path, list(outcome))
@@ -1,15 +1,68 @@
 # Standard library
 from __future__ import annotations
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+import time
 
 # Third-party
 import requests
 
 # Local
+from tiredize.linter.local_targets import LocalTargets
+from tiredize.linter.local_targets import get_local_targets
 from tiredize.markdown.types.document import Document
 
 
+# Largest body read after a GET probe so its connection can be reused;
+# larger bodies are not read and their connection is closed instead.
+DEFAULT_MAX_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class LinkRecord:
+    """
+    What requesting a remote URL found out, as stored by the link
+    cache. error is set when no response was received.
+    """
+    checked_at: float
+    error: str | None = None
+    etag: str | None = None
+    final_url: str | None = None
+    last_modified: str | None = None
+    status: int | None = None
+    valid: bool = False
+
+    # Public methods
+    @property
+    def outcome(self) -> tuple[bool, int | None, str | None]:
+        """
+        The record as check_url_valid() reports it.
+        """
+        return self.valid, self.status, self.error
+
+
+def _discard_body(response: requests.Response, max_bytes: int) -> None:
+    """
+    Finish a streamed response without keeping its body: read and drop
+    a body of at most max_bytes so the connection can be reused, and
+    close the connection of a larger one.
+    """
+    try:
+        length = response.headers.get("Content-Length")
+        if length is None or int(length) <= max_bytes:
+            read = 0
+            for chunk in response.iter_content(chunk_size=8192):
+                read += len(chunk)
+                if read > max_bytes:
+                    break
+    except (ValueError, requests.exceptions.RequestException):
+        # The status is known; a broken body does not change it.
+        pass
+    finally:
+        response.close()
+
+
 def get_config_int(
     config: dict[str, Any],
     key: str
@@ -81,7 +134,10 @@ def check_url_valid(
     timeout: float | None = None,
     headers: dict[str, Any] | None = None,
     allow_redirects: bool | None = None,
-    verify_ssl: bool | None = None
+    verify_ssl: bool | None = None,
+    session: requests.Session | None = None,
+    head_first: bool = True,
+    max_bytes: int = DEFAULT_MAX_BYTES
 ) -> tuple[bool, int | None, str | None]:
     """
     Perform a lightweight check to determine if a URL is reachable.
@@ -98,47 +154,122 @@ def check_url_valid(
 
     This helper does not raise exceptions. All failures are returned
     in the tuple so callers do not need try/except logic.
+
+    With a session, the request reuses its kept-alive connections
+    instead of opening a new one. Remote URLs are probed as described
+    in request_url().
     """
     if url.startswith("#"):
-        for section in document.sections:
-            if section.header.slug == url:
-                return True, None, None
+        if url in document.slugs:
+            return True, None, None
         return False, None, "anchor not found in document"
 
     if url.startswith("."):
         if document.path is None:
             return False, None, "document has no path for relative URL"
 
-        path = document.path.parent / Path(url)
-        if path.exists():
-            return True, None, None
-        else:
+        # Outside a run, nothing is remembered between calls.
+        targets = get_local_targets() or LocalTargets()
+        target, _, fragment = url.partition("#")
+        path = document.path.parent / Path(target)
+        if not targets.exists(path):
             return False, None, "relative file not found"
+        if fragment:
+            slugs = targets.slugs(path, document.parser_backend)
+            if slugs is not None and f"#{fragment}" not in slugs:
+                return False, None, "anchor not found in target document"
+        return True, None, None
+
+    record = request_url(
+        url=url,
+        timeout=timeout,
+        headers=headers,
+        allow_redirects=allow_redirects,
+        verify_ssl=verify_ssl,
+        session=session,
+        head_first=head_first,
+        max_bytes=max_bytes
+    )
+    return record.outcome
+
+
+def request_url(
+    url: str,
+    timeout: float | None = None,
+    headers: dict[str, Any] | None = None,
+    allow_redirects: bool | None = None,
+    verify_ssl: bool | None = None,
+    session: requests.Session | None = None,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    head_first: bool = True,
+    max_bytes: int = DEFAULT_MAX_BYTES
+) -> LinkRecord:
+    """
+    Request a remote URL and describe the response as a LinkRecord.
+
+    Only the status line and headers are needed, so with head_first
+    the URL is probed with HEAD, which has no body. A HEAD answer of
+    4xx or 5xx, or a HEAD request that fails outright, may only mean
+    the server does not support HEAD, so it is retried as a streamed
+    GET, as is every probe without head_first. A GET body is read
+    only if it is at most max_bytes, which returns the connection to
+    the session's pool; otherwise the connection is closed right
+    after the headers.
 
-    req_headers = headers or {
+    With etag or last_modified, the request is conditional
+    (If-None-Match / If-Modified-Since), and a 304 Not Modified answer
+    is returned as a record with status 304. Like check_url_valid(),
+    this never raises; failures are recorded in the error field.
+    """
+    req_headers = dict(headers or {
         "User-Agent": "tiredize-link-checker/1.0"
-    }
+    })
+    if etag is not None:
+        req_headers["If-None-Match"] = etag
+    if last_modified is not None:
+        req_headers["If-Modified-Since"] = last_modified
+    checked_at = time.time()
 
     try:
         if allow_redirects is None:
             allow_redirects = True
 
-        response = requests.get(
-            url=url,
-            headers=req_headers,
-            timeout=timeout,
-            allow_redirects=allow_redirects,
-            verify=verify_ssl,
+        send = requests.request if session is None else session.request
+        options: dict[str, Any] = {
+            "url": url,
+            "headers": req_headers,
+            "timeout": timeout,
+            "allow_redirects": allow_redirects,
+            "verify": verify_ssl,
+        }
+        response = None
+        if head_first:
+            try:
+                response = send("HEAD", **options)
+            except requests.exceptions.RequestException:
+                # Some servers drop or reset HEAD requests; the GET
+                # below decides.
+                response = None
+        if response is None or response.status_code >= 400:
+            response = send("GET", stream=True, **options)
+            _discard_body(response, max_bytes)
+        status_code = response.status_code
+        return LinkRecord(
+            checked_at=checked_at,
+            etag=response.headers.get("ETag"),
+            final_url=response.url,
+            last_modified=response.headers.get("Last-Modified"),
+            status=status_code,
+            # Treat 2xx and 3xx as valid. You can change this policy
+            # later.
+            valid=200 <= status_code < 400,
         )
-        # Treat 2xx and 3xx as valid. You can change this policy later.
-        if 200 <= response.status_code < 400:
-            return True, response.status_code, None
-        return False, response.status_code, None
 
     except requests.exceptions.Timeout:
-        return False, None, "timeout"
+        return LinkRecord(checked_at=checked_at, error="timeout")
 
     # Covers DNS errors, connection failures,
     # SSL issues, invalid URLs, etc.
     except requests.exceptions.RequestException as exc:
-        return False, None, str(exc)
+        return LinkRecord(checked_at=checked_at, error=str(exc))
@@ -0,0 +1,88 @@
+# Standard library
+from __future__ import annotations
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+import bisect
+
+
+class LineTable:
+    """
+    Offsets of every line of a text, split on "\\n".
+
+    For each line the table holds its start offset, its end offset
+    (including the newline) and its content end (excluding the newline
+    and a carriage return right before it). Rules walk the offsets and
+    look at the text in place instead of splitting it into strings.
+    """
+
+    # Dunder methods
+    def __init__(self, text: str) -> None:
+        self.text = text
+        # Newlines are found with str.find, which scans in C, and the
+        # columns are filled directly, so no line is copied out of the
+        # text.
+        self.starts: array[int] = array("Q", [0])
+        self.content_ends: array[int] = array("Q")
+        find = text.find
+        pos = find("\n")
+        while pos != -1:
+            self.content_ends.append(pos)
+            self.starts.append(pos + 1)
+            pos = find("\n", pos + 1)
+        self.content_ends.append(len(text))
+        if "\r\n" in text:
+            for index, start in enumerate(self.starts[1:]):
+                # text[start - 1] is the newline that ends the line.
+                if start > 1 and text[start - 2] == "\r":
+                    self.content_ends[index] -= 1
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Yield (start, end, content_end) for each line.
+        """
+        ends = self.starts[1:]
+        ends.append(len(self.text))
+        return zip(self.starts, ends, self.content_ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    # Public methods
+    def line_col(self, offset: int) -> tuple[int, int]:
+        """
+        Return (line_number, column) for an offset, clamped to the text.
+
+        line_number is 1-based.
+        column is 0-based.
+        """
+        offset = min(max(offset, 0), len(self.text))
+        line_index = bisect.bisect_right(self.starts, offset) - 1
+        return line_index + 1, offset - self.starts[line_index]
+
+    def line_cols(self, offsets: Iterable[int]) -> list[tuple[int, int]]:
+        """
+        Return (line_number, column) for each offset, like line_col().
+
+        Sorted offsets are resolved in one forward pass: an offset on
+        the same line as the previous one needs no search, and later
+        lines are only searched for past the previous line.
+        """
+        result: list[tuple[int, int]] = []
+        starts = self.starts
+        line_count = len(starts)
+        text_len = len(self.text)
+        line_index = 0
+        for offset in offsets:
+            offset = min(max(offset, 0), text_len)
+            if offset < starts[line_index]:
+                line_index = bisect.bisect_right(starts, offset) - 1
+            elif (line_index + 1 < line_count
+                  and starts[line_index + 1] <= offset):
+                line_index = bisect.bisect_right(
+                    starts,
+                    offset,
+                    line_index + 1
+                ) - 1
+            result.append((line_index + 1, offset - starts[line_index]))
+        return result
@@ -0,0 +1,160 @@
+# Standard library
+from __future__ import annotations
+from collections import deque
+from collections.abc import Iterator
+import codecs
+import re
+
+# Local
+from tiredize.markdown.types.code import CodeBlock
+from tiredize.markdown.types.header import Header
+from tiredize.markdown.utils import blank_ranges
+from tiredize.markdown.utils import compile_re
+
+
+# RE_CODEBLOCK only uses ASCII delimiters, "." and [\s\S], which match
+# UTF-8 bytes exactly as they match the decoded characters, so code
+# blocks can be found on the raw bytes of a mapped file.
+_RE_CODEBLOCK_BYTES = re.compile(CodeBlock.RE_CODEBLOCK.encode(), re.VERBOSE)
+_RE_HEADER_START_BYTES = re.compile(rb"(?:(?<=\n)|^)\#")
+_RE_LINE_BYTES = re.compile(rb"[^\n]*\n?")
+
+_CHUNK_SIZE = 1 << 20
+
+
+class _CodeBlockSpans:
+    """
+    Code block byte spans of a buffer, found lazily in order.
+    """
+
+    # Dunder methods
+    def __init__(self, view: memoryview) -> None:
+        self._matches = _RE_CODEBLOCK_BYTES.finditer(view)
+        self._spans: deque[tuple[int, int]] = deque()
+        self._done = False
+
+    # Public methods
+    def contains(self, pos: int) -> bool:
+        """
+        Return True if pos is inside a code block. Spans ending at or
+        before pos are forgotten, so pos must never decrease.
+        """
+        while self._spans and self._spans[0][1] <= pos:
+            self._spans.popleft()
+        return len(self.overlapping(pos, pos + 1)) > 0
+
+    def overlapping(self, start: int, end: int) -> list[tuple[int, int]]:
+        """
+        Return the spans overlapping [start, end).
+        """
+        while not self._done and (
+            not self._spans or self._spans[-1][0] < end
+        ):
+            match = next(self._matches, None)
+            if match is None:
+                self._done = True
+            else:
+                self._spans.append(match.span())
+        return [
+            span for span in self._spans
+            if span[0] < end and span[1] > start
+        ]
+
+
+def _decode_sanitized(
+    view: memoryview,
+    start: int,
+    end: int,
+    spans: list[tuple[int, int]],
+) -> str:
+    """
+    Decode view[start:end] with code blocks replaced by whitespace.
+    """
+    chunks: list[str] = []
+    for span_start, span_end in spans:
+        span_start = max(span_start, start)
+        span_end = min(span_end, end)
+        if span_start >= span_end:
+            continue
+        chunks.append(str(view[start:span_start], "utf-8"))
+        code = str(view[span_start:span_end], "utf-8")
+        chunks.append(blank_ranges(code, [(0, len(code))]))
+        start = span_end
+    chunks.append(str(view[start:end], "utf-8"))
+    return "".join(chunks)
+
+
+def _header_end(
+    view: memoryview,
+    pos: int,
+    blocks: _CodeBlockSpans,
+) -> int | None:
+    """
+    Return the byte offset where a header starting at pos ends, or None
+    if RE_HEADER does not match there.
+
+    The header pattern is matched on a decoded window of the sanitized
+    text: lines from pos up to and including the first one with any
+    non-whitespace after the leading hashes. \\s+ can cross newlines,
+    but never past that line, so the match is the same as on the whole
+    text.
+    """
+    line_ends: list[int] = []
+    lines: list[str] = []
+    end = pos
+    while True:
+        line = _RE_LINE_BYTES.match(view, end)
+        if line is None or line.end() == end:
+            break
+        end = line.end()
+        text = _decode_sanitized(
+            view,
+            line.start(),
+            end,
+            blocks.overlapping(line.start(), end)
+        )
+        line_ends.append(end - 1 if text.endswith("\n") else end)
+        lines.append(text)
+        content = text.lstrip("#") if len(lines) == 1 else text
+        if content.strip():
+            break
+
+    window = "".join(lines)
+    match = compile_re(Header.RE_HEADER).match(window)
+    if match is None:
+        return None
+    return line_ends[window.count("\n", 0, match.end())]
+
+
+def count_chars(view: memoryview) -> int:
+    """
+    Return the number of characters in UTF-8 encoded view, decoding it
+    in bounded chunks.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    count = 0
+    for start in range(0, len(view), _CHUNK_SIZE):
+        count += len(decoder.decode(view[start:start + _CHUNK_SIZE]))
+    return count + len(decoder.decode(b"", final=True))
+
+
+def iter_header_starts(view: memoryview) -> Iterator[int]:
+    """
+    Yield the byte offset of every header in UTF-8 encoded markdown.
+
+    The offsets are the starts of the headers Header.extract() finds
+    in the decoded text, so they are the section boundaries used by
+    Section.extract(). Only the lines around each candidate are
+    decoded, so memory stays bounded for any size of input.
+    """
+    blocks = _CodeBlockSpans(view)
+    resume = 0
+    for candidate in _RE_HEADER_START_BYTES.finditer(view):
+        pos = candidate.start()
+        if pos < resume or blocks.contains(pos):
+            continue
+        end = _header_end(view, pos, blocks)
+        if end is None:
+            continue
+        yield pos
+        resume = end
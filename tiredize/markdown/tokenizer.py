@@ -0,0 +1,345 @@
+# Standard library
+from __future__ import annotations
+from dataclasses import dataclass
+import bisect
+import re
+
+# Local
+from tiredize.core_types import Position
+from tiredize.markdown.types.code import CodeBlock
+from tiredize.markdown.types.code import CodeInline
+from tiredize.markdown.types.header import Header
+from tiredize.markdown.types.image import InlineImage
+from tiredize.markdown.types.link import BareLink
+from tiredize.markdown.types.link import BracketLink
+from tiredize.markdown.types.link import InlineLink
+from tiredize.markdown.types.quoteblock import QuoteBlock
+from tiredize.markdown.types.reference import ImageReference
+from tiredize.markdown.types.reference import LinkReference
+from tiredize.markdown.types.reference import ReferenceDefinition
+from tiredize.markdown.types.table import Table
+from tiredize.markdown.utils import blank_ranges
+from tiredize.markdown.utils import compile_re
+
+
+_RE_CODEBLOCK = compile_re(CodeBlock.RE_CODEBLOCK)
+_RE_CODE_INLINE = compile_re(CodeInline.RE_CODE_INLINE)
+_RE_HEADER = compile_re(Header.RE_HEADER)
+_RE_IMAGE_REFERENCE = compile_re(ImageReference.RE_IMAGE_REFERENCE)
+_RE_INLINE_IMAGE = compile_re(InlineImage.RE_INLINE_IMAGE)
+_RE_LINK_BRACKET = compile_re(BracketLink.RE_LINK_BRACKET)
+_RE_LINK_INLINE = compile_re(InlineLink.RE_LINK_INLINE)
+_RE_LINK_REFERENCE = compile_re(LinkReference.RE_LINK_REFERENCE)
+_RE_QUOTEBLOCK = compile_re(QuoteBlock.RE_QUOTEBLOCK)
+_RE_REFERENCE_DEFINITION = compile_re(
+    ReferenceDefinition.RE_REFERENCE_DEFINITION
+)
+_RE_TABLE = compile_re(Table.RE_TABLE)
+_RE_URL = compile_re(BareLink.RE_URL)
+
+# Characters that can open an element. Line triggers are only
+# interesting at the start of a line; inline triggers anywhere.
+_RE_LINE_TRIGGER = re.compile(r"(?:(?<=\n)|(?:^))[`#>\[]")
+_RE_INLINE_TRIGGER = re.compile(r"[`\[<\\]|https?://|\.\.?/")
+
+
+@dataclass(frozen=False)
+class Tokens:
+    """
+    Every element list found in one span of markdown text.
+    """
+    code_block: list[CodeBlock]
+    code_inline: list[CodeInline]
+    headers: list[Header]
+    images_inline: list[InlineImage]
+    images_reference: list[ImageReference]
+    links_bare: list[BareLink]
+    links_bracket: list[BracketLink]
+    links_inline: list[InlineLink]
+    links_reference: list[LinkReference]
+    position: Position
+    quoteblocks: list[QuoteBlock]
+    reference_definitions: list[ReferenceDefinition]
+    string_safe: str
+    tables: list[Table]
+
+
+def _blank(text: str, matches: list[re.Match[str]]) -> str:
+    """
+    Replace non-overlapping, ordered matches with whitespace.
+    """
+    return blank_ranges(text, [match.span() for match in matches])
+
+
+def _match_at(
+    pattern: re.Pattern[str],
+    text: str,
+    positions: list[int],
+    starts: list[int],
+    ends: list[int],
+) -> list[re.Match[str]]:
+    """
+    Match pattern only at the given candidate positions.
+
+    Equivalent to running pattern.finditer() over each span
+    text[starts[i]:ends[i]] as long as positions contains every offset
+    where pattern could start: matches are cut off at the end of their
+    span, and once a match is found, candidates inside it are skipped
+    just as finditer resumes after the end of the previous match.
+    Candidates before the first span are ignored.
+    """
+    result: list[re.Match[str]] = []
+    resume = 0
+    span = -1
+    for pos in positions:
+        if pos < resume:
+            continue
+        while span + 1 < len(starts) and starts[span + 1] <= pos:
+            span += 1
+        if span < 0:
+            continue
+        match = pattern.match(text, pos, ends[span])
+        if match is None:
+            continue
+        result.append(match)
+        resume = match.end()
+    return result
+
+
+def _partition(
+    matches: list[re.Match[str]],
+    starts: list[int],
+) -> list[list[re.Match[str]]]:
+    """
+    Split ordered matches into one list per span, by start offset.
+    Matches before the first span are dropped.
+    """
+    result: list[list[re.Match[str]]] = [[] for _ in starts]
+    for match in matches:
+        span = bisect.bisect_right(starts, match.start()) - 1
+        if span >= 0:
+            result[span].append(match)
+    return result
+
+
+def _pipe_line_starts(text: str) -> list[int]:
+    """
+    Return the start offset of every line that contains a pipe.
+    """
+    result: list[int] = []
+    index = text.find("|")
+    while index != -1:
+        result.append(text.rfind("\n", 0, index) + 1)
+        line_end = text.find("\n", index)
+        if line_end == -1:
+            break
+        index = text.find("|", line_end)
+    return result
+
+
+def _tokenize(
+    text: str,
+    base_offset: int,
+    split_sections: bool,
+) -> list[Tokens]:
+    code_fences: list[int] = []
+    headers: list[int] = []
+    quotes: list[int] = []
+    definitions: list[int] = []
+    for match in _RE_LINE_TRIGGER.finditer(text):
+        char = match.group()
+        pos = match.start()
+        if char == "`":
+            if text.startswith("``", pos):
+                code_fences.append(pos)
+        elif char == "#":
+            headers.append(pos)
+        elif char == ">":
+            quotes.append(pos)
+        else:
+            definitions.append(pos)
+
+    # Code blocks never contain a real header, so they can be found
+    # before the text is split into sections.
+    whole = ([0], [len(text)])
+    code_block_matches = _match_at(_RE_CODEBLOCK, text, code_fences, *whole)
+    safe_blocks = _blank(text, code_block_matches)
+    header_matches = _match_at(_RE_HEADER, safe_blocks, headers, *whole)
+
+    starts = [0]
+    if split_sections and header_matches:
+        starts = [match.start() for match in header_matches]
+    ends = starts[1:] + [len(text)]
+    spans = (starts, ends)
+
+    backticks: list[int] = []
+    brackets: list[int] = []
+    angles: list[int] = []
+    bare: list[int] = []
+    for match in _RE_INLINE_TRIGGER.finditer(safe_blocks):
+        char = match.group()
+        pos = match.start()
+        if char == "`":
+            backticks.append(pos)
+        elif char == "[":
+            brackets.append(pos)
+        elif char == "<":
+            angles.append(pos)
+        else:
+            bare.append(pos)
+
+    code_inline_matches = _match_at(
+        _RE_CODE_INLINE,
+        safe_blocks,
+        backticks,
+        *spans
+    )
+    safe = _blank(safe_blocks, code_inline_matches)
+
+    image_starts = [
+        pos - 1 for pos in brackets
+        if pos > 0 and safe[pos - 1] == "!"
+    ]
+    image_matches = _match_at(_RE_INLINE_IMAGE, safe, image_starts, *spans)
+    bracket_matches = _match_at(_RE_LINK_BRACKET, safe, angles, *spans)
+    inline_matches = _match_at(_RE_LINK_INLINE, safe, brackets, *spans)
+    definition_matches = _match_at(
+        _RE_REFERENCE_DEFINITION,
+        safe_blocks,
+        definitions,
+        *spans
+    )
+
+    # Bare links see the text with every other link type removed, in
+    # the same order BareLink.extract() sanitizes them.
+    bare_matches: list[re.Match[str]] = []
+    if bare:
+        view = _blank(safe, image_matches)
+        view = _blank(view, _match_at(_RE_LINK_BRACKET, view, angles, *spans))
+        view = _blank(view, _match_at(_RE_LINK_INLINE, view, brackets, *spans))
+        view = _blank(
+            view,
+            _match_at(_RE_REFERENCE_DEFINITION, view, definitions, *spans)
+        )
+        bare_matches = _match_at(_RE_URL, view, bare, *spans)
+
+    columns = zip(
+        _partition(code_block_matches, starts),
+        _partition(code_inline_matches, starts),
+        # A header ends at its line end, before the next section
+        # starts, so the whole-text matches need no re-matching per span.
+        _partition(header_matches, starts),
+        _partition(image_matches, starts),
+        _partition(
+            _match_at(_RE_IMAGE_REFERENCE, safe, image_starts, *spans),
+            starts
+        ),
+        _partition(bare_matches, starts),
+        _partition(bracket_matches, starts),
+        _partition(inline_matches, starts),
+        _partition(
+            _match_at(_RE_LINK_REFERENCE, safe, brackets, *spans),
+            starts
+        ),
+        _partition(
+            _match_at(_RE_QUOTEBLOCK, safe_blocks, quotes, *spans),
+            starts
+        ),
+        _partition(definition_matches, starts),
+        _partition(
+            _match_at(
+                _RE_TABLE,
+                safe_blocks,
+                _pipe_line_starts(text),
+                *spans
+            ),
+            starts
+        ),
+    )
+
+    result: list[Tokens] = []
+    for start, end, column in zip(starts, ends, columns):
+        (
+            code_block, code_inline, header, image_inline, image_reference,
+            link_bare, link_bracket, link_inline, link_reference,
+            quoteblock, definition, table,
+        ) = column
+        result.append(Tokens(
+            code_block=CodeBlock.from_matches(
+                code_block,
+                base_offset=base_offset
+            ),
+            code_inline=CodeInline.from_matches(
+                code_inline,
+                base_offset=base_offset
+            ),
+            headers=Header.from_matches(header, base_offset=base_offset),
+            images_inline=InlineImage.from_matches(
+                image_inline,
+                base_offset=base_offset
+            ),
+            images_reference=ImageReference.from_matches(
+                image_reference,
+                base_offset=base_offset
+            ),
+            links_bare=BareLink.from_matches(
+                link_bare,
+                base_offset=base_offset
+            ),
+            links_bracket=BracketLink.from_matches(
+                link_bracket,
+                base_offset=base_offset
+            ),
+            links_inline=InlineLink.from_matches(
+                link_inline,
+                base_offset=base_offset
+            ),
+            links_reference=LinkReference.from_matches(
+                link_reference,
+                base_offset=base_offset
+            ),
+            position=Position(
+                offset=base_offset + start,
+                length=end - start
+            ),
+            quoteblocks=QuoteBlock.from_matches(
+                quoteblock,
+                base_offset=base_offset
+            ),
+            reference_definitions=ReferenceDefinition.from_matches(
+                definition,
+                base_offset=base_offset
+            ),
+            string_safe=safe[start:end],
+            tables=Table.from_matches(table, base_offset=base_offset),
+        ))
+    return result
+
+
+def tokenize(text: str, base_offset: int = 0) -> Tokens:
+    """
+    Extract every element type from markdown text in a single walk.
+
+    Instead of running each extractor's regex over the whole text (and
+    re-sanitizing code for each of them), the text is scanned once for
+    the characters that can open an element, and each element pattern
+    is only tried, anchored, at those candidate offsets. Sanitized
+    views are built once and shared, following the same precedence as
+    the per-extractor sanitize chains, so the results match the
+    individual extract() methods.
+    """
+    return _tokenize(text, base_offset, split_sections=False)[0]
+
+
+def tokenize_sections(text: str, base_offset: int = 0) -> list[Tokens]:
+    """
+    Tokenize a whole document once and split the elements by section.
+
+    Sections start at each header; text before the first header is
+    only returned as a section when the document has no headers, as
+    with Section.extract(). Every match is bounded by the end of the
+    section it starts in, so each Tokens is identical to calling
+    tokenize() on that section's slice, without slicing or rescanning
+    the text per section.
+    """
+    return _tokenize(text, base_offset, split_sections=True)
@@ -1,11 +1,12 @@
 # Standard library
 from __future__ import annotations
 from dataclasses import dataclass
+import re
 
 # Local
 from tiredize.core_types import Position
+from tiredize.markdown.utils import SanitizeMask
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
 
 
 @dataclass(frozen=False)
@@ -27,15 +28,29 @@ class CodeBlock:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[CodeBlock]:
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[CodeBlock]:
         """
         Extract fenced codeblocks from markdown text.
         """
-        matches = search_all_re(
-            CodeBlock.RE_CODEBLOCK,
-            text
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
+            CodeBlock.RE_CODEBLOCK
         )
+        return CodeBlock.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[CodeBlock]:
+        """
+        Build fenced codeblocks from RE_CODEBLOCK matches.
+        """
         result: list[CodeBlock] = []
         for match in matches:
             position = Position(
@@ -74,16 +89,30 @@ class CodeInline:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[CodeInline]:
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[CodeInline]:
         """
         Extract inline code from markdown text.
         """
-        text_sanitized = CodeBlock.sanitize(text)
-        matches = search_all_re(
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             CodeInline.RE_CODE_INLINE,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK
         )
+        return CodeInline.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[CodeInline]:
+        """
+        Build inline code elements from RE_CODE_INLINE matches.
+        """
         result: list[CodeInline] = []
         for match in matches:
             position = Position(
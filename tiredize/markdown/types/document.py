@@ -1,36 +1,129 @@
 # Standard library
 from __future__ import annotations
-import bisect
+from collections.abc import Iterable
+from collections.abc import Iterator
 from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
+import mmap
+import re
 
 # Local
+from tiredize.markdown.lines import LineTable
+from tiredize.markdown.stream import count_chars
+from tiredize.markdown.stream import iter_header_starts
 from tiredize.markdown.types.frontmatter import FrontMatter
+from tiredize.markdown.types.header import HeaderSlugger
 from tiredize.markdown.types.section import Section
 
 
+_RE_FRONT_MATTER_BYTES = re.compile(
+    FrontMatter.RE_FRONT_MATTER_YAML.encode(),
+    re.VERBOSE
+)
+
+
+# Data a consumer of a Document can ask load() for. "text" and "lines"
+# need no parsing, "frontmatter" only the frontmatter block; sections
+# and their element types need a full parse.
+REQUIREMENTS = frozenset({
+    "frontmatter",
+    "lines",
+    "sections",
+    "text",
+    *Section.ELEMENTS,
+})
+
+_TEXT_REQUIREMENTS = frozenset({"lines", "text"})
+_FRONTMATTER_REQUIREMENTS = _TEXT_REQUIREMENTS | {"frontmatter"}
+
+
+def _check_requirements(
+    requires: Iterable[str] | None,
+) -> frozenset[str] | None:
+    if requires is None:
+        return None
+    needs = frozenset(requires)
+    unknown = needs - REQUIREMENTS
+    if unknown:
+        raise ValueError(
+            "Unknown document requirements: "
+            f"{', '.join(sorted(unknown))}"
+        )
+    return needs
+
+
 def _new_sections() -> list[Section]:
     return []
 
 
+def _new_slugs() -> dict[str, Section]:
+    return {}
+
+
 @dataclass(frozen=False)
 class Document:
     frontmatter: FrontMatter | None = None
-    _line_starts: list[int] = field(init=False, repr=False)
+    _lines: LineTable | None = field(init=False, repr=False)
+    parser_backend: str = "regex"
     path: Path | None = None
+    requires: frozenset[str] | None = None
+    roots: list[Section] = field(default_factory=_new_sections)
     sections: list[Section] = field(default_factory=_new_sections)
+    slugs: dict[str, Section] = field(default_factory=_new_slugs)
     string_markdown: str = ""
     string: str = ""
 
     def __post_init__(self) -> None:
-        self._line_starts = [0]
+        self._lines = None
 
-    def _build_line_index(self) -> None:
-        self._line_starts = [0]
-        for i, ch in enumerate(self.string):
-            if ch == "\n":
-                self._line_starts.append(i + 1)
+    @property
+    def lines(self) -> LineTable:
+        """
+        The line table of string, built on first use and shared by
+        line_col() and every line-oriented rule.
+        """
+        if self._lines is None:
+            self._lines = LineTable(self.string)
+        return self._lines
+
+    def iter_sections(self, path: Path) -> Iterator[Section]:
+        """
+        Yield the sections of a markdown file one at a time.
+
+        The file is memory-mapped instead of read into a string, and
+        only one section's text is decoded at a time, so very large
+        files are processed with bounded memory. Sections, offsets and
+        slugs are the same as load() produces, except that sections
+        only get their parent and depth, not their subsections, and the
+        document's roots, sections, slugs and string are left empty.
+        frontmatter and path are set.
+
+        Files containing carriage returns fall back to load(), because
+        reading text translates line endings and so changes offsets.
+        """
+        if not path.is_file():
+            raise FileNotFoundError(f"Path does not exist: {path}")
+        self.frontmatter = None
+        self.path = path
+        self.requires = None
+        self.roots = []
+        self.sections = []
+        self.slugs = {}
+        self.string = ""
+        self.string_markdown = ""
+        self._lines = None
+        if path.stat().st_size == 0:
+            yield from self._iter_loaded(path)
+            return
+        with (
+            open(path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            if mm.find(b"\r") != -1:
+                yield from self._iter_loaded(path)
+            else:
+                yield from self._iter_mapped(mm)
 
     def line_col(self, offset: int) -> tuple[int, int]:
         """
@@ -39,17 +132,31 @@ class Document:
         line_number is 1-based.
         column is 0-based.
         """
-        if offset < 0:
-            offset = 0
-        doc_len = len(self.string)
-        if offset > doc_len:
-            offset = doc_len
+        return self.lines.line_col(offset)
 
-        line_index = bisect.bisect_right(self._line_starts, offset) - 1
-        line_start = self._line_starts[line_index]
-        return line_index + 1, offset - line_start
+    def line_cols(self, offsets: Iterable[int]) -> list[tuple[int, int]]:
+        """
+        Return (line_number, column) for each offset, like line_col().
+        """
+        return self.lines.line_cols(offsets)
 
-    def load(self, path: Path = Path(), text: str = ""):
+    def load(
+        self,
+        path: Path = Path(),
+        text: str = "",
+        requires: Iterable[str] | None = None,
+    ):
+        """
+        Load a document from a file or from text and parse it.
+
+        requires names the data the caller will use (see REQUIREMENTS);
+        parsing stops as soon as it is available. With only "text" and
+        "lines", the markdown is not parsed at all and frontmatter,
+        roots, sections, slugs and string_markdown stay empty; with
+        "frontmatter" as well, only the frontmatter is extracted. None
+        parses everything.
+        """
+        needs = _check_requirements(requires)
         if path != Path() and len(text):
             raise ValueError("Provide either 'path' or 'text', not both.")
         if path == Path() and len(text) == 0:
@@ -62,27 +169,120 @@ class Document:
                 self.string = f.read()
         if len(text):
             self.string = text
-        self._parse()
+        self._parse(needs)
+
+    def parse(self, requires: Iterable[str] | None = None) -> None:
+        """
+        Parse string again for requires, replacing the parsed state.
+
+        Together with load(requires={"text"}) this separates reading a
+        file from parsing it, e.g. to time the two.
+        """
+        self._parse(_check_requirements(requires))
+
+    def _parse(self, requires: frozenset[str] | None = None):
+        self.frontmatter = None
+        self.roots = []
+        self.sections = []
+        self.slugs = {}
+        self.string_markdown = ""
+        self.requires = requires
+        self._lines = None
+        if requires is not None and requires <= _TEXT_REQUIREMENTS:
+            return
 
-    def _parse(self):
         # Separate out the frontmatter before we dive into markdown
         self.frontmatter = FrontMatter.extract(self.string)
         md = self.string
         if self.frontmatter is not None:
             md = self.string[self.frontmatter.position.length + 1:]
         self.string_markdown = md
+        if requires is not None and requires <= _FRONTMATTER_REQUIREMENTS:
+            return
+
         base_offset = 0
         if self.frontmatter:
             base_offset = self.frontmatter.position.length + 1
-        self.sections = Section.extract(text=md, base_offset=base_offset)
+        self.sections = Section.extract(
+            text=md,
+            base_offset=base_offset,
+            parser_backend=self.parser_backend
+        )
+        self.roots = [
+            section for section in self.sections
+            if section.parent is None
+        ]
 
-        header_titles: list[str] = []
+        slugger = HeaderSlugger()
+        self.slugs = {}
         for section in self.sections:
-            header = section.header
-            header_titles.append(header.title)
-            slug = header.slugify_header(
-                header.title,
-                existing=header_titles[:-1]
-            )
+            slug = slugger.slugify(section.header.title)
             section.header.slug = slug
-        self._build_line_index()
+            self.slugs.setdefault(slug, section)
+
+    def _iter_loaded(self, path: Path) -> Iterator[Section]:
+        self.load(path)
+        yield from self.sections
+
+    def _iter_mapped(self, mm: mmap.mmap) -> Iterator[Section]:
+        md_start = 0
+        base_offset = 0
+        match = _RE_FRONT_MATTER_BYTES.match(mm)
+        if match is not None:
+            self.frontmatter = FrontMatter.extract(
+                str(mm[:match.end()], "utf-8")
+            )
+        if self.frontmatter is not None:
+            # As in _parse(), one more character after the frontmatter
+            # is skipped.
+            base_offset = self.frontmatter.position.length + 1
+            next_char = str(
+                mm[match.end():match.end() + 4],
+                "utf-8",
+                "ignore"
+            )[:1]
+            md_start = match.end() + len(next_char.encode("utf-8"))
+
+        view = memoryview(mm)[md_start:]
+        starts = iter_header_starts(view)
+        slugger = HeaderSlugger()
+        ancestors: list[Section] = []
+        try:
+            first = next(starts, None)
+            if first is None:
+                yield from self._streamed(Section.extract(
+                    text=str(view, "utf-8"),
+                    base_offset=base_offset,
+                    parser_backend=self.parser_backend
+                ), slugger, ancestors)
+                return
+
+            # Text before the first header is not a section, but it
+            # still counts towards the offsets.
+            offset = base_offset + count_chars(view[:first])
+            start = first
+            while start < len(view):
+                end = next(starts, len(view))
+                text = str(view[start:end], "utf-8")
+                yield from self._streamed(Section.extract(
+                    text=text,
+                    base_offset=offset,
+                    parser_backend=self.parser_backend
+                ), slugger, ancestors)
+                offset += len(text)
+                start = end
+        finally:
+            # The map cannot be closed while any view of it is alive.
+            starts.close()
+            view.release()
+
+    @staticmethod
+    def _streamed(
+        sections: list[Section],
+        slugger: HeaderSlugger,
+        ancestors: list[Section]
+    ) -> Iterator[Section]:
+        for section in sections:
+            section.header.slug = slugger.slugify(section.header.title)
+            Section.attach(section, ancestors, link_subsections=False)
+            yield section
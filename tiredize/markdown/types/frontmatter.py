@@ -9,7 +9,7 @@ import yaml
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
+from tiredize.markdown.utils import search_first_re
 
 
 @dataclass(frozen=False)
@@ -36,11 +36,7 @@ class FrontMatter:
         """
         Extract frontmatter from text.
         """
-        matches = search_all_re(
-            FrontMatter.RE_FRONT_MATTER_YAML,
-            text
-        )
-        match = matches[0] if matches else None
+        match = search_first_re(FrontMatter.RE_FRONT_MATTER_YAML, text)
         if not match:
             return None
         position = Position(
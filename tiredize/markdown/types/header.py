@@ -6,8 +6,12 @@ import re
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.types.code import CodeBlock
+from tiredize.markdown.utils import SanitizeMask
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
+
+
+_RE_SLUG_HYPHENS = re.compile(r"-+")
+_RE_SLUG_STRIP = re.compile(r"[^\w \-]")
 
 
 @dataclass(frozen=False)
@@ -26,23 +30,37 @@ class Header:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[Header]:
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[Header]:
         """
         Extract markdown titles from a section.
         As we are expecting a section's text to be the input, this must be the
         first thing appearing in the text provided.
         """
-        matches = search_all_re(
-            Header.RE_HEADER,
-            CodeBlock.sanitize(text)
+        return Header.from_matches(
+            Header.matches(text, mask),
+            base_offset=base_offset,
+            slugger=HeaderSlugger()
         )
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0,
+        slugger: HeaderSlugger | None = None
+    ) -> list[Header]:
+        """
+        Build headers from RE_HEADER matches. Slugs come from slugger,
+        in match order; without one they are left empty for the caller
+        to assign, as Document does once for all its sections.
+        """
         result: list[Header] = []
-        header_titles: list[str] = []
         for match in matches:
             level = len(match.group("hashes"))
             title = match.group("title")
-            header_titles.append(title)
             position = Position(
                 offset=base_offset + match.start(),
                 length=match.end() - match.start()
@@ -52,16 +70,25 @@ class Header:
                 Header(
                     level=level,
                     position=position,
-                    slug=Header.slugify_header(
-                        title,
-                        existing=header_titles[:-1]
-                    ),
+                    slug="" if slugger is None else slugger.slugify(title),
                     string=match.group(),
                     title=title
                 )
             )
         return result
 
+    @staticmethod
+    def matches(
+        text: str,
+        mask: SanitizeMask | None = None
+    ) -> list[re.Match[str]]:
+        """
+        Return the RE_HEADER matches of text outside code blocks.
+        """
+        if mask is None:
+            mask = SanitizeMask(text)
+        return mask.matches(Header.RE_HEADER, CodeBlock.RE_CODEBLOCK)
+
     @staticmethod
     def sanitize(text: str) -> str:
         """
@@ -98,25 +125,51 @@ class Header:
         Returns:
         A unique slug string prefixed with '#'.
         """
+        slugger = HeaderSlugger()
+        for e in (existing or []):
+            slugger.add(e)
+        return slugger.slugify(title, record=False)
+
+
+class HeaderSlugger:
+    """
+    Assign GFM-compatible anchor slugs to headers in document order.
+
+    The running count of every title seen so far is kept between calls,
+    so slugging h headers is O(h) instead of recounting the previous
+    titles for each one, as repeated Header.slugify_header() calls do.
+    """
+
+    # Dunder methods
+    def __init__(self) -> None:
+        self._seen: dict[str, int] = {}
+
+    # Public methods
+    def add(self, title: str) -> None:
+        """
+        Record a title as seen without computing its slug.
+        """
+        self._seen[title] = self._seen.get(title, 0) + 1
+
+    def slugify(self, title: str, record: bool = True) -> str:
+        """
+        Return the slug for title, following Header.slugify_header(),
+        and record the title as seen unless record is False.
+        """
+        # Duplicates are counted by raw title, but an empty title is
+        # looked up as "section", exactly as slugify_header() does.
+        count = self._seen.get(title or "section", 0)
+        if record:
+            self.add(title)
         if title == "":
             title = "section"
 
         slug = title.lower()
-        slug = re.sub(r"[^\w \-]", "", slug)
+        slug = _RE_SLUG_STRIP.sub("", slug)
         slug = slug.replace(" ", "-")
-        slug = re.sub(r"-+", "-", slug)
+        slug = _RE_SLUG_HYPHENS.sub("-", slug)
         slug = slug.strip("-")
         slug = f"#{slug}"
-
-        seen: dict[str, int] = {}
-        for e in (existing or []):
-            if e not in seen:
-                seen[e] = 1
-            else:
-                seen[e] += 1
-
-        if title in seen:
-            if seen[title] > 0:
-                slug = f"{slug}-{seen[title]}"
-
+        if count > 0:
+            slug = f"{slug}-{count}"
         return slug
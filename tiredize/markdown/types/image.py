@@ -1,13 +1,14 @@
 # Standard library
 from __future__ import annotations
 from dataclasses import dataclass
+import re
 
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.types.code import CodeBlock
 from tiredize.markdown.types.code import CodeInline
+from tiredize.markdown.utils import SanitizeMask
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
 
 
 @dataclass(frozen=False)
@@ -31,17 +32,31 @@ class InlineImage:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[InlineImage]:
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[InlineImage]:
         """
         Extract markdown images from text.
         """
-        text_sanitized = CodeBlock.sanitize(text)
-        text_sanitized = CodeInline.sanitize(text_sanitized)
-        matches = search_all_re(
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             InlineImage.RE_INLINE_IMAGE,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK,
+            CodeInline.RE_CODE_INLINE
         )
+        return InlineImage.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[InlineImage]:
+        """
+        Build inline images from RE_INLINE_IMAGE matches.
+        """
         result: list[InlineImage] = []
         for match in matches:
             position = Position(
@@ -1,6 +1,7 @@
 # Standard library
 from __future__ import annotations
 from dataclasses import dataclass
+import re
 
 # Local
 from tiredize.core_types import Position
@@ -8,8 +9,8 @@ from tiredize.markdown.types.code import CodeBlock
 from tiredize.markdown.types.code import CodeInline
 from tiredize.markdown.types.image import InlineImage
 from tiredize.markdown.types.reference import ReferenceDefinition
+from tiredize.markdown.utils import SanitizeMask
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
 
 
 @dataclass(frozen=False)
@@ -23,18 +24,32 @@ class BareLink:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[BareLink]:
-        text_sanitized = CodeBlock.sanitize(text)
-        text_sanitized = CodeInline.sanitize(text_sanitized)
-        text_sanitized = InlineImage.sanitize(text_sanitized)
-        text_sanitized = BracketLink.sanitize(text_sanitized)
-        text_sanitized = InlineLink.sanitize(text_sanitized)
-        text_sanitized = ReferenceDefinition.sanitize(text_sanitized)
-        matches = search_all_re(
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[BareLink]:
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             BareLink.RE_URL,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK,
+            CodeInline.RE_CODE_INLINE,
+            InlineImage.RE_INLINE_IMAGE,
+            BracketLink.RE_LINK_BRACKET,
+            InlineLink.RE_LINK_INLINE,
+            ReferenceDefinition.RE_REFERENCE_DEFINITION
         )
+        return BareLink.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[BareLink]:
+        """
+        Build bare links from RE_URL matches.
+        """
         result: list[BareLink] = []
         for match in matches:
             position = Position(
@@ -72,14 +87,28 @@ class BracketLink:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[BracketLink]:
-        text_sanitized = CodeBlock.sanitize(text)
-        text_sanitized = CodeInline.sanitize(text_sanitized)
-        matches = search_all_re(
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[BracketLink]:
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             BracketLink.RE_LINK_BRACKET,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK,
+            CodeInline.RE_CODE_INLINE
         )
+        return BracketLink.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[BracketLink]:
+        """
+        Build bracket links from RE_LINK_BRACKET matches.
+        """
         result: list[BracketLink] = []
         for match in matches:
             position = Position(
@@ -124,14 +153,28 @@ class InlineLink:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[InlineLink]:
-        text_sanitized = CodeBlock.sanitize(text)
-        text_sanitized = CodeInline.sanitize(text_sanitized)
-        matches = search_all_re(
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[InlineLink]:
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             InlineLink.RE_LINK_INLINE,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK,
+            CodeInline.RE_CODE_INLINE
         )
+        return InlineLink.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[InlineLink]:
+        """
+        Build inline links from RE_LINK_INLINE matches.
+        """
         result: list[InlineLink] = []
         for match in matches:
             position = Position(
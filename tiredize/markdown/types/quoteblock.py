@@ -1,12 +1,13 @@
 # Standard library
 from __future__ import annotations
 from dataclasses import dataclass
+import re
 
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.types.code import CodeBlock
+from tiredize.markdown.utils import SanitizeMask
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
 
 
 @dataclass(frozen=False)
@@ -24,10 +25,28 @@ class QuoteBlock:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[QuoteBlock]:
-        text_sanitized = CodeBlock.sanitize(text)
-        matches = search_all_re(QuoteBlock.RE_QUOTEBLOCK, text_sanitized)
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[QuoteBlock]:
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
+            QuoteBlock.RE_QUOTEBLOCK,
+            CodeBlock.RE_CODEBLOCK
+        )
+        return QuoteBlock.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[QuoteBlock]:
+        """
+        Build quote blocks from RE_QUOTEBLOCK matches, merging
+        consecutive lines of the same depth.
+        """
         result: list[QuoteBlock] = []
         prev_end_local: int | None = None
 
@@ -38,7 +57,7 @@ class QuoteBlock:
 
             # Handle continued quotes
             if result and prev_end_local is not None:
-                between = text_sanitized[prev_end_local:start_local]
+                between = match.string[prev_end_local:start_local]
 
                 is_next_line = between == "\n" or between == "\r\n"
                 if is_next_line and result[-1].depth == depth:
@@ -1,13 +1,14 @@
 # Standard library
 from __future__ import annotations
 from dataclasses import dataclass
+import re
 
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.types.code import CodeBlock
 from tiredize.markdown.types.code import CodeInline
+from tiredize.markdown.utils import SanitizeMask
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
 
 
 @dataclass(frozen=False)
@@ -31,14 +32,28 @@ class ReferenceDefinition:
     @staticmethod
     def extract(
         text: str,
-        base_offset: int = 0
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
     ) -> list[ReferenceDefinition]:
-        text_sanitized = CodeBlock.sanitize(text)
-        matches = search_all_re(
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             ReferenceDefinition.RE_REFERENCE_DEFINITION,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK
+        )
+        return ReferenceDefinition.from_matches(
+            matches,
+            base_offset=base_offset
         )
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[ReferenceDefinition]:
+        """
+        Build reference definitions from RE_REFERENCE_DEFINITION matches.
+        """
         result: list[ReferenceDefinition] = []
         for match in matches:
             position = Position(
@@ -84,15 +99,26 @@ class LinkReference:
     @staticmethod
     def extract(
         text: str,
-        base_offset: int = 0
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
     ) -> list[LinkReference]:
-        text_sanitized = CodeBlock.sanitize(text)
-        text_sanitized = CodeInline.sanitize(text_sanitized)
-        matches = search_all_re(
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             LinkReference.RE_LINK_REFERENCE,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK,
+            CodeInline.RE_CODE_INLINE
         )
+        return LinkReference.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[LinkReference]:
+        """
+        Build link references from RE_LINK_REFERENCE matches.
+        """
         result: list[LinkReference] = []
         for match in matches:
             position = Position(
@@ -137,15 +163,26 @@ class ImageReference:
     @staticmethod
     def extract(
         text: str,
-        base_offset: int = 0
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
     ) -> list[ImageReference]:
-        text_sanitized = CodeBlock.sanitize(text)
-        text_sanitized = CodeInline.sanitize(text_sanitized)
-        matches = search_all_re(
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             ImageReference.RE_IMAGE_REFERENCE,
-            text_sanitized
+            CodeBlock.RE_CODEBLOCK,
+            CodeInline.RE_CODE_INLINE
         )
+        return ImageReference.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[ImageReference]:
+        """
+        Build image references from RE_IMAGE_REFERENCE matches.
+        """
         result: list[ImageReference] = []
         for match in matches:
             position = Position(
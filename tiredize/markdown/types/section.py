@@ -1,9 +1,16 @@
 # Standard library
 from __future__ import annotations
+from collections.abc import Callable
 from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Generic
+from typing import TypeVar
+from typing import cast
 
 # Local
 from tiredize.core_types import Position
+from tiredize.markdown.tokenizer import tokenize_sections
 from tiredize.markdown.types.code import CodeBlock
 from tiredize.markdown.types.code import CodeInline
 from tiredize.markdown.types.header import Header
@@ -17,36 +24,290 @@ from tiredize.markdown.types.reference import ImageReference
 from tiredize.markdown.types.reference import LinkReference
 from tiredize.markdown.types.reference import ReferenceDefinition
 from tiredize.markdown.types.table import Table
+from tiredize.markdown.utils import SanitizeMask
+
+
+PARSER_BACKENDS = ("regex", "tokenizer")
+
+T = TypeVar("T")
+
+_EXTRACTORS: dict[str, Callable[..., list[Any]]] = {
+    "code_block": CodeBlock.extract,
+    "code_inline": CodeInline.extract,
+    "images_inline": InlineImage.extract,
+    "images_reference": ImageReference.extract,
+    "links_bare": BareLink.extract,
+    "links_bracket": BracketLink.extract,
+    "links_inline": InlineLink.extract,
+    "links_reference": LinkReference.extract,
+    "quoteblocks": QuoteBlock.extract,
+    "reference_definitions": ReferenceDefinition.extract,
+    "tables": Table.extract,
+}
+
+
+def _lazy(name: str) -> Any:
+    """
+    Field of an element attribute: a keyword argument that defaults to
+    extracting the element from the section string on first access.
+    """
+    return field(default=_LazyElements(name), kw_only=True)
+
+
+class _LazyElements(Generic[T]):
+    """
+    Section attribute computed on first access and memoized.
+
+    The descriptor is the field's default: a Section constructed
+    without the attribute gets it from Section._load(name) when first
+    read, and one constructed with it, or assigned to later, keeps the
+    given value. Values live in the instance __dict__, so dataclass
+    equality, repr, asdict() and replace() see ordinary attributes.
+    """
+
+    # Dunder methods
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return "<extracted on first access>"
+
+    def __get__(self, section: Section | None, owner: type) -> T:
+        if section is None:
+            return cast(T, self)
+        values = section.__dict__
+        if self.name not in values:
+            values[self.name] = section._load(self.name)
+        return cast(T, values[self.name])
+
+    def __set__(self, section: Section, value: T) -> None:
+        if value is self:
+            # The field default: leave the attribute to be extracted.
+            section.__dict__.pop(self.name, None)
+        else:
+            section.__dict__[self.name] = value
 
 
 @dataclass(frozen=False)
 class Section:
-    code_block: list[CodeBlock]
-    code_inline: list[CodeInline]
+    _mask: SanitizeMask | None = field(
+        init=False,
+        repr=False,
+        compare=False
+    )
+    # Element lists are extracted from string on first access, so a run
+    # that only reads headers or raw text skips the other extractors.
+    code_block: list[CodeBlock] = _lazy("code_block")
+    code_inline: list[CodeInline] = _lazy("code_inline")
+    depth: int = field(init=False)
     header: Header
-    images_inline: list[InlineImage]
-    images_reference: list[ImageReference]
-    links_bare: list[BareLink]
-    links_bracket: list[BracketLink]
-    links_inline: list[InlineLink]
-    links_reference: list[LinkReference]
-    lists: list[List]
+    images_inline: list[InlineImage] = _lazy("images_inline")
+    images_reference: list[ImageReference] = _lazy("images_reference")
+    links_bare: list[BareLink] = _lazy("links_bare")
+    links_bracket: list[BracketLink] = _lazy("links_bracket")
+    links_inline: list[InlineLink] = _lazy("links_inline")
+    links_reference: list[LinkReference] = _lazy("links_reference")
+    lists: list[List] = _lazy("lists")
+    parent: Section | None = field(init=False, repr=False, compare=False)
     position: Position
-    quoteblocks: list[QuoteBlock]
-    reference_definitions: list[ReferenceDefinition]
+    quoteblocks: list[QuoteBlock] = _lazy("quoteblocks")
+    reference_definitions: list[ReferenceDefinition] = _lazy(
+        "reference_definitions"
+    )
     string: str
-    string_safe: str
+    string_safe: str = _lazy("string_safe")
     subsections: list[Section]
-    tables: list[Table]
+    tables: list[Table] = _lazy("tables")
+
+    ELEMENTS = (
+        "code_block",
+        "code_inline",
+        "images_inline",
+        "images_reference",
+        "links_bare",
+        "links_bracket",
+        "links_inline",
+        "links_reference",
+        "lists",
+        "quoteblocks",
+        "reference_definitions",
+        "string_safe",
+        "tables",
+    )
+
+    # Dunder methods
+    def __post_init__(self) -> None:
+        self._mask = None
+        self.depth = 0
+        self.parent = None
+
+    # Private methods
+    def _load(self, name: str) -> Any:
+        """
+        Extract one element attribute from the section's string.
+        """
+        if name == "lists":
+            return List.extract(
+                text=self.string,
+                base_offset=self.position.offset
+            )
+        if self._mask is None:
+            self._mask = SanitizeMask(self.string)
+        if name == "string_safe":
+            return self._mask.view(
+                CodeBlock.RE_CODEBLOCK,
+                CodeInline.RE_CODE_INLINE
+            )
+        extractor = _EXTRACTORS[name]
+        return extractor(
+            text=self.string,
+            base_offset=self.position.offset,
+            mask=self._mask
+        )
 
+    # Static methods
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[Section]:
+    def _extract(
+        string: str,
+        position: Position,
+        header: Header,
+        mask: SanitizeMask | None = None
+    ) -> Section:
+        section = Section(
+            header=header,
+            position=position,
+            string=string,
+            subsections=[]
+        )
+        # Extractors of the section share one mask, made on first use
+        # unless the caller already has one for the same text.
+        section._mask = mask
+        return section
+
+    @staticmethod
+    def _extract_tokens(text: str, base_offset: int = 0) -> list[Section]:
         """
-        Extract sections from markdown.
+        Tokenize the whole text once and build one Section per span.
         """
         result: list[Section] = []
+        for tokens in tokenize_sections(text, base_offset=base_offset):
+            offset_start = tokens.position.offset - base_offset
+            string = text[offset_start:offset_start + tokens.position.length]
+            # The tokenizer has already found everything but lists.
+            section = Section(
+                code_block=tokens.code_block,
+                code_inline=tokens.code_inline,
+                header=Section._first_header(
+                    tokens.headers,
+                    tokens.position.offset
+                ),
+                images_inline=tokens.images_inline,
+                images_reference=tokens.images_reference,
+                links_bare=tokens.links_bare,
+                links_bracket=tokens.links_bracket,
+                links_inline=tokens.links_inline,
+                links_reference=tokens.links_reference,
+                position=tokens.position,
+                quoteblocks=tokens.quoteblocks,
+                reference_definitions=tokens.reference_definitions,
+                string=string,
+                string_safe=tokens.string_safe,
+                subsections=[],
+                tables=tokens.tables
+            )
+            result.append(section)
+        Section.build_tree(result)
+        return result
 
-        headers = Header.extract(text=text, base_offset=base_offset)
+    @staticmethod
+    def _first_header(headers: list[Header], base_offset: int) -> Header:
+        """
+        Return the section's own header, or an empty level-0 header for
+        text that precedes the first heading.
+        """
+        if len(headers) >= 1:
+            return headers[0]
+        return Header(
+            level=0,
+            position=Position(offset=base_offset, length=0),
+            slug="",
+            string="",
+            title=""
+        )
+
+    @staticmethod
+    def attach(
+        section: Section,
+        ancestors: list[Section],
+        link_subsections: bool = True
+    ) -> None:
+        """
+        Attach the next section, in document order, to the tree.
+
+        ancestors is the stack of open sections from the root down,
+        and is updated in place. The section's parent is the nearest
+        open section with a lower header level; level-0 sections (text
+        without headers) never have children. With link_subsections
+        False only parent and depth are set, so a parent does not keep
+        its children alive.
+        """
+        level = section.header.level
+        while ancestors and (
+            ancestors[-1].header.level >= level
+            or ancestors[-1].header.level == 0
+        ):
+            ancestors.pop()
+        if ancestors:
+            section.parent = ancestors[-1]
+            section.depth = section.parent.depth + 1
+            if link_subsections:
+                section.parent.subsections.append(section)
+        ancestors.append(section)
+
+    @staticmethod
+    def build_tree(sections: list[Section]) -> list[Section]:
+        """
+        Link sections to their parent and subsections in a single pass
+        and return the root sections.
+        """
+        ancestors: list[Section] = []
+        roots: list[Section] = []
+        for section in sections:
+            Section.attach(section, ancestors)
+            if section.parent is None:
+                roots.append(section)
+        return roots
+
+    @staticmethod
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        parser_backend: str = "regex"
+    ) -> list[Section]:
+        """
+        Extract sections from markdown.
+
+        parser_backend selects how each section's elements are found:
+        "regex" runs every element extractor separately, "tokenizer"
+        uses the single-pass tokenizer.
+        """
+        if parser_backend not in PARSER_BACKENDS:
+            raise ValueError(
+                f"Unknown parser backend '{parser_backend}'. "
+                f"Valid backends: {', '.join(PARSER_BACKENDS)}."
+            )
+        if parser_backend == "tokenizer":
+            return Section._extract_tokens(text, base_offset=base_offset)
+
+        # Headers are found once in the whole text; each one starts a
+        # section, so the slices need no header pass of their own.
+        # Slugs are left to Document, which counts duplicate titles
+        # across the whole document once.
+        mask = SanitizeMask(text)
+        headers = Header.from_matches(
+            Header.matches(text, mask),
+            base_offset=base_offset
+        )
         if len(headers) == 0:
             position = Position(
                 offset=base_offset,
@@ -55,12 +316,14 @@ class Section:
             section = Section._extract(
                 text,
                 position,
-                base_offset=position.offset,
+                Section._first_header(headers, base_offset),
+                mask=mask
             )
             return [section]
 
-        for i, position in enumerate([header.position for header in headers]):
-            offset_start = position.offset - base_offset
+        result: list[Section] = []
+        for i, header in enumerate(headers):
+            offset_start = header.position.offset - base_offset
             if i + 1 == len(headers):
                 offset_end = len(text)
             else:
@@ -72,108 +335,8 @@ class Section:
             section = Section._extract(
                 text[offset_start:offset_end],
                 position,
-                base_offset=position.offset,
+                header
             )
             result.append(section)
-        Section._map_subsections(result)
+        Section.build_tree(result)
         return result
-
-    @staticmethod
-    def _extract(
-        string: str,
-        position: Position,
-        base_offset: int = 0
-    ) -> Section:
-
-        header = None
-        headers = Header.extract(text=string, base_offset=base_offset)
-        if len(headers) >= 1:
-            header = headers[0]
-        else:
-            header = Header(
-                level=0,
-                position=Position(offset=base_offset, length=0),
-                slug="",
-                string="",
-                title=""
-            )
-
-        code_block_safe = CodeBlock.sanitize(string)
-
-        section = Section(
-            code_block=CodeBlock.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            code_inline=CodeInline.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            header=header,
-            images_inline=InlineImage.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            images_reference=ImageReference.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            links_bare=BareLink.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            links_bracket=BracketLink.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            links_inline=InlineLink.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            links_reference=LinkReference.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            lists=List.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            position=position,
-            quoteblocks=QuoteBlock.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            reference_definitions=ReferenceDefinition.extract(
-                text=string,
-                base_offset=base_offset
-            ),
-            string=string,
-            string_safe=CodeInline.sanitize(code_block_safe),
-            subsections=[],
-            tables=Table.extract(
-                text=string,
-                base_offset=base_offset
-            )
-        )
-        return section
-
-    @staticmethod
-    def _map_subsections(sections: list[Section]) -> None:
-        i = 0
-        next_i = i + 1
-        while len(sections) > i:
-            while len(sections) > next_i:
-                if sections[i].header.level == 0:
-                    break
-                if sections[i].header.level < sections[next_i].header.level:
-                    sections[i].subsections.append(sections[next_i])
-                    child_level = sections[next_i].header.level
-                    next_i += 1
-                    while (next_i < len(sections)
-                           and sections[next_i].header.level
-                           > child_level):
-                        next_i += 1
-                else:
-                    break
-            i += 1
-            next_i = i + 1
@@ -1,12 +1,13 @@
 # Standard library
 from __future__ import annotations
 from dataclasses import dataclass
+import re
 
 # Local
 from tiredize.core_types import Position
 from tiredize.markdown.types.code import CodeBlock
+from tiredize.markdown.utils import SanitizeMask
 from tiredize.markdown.utils import sanitize_text
-from tiredize.markdown.utils import search_all_re
 
 
 @dataclass(frozen=False)
@@ -38,16 +39,30 @@ class Table:
     """
 
     @staticmethod
-    def extract(text: str, base_offset: int = 0) -> list[Table]:
+    def extract(
+        text: str,
+        base_offset: int = 0,
+        mask: SanitizeMask | None = None
+    ) -> list[Table]:
         """
         Extract table from markdown text.
         """
-        sanitized = CodeBlock.sanitize(text)
-        matches = search_all_re(
+        if mask is None:
+            mask = SanitizeMask(text)
+        matches = mask.matches(
             Table.RE_TABLE,
-            sanitized
+            CodeBlock.RE_CODEBLOCK
         )
+        return Table.from_matches(matches, base_offset=base_offset)
 
+    @staticmethod
+    def from_matches(
+        matches: list[re.Match[str]],
+        base_offset: int = 0
+    ) -> list[Table]:
+        """
+        Build tables from RE_TABLE matches.
+        """
         result: list[Table] = []
         for match in matches:
             position = Position(
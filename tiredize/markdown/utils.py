@@ -1,29 +1,149 @@
 # Standard library
 from __future__ import annotations
+from collections.abc import Iterator
+import heapq
 import re
 
 
-def search_all_re(pattern: str, string: str) -> list[re.Match[str]]:
-    result: list[re.Match[str]] = []
-    for match in re.finditer(pattern, string, re.VERBOSE):
-        result.append(match)
+_RE_NOT_NEWLINE = re.compile(r"[^\n]")
+
+# Compiled VERBOSE patterns, keyed by pattern source. Element classes
+# keep their RE_* patterns as strings; this registry makes sure each
+# one is compiled once per process rather than per call.
+_PATTERNS: dict[str, re.Pattern[str]] = {}
+
+
+class SanitizeMask:
+    """
+    Ranges of a text claimed by sanitized (higher-precedence) elements.
+
+    A sanitize chain is a sequence of patterns applied in order, each
+    one matched against the text with the earlier ones already blanked
+    out, exactly like nesting sanitize_text() calls. Matching needs the
+    blanked text, so each chain prefix still materializes one view of
+    the text; the mask resolves every prefix once per text and shares
+    its matches, ranges and view between extractors, instead of each
+    extractor sanitizing the text again.
+    """
+
+    # Dunder methods
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._matches: dict[tuple[str, ...], list[re.Match[str]]] = {}
+        self._ranges: dict[tuple[str, ...], list[tuple[int, int]]] = {
+            (): []
+        }
+        self._views: dict[tuple[str, ...], str] = {(): text}
+
+    # Public methods
+    def matches(self, pattern: str, *chain: str) -> list[re.Match[str]]:
+        """
+        Return matches of pattern against the text sanitized by chain.
+        """
+        key = (*chain, pattern)
+        if key not in self._matches:
+            self._matches[key] = search_all_re(pattern, self.view(*chain))
+        return self._matches[key]
+
+    def ranges(self, *chain: str) -> list[tuple[int, int]]:
+        """
+        Return the ordered, non-overlapping ranges claimed by chain.
+        """
+        if chain not in self._ranges:
+            claimed = [
+                match.span()
+                for match in self.matches(chain[-1], *chain[:-1])
+            ]
+            self._ranges[chain] = _merge_ranges(
+                self.ranges(*chain[:-1]),
+                claimed
+            )
+        return self._ranges[chain]
+
+    def view(self, *chain: str) -> str:
+        """
+        Return the text with every range claimed by chain replaced with
+        whitespace, preserving newlines and offsets.
+        """
+        if chain not in self._views:
+            self._views[chain] = blank_ranges(self.text, self.ranges(*chain))
+        return self._views[chain]
+
+
+def _merge_ranges(
+    first: list[tuple[int, int]],
+    second: list[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """
+    Union two ordered range lists into one ordered, disjoint list.
+    """
+    if not first:
+        return second
+    if not second:
+        return first
+    result: list[tuple[int, int]] = []
+    for start, end in heapq.merge(first, second):
+        if result and start <= result[-1][1]:
+            if end > result[-1][1]:
+                result[-1] = (result[-1][0], end)
+            continue
+        result.append((start, end))
     return result
 
 
+def blank_ranges(text: str, ranges: list[tuple[int, int]]) -> str:
+    """
+    Replace ordered, non-overlapping ranges of text with whitespace,
+    keeping newlines so every offset is preserved.
+    """
+    if not ranges:
+        return text
+    chunks: list[str] = []
+    last_end = 0
+    for start, end in ranges:
+        chunks.append(text[last_end:start])
+        if text.find("\n", start, end) == -1:
+            chunks.append(" " * (end - start))
+        else:
+            chunks.append(_RE_NOT_NEWLINE.sub(" ", text[start:end]))
+        last_end = end
+    chunks.append(text[last_end:])
+    return "".join(chunks)
+
+
+def compile_re(pattern: str) -> re.Pattern[str]:
+    """
+    Return pattern compiled with re.VERBOSE, compiling it on first use.
+    """
+    compiled = _PATTERNS.get(pattern)
+    if compiled is None:
+        compiled = re.compile(pattern, re.VERBOSE)
+        _PATTERNS[pattern] = compiled
+    return compiled
+
+
+def iter_all_re(pattern: str, string: str) -> Iterator[re.Match[str]]:
+    """
+    Lazily yield every match of pattern in string.
+    """
+    return compile_re(pattern).finditer(string)
+
+
 def sanitize_text(pattern: str, text: str) -> str:
     """
     Replace any matches of pattern with whitespace to preserve positioning
     """
-    result: str = ""
-    matches = search_all_re(pattern, text)
-    last_end = 0
-    for match in matches:
-        result += text[last_end:match.start()]
-        last_end = match.end()
-        old_lines = match.group().split("\n")
-        new_lines: list[str] = []
-        for old_line in old_lines:
-            new_lines.append(" " * len(old_line))
-        result += "\n".join(new_lines)
-    result += text[last_end:]
-    return result
+    matches = iter_all_re(pattern, text)
+    return blank_ranges(text, [match.span() for match in matches])
+
+
+def search_all_re(pattern: str, string: str) -> list[re.Match[str]]:
+    return list(iter_all_re(pattern, string))
+
+
+def search_first_re(pattern: str, string: str) -> re.Match[str] | None:
+    """
+    Return the first match of pattern in string, without looking for
+    any later ones.
+    """
+    return compile_re(pattern).search(string)
@@ -0,0 +1,192 @@
+# Standard library
+from __future__ import annotations
+from collections.abc import Iterable
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TextIO
+from urllib.parse import quote
+import json
+
+# Local
+from tiredize.core_types import RuleResult
+
+
+FORMATS = ("text", "jsonl", "json", "sarif")
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+# Results of one document: (line, column, result) per finding.
+Findings = list[tuple[int, int, RuleResult]]
+
+
+def _records(path: str, findings: Findings) -> Iterator[str]:
+    """
+    Yield the JSON object of each result. Keys are in sorted order;
+    the path is encoded once per document rather than per result.
+    """
+    encoded_path = json.dumps(path)
+    for line, col, res in findings:
+        yield (
+            f'{{"column": {col}, "length": {res.position.length}, '
+            f'"line": {line}, "message": {json.dumps(res.message)}, '
+            f'"offset": {res.position.offset}, "path": {encoded_path}, '
+            f'"rule_id": {json.dumps(res.rule_id)}}}'
+        )
+
+
+def _sarif_results(path: str, findings: Findings) -> Iterator[str]:
+    """
+    Yield the SARIF result object of each result, encoding the parts
+    shared by a document's results once.
+    """
+    location = (
+        '{"level": "error", "locations": [{"physicalLocation": '
+        f'{{"artifactLocation": {{"uri": {json.dumps(_uri(path))}}}, '
+        '"region": {'
+    )
+    for line, col, res in findings:
+        yield (
+            f'{location}"charLength": {res.position.length}, '
+            f'"charOffset": {res.position.offset}, '
+            f'"startColumn": {col + 1}, "startLine": {line}}}}}}}], '
+            f'"message": {{"text": {json.dumps(res.message)}}}, '
+            f'"ruleId": {json.dumps(res.rule_id)}}}'
+        )
+
+
+def _separated(count: int, items: Iterable[str]) -> list[str]:
+    """
+    Prefix array items with their separator, given how many items
+    were written before.
+    """
+    chunks = [",\n" + item for item in items]
+    if count == 0 and chunks:
+        chunks[0] = chunks[0][1:]
+    return chunks
+
+
+def _uri(path: str) -> str:
+    """
+    Return a path as a URI: absolute paths as file URIs, relative
+    paths as relative references, which SARIF resolves against the
+    directory the run was started in.
+    """
+    posix = Path(path)
+    if posix.is_absolute():
+        return posix.as_uri()
+    return quote(posix.as_posix())
+
+
+class Emitter:
+    """
+    Writes the results of a run to a stream as documents finish.
+
+    Each document's results are formatted into one string and passed
+    to a single write() on the text stream, so output needs neither a
+    print() per result nor memory for the whole run. The
+    text format is the `path:line:col: [rule_id] message` lines the
+    CLI has always printed; the others are written by subclasses.
+    """
+
+    # Dunder methods
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.count = 0
+
+    # Public methods
+    def close(self) -> None:
+        """
+        Finish the output. Must be called once, also after a run that
+        stopped early, so JSON and SARIF output stays well-formed.
+        """
+        self.stream.flush()
+
+    def emit(self, path: str, findings: Findings) -> None:
+        """
+        Write the results of one document.
+        """
+        if not findings:
+            return
+        self.stream.write("".join(self._format(path, findings)))
+        self.count += len(findings)
+
+    # Private methods
+    def _format(self, path: str, findings: Findings) -> list[str]:
+        return [
+            f"{path}:{line}:{col}: [{res.rule_id}] {res.message}\n"
+            for line, col, res in findings
+        ]
+
+
+class JsonLinesEmitter(Emitter):
+    """
+    One JSON object per result and line. line is 1-based and column
+    0-based, as in the text format; offset and length are characters.
+    """
+
+    # Private methods
+    def _format(self, path: str, findings: Findings) -> list[str]:
+        return [record + "\n" for record in _records(path, findings)]
+
+
+class JsonEmitter(Emitter):
+    """
+    A JSON array of the objects JsonLinesEmitter writes, streamed: the
+    opening bracket is written first and the closing one by close().
+    """
+
+    # Dunder methods
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self.stream.write("[")
+
+    # Public methods
+    def close(self) -> None:
+        self.stream.write("\n]\n" if self.count else "]\n")
+        super().close()
+
+    # Private methods
+    def _format(self, path: str, findings: Findings) -> list[str]:
+        return _separated(self.count, _records(path, findings))
+
+
+class SarifEmitter(Emitter):
+    """
+    A SARIF 2.1.0 log with one run, streamed like JsonEmitter. Columns
+    are 1-based, as SARIF requires.
+    """
+
+    # Dunder methods
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        log = json.dumps({"$schema": SARIF_SCHEMA, "version": SARIF_VERSION})
+        tool = json.dumps({"driver": {"name": "tiredize"}})
+        # Everything up to the results array, whose items follow.
+        self.stream.write(
+            f'{log[:-1]}, "runs": [{{"tool": {tool}, "results": ['
+        )
+
+    # Public methods
+    def close(self) -> None:
+        self.stream.write("\n]}]}\n" if self.count else "]}]}\n")
+        super().close()
+
+    # Private methods
+    def _format(self, path: str, findings: Findings) -> list[str]:
+        return _separated(self.count, _sarif_results(path, findings))
+
+
+def make_emitter(output_format: str, stream: TextIO) -> Emitter:
+    """
+    Return the emitter for one of FORMATS.
+    """
+    emitters: dict[str, type[Emitter]] = {
+        "json": JsonEmitter,
+        "jsonl": JsonLinesEmitter,
+        "sarif": SarifEmitter,
+        "text": Emitter,
+    }
+    if output_format not in emitters:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return emitters[output_format](stream)
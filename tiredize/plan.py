@@ -0,0 +1,254 @@
+# Standard library
+from __future__ import annotations
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+import hashlib
+import json
+
+# Third-party
+import yaml
+
+# Local
+from tiredize.core_types import RuleResult
+from tiredize.linter.engine import prepare_rules
+from tiredize.linter.engine import run_rules
+from tiredize.linter.rules import Rule
+from tiredize.linter.rules import get_rule_registry
+from tiredize.markdown.types.document import REQUIREMENTS
+from tiredize.markdown.types.document import Document
+from tiredize.markdown.types.schema import SchemaConfig
+from tiredize.markdown.types.schema import load_schema
+from tiredize.profiling import PhaseTimer
+from tiredize.profiling import optional_phase
+from tiredize.validators.frontmatter_schema import REQUIRES \
+    as FRONTMATTER_SCHEMA_REQUIRES
+from tiredize.validators.frontmatter_schema import FrontmatterSchema
+from tiredize.validators.frontmatter_schema import load_frontmatter_schema
+from tiredize.validators.frontmatter_schema import validate \
+    as validate_frontmatter
+from tiredize.validators.markdown_schema import REQUIRES \
+    as MARKDOWN_SCHEMA_REQUIRES
+from tiredize.validators.markdown_schema import validate \
+    as validate_markdown
+
+
+# Requirements that make Document.load() read a file without parsing.
+_NO_PARSING = frozenset({"text"})
+
+
+def _full(results: list[RuleResult], limit: int | None) -> bool:
+    return limit is not None and len(results) >= limit
+
+
+def _load_yaml(path: Path) -> dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(
+            f"Expected YAML mapping in {path}, "
+            f"got {type(data).__name__}."
+        )
+    return data
+
+
+def _new_rules() -> list[tuple[Rule, dict[str, Any]]]:
+    return []
+
+
+@dataclass(frozen=True)
+class ValidationPlan:
+    """
+    Everything needed to check documents, resolved once per run.
+
+    A plan holds the selected lint rules with their configurations
+    and the parsed schemas, so checking a document never re-reads or
+    re-parses configuration. Plans are picklable and can be shared
+    with worker processes.
+    """
+    frontmatter_schema: FrontmatterSchema | None = None
+    markdown_schema: SchemaConfig | None = None
+    parser_backend: str = "regex"
+    rules: list[tuple[Rule, dict[str, Any]]] = field(
+        default_factory=_new_rules
+    )
+
+    # Dunder methods
+    def __post_init__(self) -> None:
+        requires = self.requires
+        if requires is not None and not requires <= REQUIREMENTS:
+            unknown = ", ".join(sorted(requires - REQUIREMENTS))
+            raise ValueError(f"Unknown document requirements: {unknown}")
+
+    # Public methods
+    @property
+    def cacheable(self) -> bool:
+        """
+        True if results depend only on document content, so they can
+        be reused for unchanged files.
+        """
+        return all(rule.cacheable for rule, _ in self.rules)
+
+    @property
+    def requires(self) -> frozenset[str] | None:
+        """
+        The document data the plan's checks read, or None if a rule
+        does not declare its requirements and needs a full parse.
+        """
+        needs: set[str] = set()
+        for rule, _ in self.rules:
+            if rule.requires is None:
+                return None
+            needs.update(rule.requires)
+        if self.markdown_schema is not None:
+            needs.update(MARKDOWN_SCHEMA_REQUIRES)
+        if self.frontmatter_schema is not None:
+            needs.update(FRONTMATTER_SCHEMA_REQUIRES)
+        return frozenset(needs)
+
+    def fingerprint(self) -> str:
+        """
+        Return a digest of everything besides the document that affects
+        results: selected rules and their configurations, schemas and
+        the parser backend.
+        """
+        data = {
+            "frontmatter_schema": repr(self.frontmatter_schema),
+            "markdown_schema": repr(self.markdown_schema),
+            "parser_backend": self.parser_backend,
+            "rules": [
+                [rule.id, rule.func.__module__, config]
+                for rule, config in self.rules
+            ],
+        }
+        encoded = json.dumps(data, sort_keys=True, default=repr)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_config(
+        cls,
+        rule_configs: dict[str, Any] | None = None,
+        markdown_schema: SchemaConfig | None = None,
+        frontmatter_schema: FrontmatterSchema | None = None,
+        parser_backend: str = "regex",
+        rules: dict[str, Rule] | None = None,
+    ) -> ValidationPlan:
+        """
+        Build a plan from already parsed configuration.
+
+        rules is the registry to select from; it defaults to the
+        built-in rules. Raises RuleNotFoundError for an unknown rule id
+        and ValueError for a rule configuration that is not a mapping.
+        """
+        return cls(
+            frontmatter_schema=frontmatter_schema,
+            markdown_schema=markdown_schema,
+            parser_backend=parser_backend,
+            rules=prepare_rules(rule_configs, rules),
+        )
+
+    @classmethod
+    def from_files(
+        cls,
+        rules_path: Path | None = None,
+        markdown_schema_path: Path | None = None,
+        frontmatter_schema_path: Path | None = None,
+        parser_backend: str = "regex",
+        rule_manifest: Path | None = None,
+    ) -> ValidationPlan:
+        """
+        Read and parse configuration files into a plan.
+
+        Each file is optional; checks without one are skipped.
+        rule_manifest is passed to get_rule_registry(). Raises
+        FileNotFoundError, ValueError, yaml.YAMLError or
+        RuleNotFoundError for missing or invalid configuration.
+        """
+        rule_configs = None
+        rules = None
+        if rules_path is not None:
+            rule_configs = _load_yaml(rules_path)
+            rules = get_rule_registry(manifest=rule_manifest)
+        markdown_schema = None
+        if markdown_schema_path is not None:
+            markdown_schema = load_schema(
+                markdown_schema_path.read_text(encoding="utf-8")
+            )
+        frontmatter_schema = None
+        if frontmatter_schema_path is not None:
+            frontmatter_schema = load_frontmatter_schema(
+                frontmatter_schema_path.read_text(encoding="utf-8")
+            )
+        return cls.from_config(
+            rule_configs=rule_configs,
+            markdown_schema=markdown_schema,
+            frontmatter_schema=frontmatter_schema,
+            parser_backend=parser_backend,
+            rules=rules,
+        )
+
+    def load(
+        self,
+        path: Path,
+        timer: PhaseTimer | None = None,
+    ) -> Document:
+        """
+        Load a document with the plan's parser backend, parsing only
+        what the plan's checks require.
+
+        With a timer, reading the file and parsing it are timed as the
+        "load" and "parse" phases. Element types are extracted lazily,
+        so part of the parsing is timed with the rules that use them.
+        """
+        document = Document(parser_backend=self.parser_backend)
+        if timer is None:
+            document.load(path=path, requires=self.requires)
+            return document
+        with timer.phase("phase", "load"):
+            document.load(path=path, requires=_NO_PARSING)
+        with timer.phase("phase", "parse"):
+            document.parse(self.requires)
+        return document
+
+    def validate(
+        self,
+        document: Document,
+        timer: PhaseTimer | None = None,
+        limit: int | None = None,
+    ) -> list[RuleResult]:
+        """
+        Lint and validate a parsed document.
+
+        Results are ordered lint rules first, then markdown schema,
+        then frontmatter schema results. Raises AmbiguityError or
+        ValueError when a schema cannot be applied to the document.
+        With a timer, each rule and schema is timed separately. With a
+        limit, at most that many results are returned and no check runs
+        once it is reached.
+        """
+        if timer is None:
+            results = run_rules(document, self.rules, limit)
+        else:
+            results = []
+            for rule, config in self.rules:
+                if _full(results, limit):
+                    break
+                remaining = None if limit is None else limit - len(results)
+                with timer.phase("rule", rule.id):
+                    results.extend(
+                        run_rules(document, [(rule, config)], remaining)
+                    )
+        if self.markdown_schema is not None and not _full(results, limit):
+            with optional_phase(timer, "schema", "markdown"):
+                results.extend(
+                    validate_markdown(document, self.markdown_schema)
+                )
+        if self.frontmatter_schema is not None and not _full(results, limit):
+            with optional_phase(timer, "schema", "frontmatter"):
+                results.extend(
+                    validate_frontmatter(document, self.frontmatter_schema)
+                )
+        return results if limit is None else results[:limit]
@@ -0,0 +1,146 @@
+# Standard library
+from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from contextlib import contextmanager
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any
+import time
+
+
+# Phases are keyed by (kind, name): ("phase", "parse"), ("rule", "tabs").
+PhaseKey = tuple[str, str]
+
+
+@dataclass(frozen=False)
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0.0
+
+    # Public methods
+    def add(self, other: PhaseStats) -> None:
+        self.calls += other.calls
+        self.seconds += other.seconds
+
+
+class PhaseTimer:
+    """
+    Wall time and call counts of the phases of checking one document.
+
+    Timers are only created when profiling, and every timed code path
+    takes one as an optional argument, so a run without profiling
+    never reads the clock.
+    """
+
+    # Dunder methods
+    def __init__(self) -> None:
+        self.stats: dict[PhaseKey, PhaseStats] = {}
+
+    # Public methods
+    @contextmanager
+    def phase(self, kind: str, name: str) -> Iterator[None]:
+        """
+        Time the body of a with block as one call of (kind, name).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.stats.setdefault((kind, name), PhaseStats())
+            stats.calls += 1
+            stats.seconds += elapsed
+
+
+class Profiler:
+    """
+    Per-file and aggregate phase timings of a run.
+    """
+
+    # Dunder methods
+    def __init__(self) -> None:
+        self.files: dict[str, dict[PhaseKey, PhaseStats]] = {}
+        self.totals: dict[PhaseKey, PhaseStats] = {}
+
+    # Public methods
+    def add(self, path: str, stats: dict[PhaseKey, PhaseStats]) -> None:
+        """
+        Record the timings of one checked file.
+        """
+        per_file = self.files.setdefault(path, {})
+        for key, value in stats.items():
+            per_file.setdefault(key, PhaseStats()).add(value)
+            self.totals.setdefault(key, PhaseStats()).add(value)
+
+    def format_table(self) -> str:
+        """
+        Return the aggregate timings as a text table, slowest first.
+        """
+        total = sum(stats.seconds for stats in self.totals.values())
+        rows = [("kind", "name", "calls", "total ms", "mean ms", "%")]
+        for (kind, name), stats in _sorted(self.totals):
+            rows.append((
+                kind,
+                name,
+                str(stats.calls),
+                f"{stats.seconds * 1000:.2f}",
+                f"{stats.seconds * 1000 / max(stats.calls, 1):.3f}",
+                f"{stats.seconds * 100 / total:.1f}" if total else "0.0",
+            ))
+        widths = [max(len(row[i]) for row in rows) for i in range(6)]
+        lines = []
+        for row in rows:
+            cells = [
+                cell.ljust(width) if index < 2 else cell.rjust(width)
+                for index, (cell, width) in enumerate(zip(row, widths))
+            ]
+            lines.append("  ".join(cells).rstrip())
+        lines.append(
+            f"{len(self.files)} file(s), {total * 1000:.2f} ms timed"
+        )
+        return "\n".join(lines)
+
+    def to_json(self) -> dict[str, Any]:
+        """
+        Return the aggregate and per-file timings as JSON-ready data,
+        slowest phase first.
+        """
+        return {
+            "files": {
+                path: _json_rows(stats)
+                for path, stats in self.files.items()
+            },
+            "totals": _json_rows(self.totals),
+        }
+
+
+def _json_rows(stats: dict[PhaseKey, PhaseStats]) -> list[dict[str, Any]]:
+    return [
+        {
+            "calls": value.calls,
+            "kind": kind,
+            "name": name,
+            "seconds": value.seconds,
+        }
+        for (kind, name), value in _sorted(stats)
+    ]
+
+
+def _sorted(
+    stats: dict[PhaseKey, PhaseStats],
+) -> list[tuple[PhaseKey, PhaseStats]]:
+    return sorted(stats.items(), key=lambda item: (-item[1].seconds, item[0]))
+
+
+def optional_phase(
+    timer: PhaseTimer | None,
+    kind: str,
+    name: str,
+) -> AbstractContextManager[None]:
+    """
+    Return timer.phase(kind, name), or a no-op context without a timer.
+    """
+    if timer is None:
+        return nullcontext()
+    return timer.phase(kind, name)
@@ -0,0 +1,86 @@
+# Standard library
+from __future__ import annotations
+from pathlib import Path
+from typing import Any
+from typing import Generic
+from typing import TypeVar
+import json
+import os
+import tempfile
+
+
+T = TypeVar("T")
+
+
+def atomic_write_json(path: Path, data: Any, **options: Any) -> bool:
+    """
+    Write data to path as JSON through a temporary file moved into
+    place with os.replace, so concurrent readers and writers never see
+    a partial file. options are passed to json.dump(). Failures are
+    ignored, since every caller only caches; returns whether the file
+    was written.
+    """
+    tmp_name: str | None = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=path.parent,
+            prefix=f".{path.name}.",
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **options)
+        os.replace(tmp_name, path)
+    except OSError:
+        if tmp_name is not None and os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        return False
+    return True
+
+
+def read_json(path: Path, version: int | None = None) -> Any:
+    """
+    Return the JSON value stored at path, or None if it cannot be read
+    or parsed. With version, the value must be an object whose
+    "version" key equals it, else None is returned.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if version is not None and (
+        not isinstance(data, dict) or data.get("version") != version
+    ):
+        return None
+    return data
+
+
+class RunState(Generic[T]):
+    """
+    The process-wide object of the current run, such as the table of
+    checked URLs, shared by every document the process checks until
+    the run ends.
+    """
+
+    # Dunder methods
+    def __init__(self) -> None:
+        self._value: T | None = None
+
+    # Public methods
+    def clear(self) -> None:
+        """
+        End the run; get() returns None until the next start().
+        """
+        self._value = None
+
+    def get(self) -> T | None:
+        """
+        Return the object of the current run, or None outside a run.
+        """
+        return self._value
+
+    def start(self, value: T) -> T:
+        """
+        Start a run with value, replacing any previous run's object.
+        """
+        self._value = value
+        return value
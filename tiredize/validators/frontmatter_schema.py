@@ -13,6 +13,9 @@ from tiredize.core_types import RuleResult
 from tiredize.markdown.types.document import Document
 
 
+REQUIRES = frozenset({"frontmatter"})
+
+
 # ============================================================
 # Duplicate-key-detecting YAML loader
 # ============================================================
@@ -10,6 +10,9 @@ from tiredize.markdown.types.schema import SchemaConfig
 from tiredize.markdown.types.schema import SchemaSection
 
 
+REQUIRES = frozenset({"sections"})
+
+
 class AmbiguityError(Exception):
     pass
 
@@ -143,17 +146,6 @@ def _find_later_match(doc_section, schema_sections, start):
     return None
 
 
-def _find_root_sections(document):
-    claimed = set()
-    for section in document.sections:
-        for sub in section.subsections:
-            claimed.add(sub.header.position.offset)
-    return [
-        s for s in document.sections
-        if s.header.position.offset not in claimed
-    ]
-
-
 def _find_skipped_match(doc_section, skipped):
     for i, schema_section in enumerate(skipped):
         if _name_matches(doc_section, schema_section):
@@ -474,7 +466,7 @@ def validate(
     schema: SchemaConfig,
 ) -> list[RuleResult]:
     results: list[RuleResult] = []
-    roots = _find_root_sections(document)
+    roots = document.roots
     if schema.enforce_order:
         _validate_ordered(
             roots, schema.sections,
@@ -0,0 +1,49 @@
+# Standard library
+from __future__ import annotations
+from collections.abc import Iterable
+from pathlib import Path
+import os
+
+
+# (st_mtime_ns, st_size) of a file, or None when it does not exist.
+Stamp = tuple[int, int] | None
+
+
+def _stamp(path: Path) -> Stamp:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """
+    Detect changes to a fixed set of files by polling.
+
+    Each poll is one stat() per file, so watching thousands of files
+    costs milliseconds and needs no platform-specific notification API.
+    A file counts as changed when its modification time or size
+    differs from the previous poll, including when it appears or
+    disappears.
+    """
+
+    # Dunder methods
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self._stamps: dict[Path, Stamp] = dict.fromkeys(paths)
+        self._seen = False
+
+    # Public methods
+    def changed(self) -> list[Path]:
+        """
+        Return the files that changed since the last call, in the order
+        they were given. The first call returns every file.
+        """
+        result: list[Path] = []
+        for path, previous in self._stamps.items():
+            current = _stamp(path)
+            if not self._seen or current != previous:
+                result.append(path)
+            self._stamps[path] = current
+        self._seen = True
+        return result